@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Wspólna pamięć podręczna (LRU) harmonogramów spłaty kredytu annuitetowego.
+
+Oba symulatory w każdym scenariuszu liczą ratę (`annual_payment` /
+`monthly_mortgage_payment`) i potem okres po okresie dzielą ją na odsetki
+i kapitał. W przeglądach parametrów te same kombinacje (kwota, oprocentowanie,
+okres) powtarzają się wielokrotnie, więc cały harmonogram liczymy raz,
+zapisujemy w zwartych tablicach (array('d')) i potem tylko odczytujemy.
+
+Harmonogram powstaje z dokładnie tej samej rekurencji co pętle symulacji
+(rata ograniczona przez dług + odsetki, saldo nie spada poniżej zera), więc
+wyniki symulacji są identyczne jak przy liczeniu na bieżąco.
+
+Kwota i oprocentowanie mogą być też innymi typami liczbowymi (np. liczbami
+dualnymi z sensitivity.py) - taki harmonogram trzyma wartości w listach
+i nie trafia do pamięci podręcznej. Stopa z metodą annuity_payment(kwota,
+liczba rat) sama liczy ratę.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass
+
+# Statystyki pamięci podręcznej - jak functools.lru_cache
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+@dataclass(frozen=True)
+class AmortizationSchedule:
+    """Harmonogram spłaty kredytu - po jednym elemencie tablic na okres (rok lub miesiąc)"""
+    payment: float  # stała rata annuitetowa
+    payments: array  # faktycznie zapłacona rata w okresie (ostatnia może być mniejsza)
+    interest: array  # część odsetkowa raty
+    principal: array  # część kapitałowa raty
+    balance: array  # saldo kredytu po zapłacie raty
+
+    def __len__(self) -> int:
+        return len(self.payments)
+
+
+def _is_real(value) -> bool:
+    return isinstance(value, (int, float))
+
+
+def build_schedule(principal: float, annual_rate: float, years: int,
+                   periods_per_year: int = 1, settle_below: float = 0.0) -> AmortizationSchedule:
+    """
+    Liczy pełny harmonogram spłaty kredytu annuitetowego.
+
+    Args:
+        principal: kwota kredytu
+        annual_rate: roczne oprocentowanie
+        years: okres kredytu w latach
+        periods_per_year: liczba rat w roku (1 = raty roczne, 12 = miesięczne)
+        settle_below: saldo nie większe niż ta wartość uznajemy za spłacone (0 = tylko dokładne zero)
+
+    Returns:
+        AmortizationSchedule; harmonogram kończy się, gdy saldo spadnie do zera
+        (najwyżej jeden okres po terminie - na wypadek resztki z zaokrągleń)
+    """
+    if _is_real(principal) and _is_real(annual_rate):
+        payments, interest, principal_paid, balances = array('d'), array('d'), array('d'), array('d')
+    else:
+        payments, interest, principal_paid, balances = [], [], [], []
+    if principal <= 0:
+        return AmortizationSchedule(0.0, payments, interest, principal_paid, balances)
+
+    # Wzór na ratę annuity: R = P * [r(1+r)^n] / [(1+r)^n - 1]
+    r = annual_rate / periods_per_year
+    n = years * periods_per_year
+    annuity_payment = getattr(r, 'annuity_payment', None)
+    if annuity_payment is not None:
+        # stopa innego typu liczbowego liczy ratę sama (sensitivity.Dual - pochodna także przy stopie 0)
+        payment = annuity_payment(principal, n)
+    elif annual_rate == 0:
+        payment = principal / n
+    else:
+        payment = principal * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
+
+    balance = principal
+    for _ in range(n + 1):
+        if balance <= 0:
+            break
+        period_interest = balance * r
+        actual_payment = min(payment, balance + period_interest)  # nie więcej niż dług + odsetki
+        principal_component = actual_payment - period_interest
+        balance = max(0.0, balance - principal_component)
+        if balance <= settle_below:
+            balance = 0.0
+        payments.append(actual_payment)
+        interest.append(period_interest)
+        principal_paid.append(principal_component)
+        balances.append(balance)
+    return AmortizationSchedule(payment, payments, interest, principal_paid, balances)
+
+
+class ScheduleCache:
+    """
+    Ograniczona pamięć podręczna LRU harmonogramów spłaty.
+
+    Kluczem jest komplet argumentów build_schedule. Bezpieczna dla wątków;
+    liczniki trafień/chybień pozwalają dobrać rozmiar do obciążenia.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._schedules = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, principal: float, annual_rate: float, years: int,
+            periods_per_year: int = 1, settle_below: float = 0.0) -> AmortizationSchedule:
+        """Zwraca harmonogram z pamięci albo liczy go i zapamiętuje (argumenty jak build_schedule)."""
+        key = (principal, annual_rate, years, periods_per_year, settle_below)
+        with self._lock:
+            schedule = self._schedules.get(key)
+            if schedule is not None:
+                self._schedules.move_to_end(key)
+                self._hits += 1
+                return schedule
+            self._misses += 1
+
+        schedule = build_schedule(principal, annual_rate, years, periods_per_year, settle_below)
+
+        with self._lock:
+            self._schedules[key] = schedule
+            self._schedules.move_to_end(key)
+            while len(self._schedules) > self.maxsize:
+                self._schedules.popitem(last=False)
+                self._evictions += 1
+        return schedule
+
+    def cache_info(self) -> CacheInfo:
+        """Statystyki: trafienia, chybienia, usunięte wpisy, rozmiar maksymalny i bieżący"""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._schedules))
+
+    def cache_clear(self):
+        """Czyści pamięć i zeruje liczniki"""
+        with self._lock:
+            self._schedules.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+# Wspólna pamięć dla obu symulatorów
+SCHEDULE_CACHE = ScheduleCache()
+
+
+def amortization_schedule(principal: float, annual_rate: float, years: int,
+                          periods_per_year: int = 1, settle_below: float = 0.0) -> AmortizationSchedule:
+    """Harmonogram spłaty ze wspólnej pamięci podręcznej (argumenty jak build_schedule)."""
+    if not (_is_real(principal) and _is_real(annual_rate)):
+        return build_schedule(principal, annual_rate, years, periods_per_year, settle_below)
+    return SCHEDULE_CACHE.get(principal, annual_rate, years, periods_per_year, settle_below)
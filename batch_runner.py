@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Wsadowe przeliczanie profili gospodarstw domowych z pliku CSV/JSONL.
+
+Każdy rekord wejściowy to jeden zestaw parametrów - kolumny nazywają się jak
+pola SimulationParams wybranego modelu (np. initial_capital, savings,
+property_price, renting_cost, lending_rate dla modelu głównego; price,
+rent_monthly, mortgage_rate, ... dla modelu archive). Brakujące albo puste
+kolumny przyjmują wartości domyślne, opcjonalna kolumna `id` jest
+przepisywana do wyników, a w modelu archive kolumna `years` ustala horyzont.
+
+Rekordy są czytane strumieniowo, grupowane w paczki i liczone w puli
+procesów. Jednocześnie w obróbce jest najwyżej kilka paczek na proces, a
+wyniki są zapisywane (CSV/JSONL/Parquet) w kolejności wejścia zaraz po
+policzeniu - zużycie pamięci nie zależy od rozmiaru pliku.
+
+Po każdej zapisanej paczce aktualizowany jest plik kontrolny
+`<wyjście>.checkpoint.json` (ustawienia przebiegu, liczba rekordów, pozycje
+w plikach). Po awarii `--resume` ucina niedokończony zapis i wznawia od
+pierwszego niezapisanego rekordu - tylko z tymi samymi ustawieniami (model,
+plik wejściowy, formaty, --scenarios/--closed-form albo --years), inaczej
+dopisywane wiersze miałyby inny kształt albo znaczenie.
+
+Parquet zapisuje stopkę dopiero przy zamknięciu pliku, więc wyjście Parquet
+to katalog plików części (`results.parquet/part-00000.parquet`, ... - pyarrow
+i pandas czytają go jak jeden zbiór danych). Część jest zamykana co
+PARQUET_CHUNKS_PER_PART paczek i dopiero wtedy zapisywany jest punkt
+kontrolny; `--resume` usuwa niedokończoną część i liczy ją od nowa.
+
+Użycie:
+    python batch_runner.py profiles.csv results.csv
+    python batch_runner.py profiles.jsonl results.jsonl --model archive --years 15
+    python batch_runner.py profiles.csv results.csv --scenarios all --closed-form
+    python batch_runner.py profiles.csv results.csv --resume
+"""
+
+import argparse
+import csv
+import dataclasses
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import real_estate_simulator_project_homework as sim
+import real_estate_simulator_project_homework_archive as archive
+
+MODELS = ('main', 'archive')
+DEFAULT_CHUNK_SIZE = 1_000  # liczba rekordów w jednej paczce
+CHUNKS_PER_WORKER = 2  # ile paczek na proces może jednocześnie czekać na wynik
+PROGRESS_INTERVAL = 2.0  # co ile sekund raportować postęp
+PARQUET_CHUNKS_PER_PART = 16  # paczek w jednym pliku części Parquet (punkt kontrolny po każdej części)
+
+MAIN_COLUMNS = ['id'] + [f.name for f in dataclasses.fields(sim.SimulationResult)]
+ARCHIVE_COLUMNS = ['id', 'years', 'buyer_net_worth', 'renter_net_worth',
+                   'property_value', 'remaining_mortgage', 'buyer_investment',
+                   'total_paid_interest', 'total_paid_principal', 'total_paid',
+                   'renter_investment', 'total_paid_rent']
+
+
+def _params_class(model: str):
+    return sim.SimulationParams if model == 'main' else archive.SimulationParams
+
+
+def output_columns(model: str) -> List[str]:
+    """Kolumny pliku wynikowego dla modelu."""
+    return MAIN_COLUMNS if model == 'main' else ARCHIVE_COLUMNS
+
+
+def detect_format(path: str) -> str:
+    """Format pliku po rozszerzeniu: 'csv', 'jsonl' albo 'parquet'."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.parquet':
+        return 'parquet'
+    raise ValueError(f"Nieznany format pliku {path!r} - podaj go jawnie (csv/jsonl/parquet)")
+
+
+# --- Wejście -----------------------------------------------------------------
+
+def read_records(stream, input_format: str) -> Iterator[Tuple[dict, int]]:
+    """
+    Czyta rekordy ze strumienia binarnego.
+
+    Args:
+        stream: plik otwarty w trybie binarnym (albo sys.stdin.buffer)
+        input_format: 'csv' albo 'jsonl'
+
+    Returns:
+        iterator par (rekord jako słownik, pozycja w pliku za rekordem - albo -1,
+        jeśli strumienia nie da się przewijać)
+    """
+    seekable = stream.seekable()
+
+    def position() -> int:
+        return stream.tell() if seekable else -1
+
+    if input_format == 'jsonl':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line), position()
+    elif input_format == 'csv':
+        lines = (line.decode('utf-8-sig') for line in stream)
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        for values in reader:
+            if values:
+                yield dict(zip(header, values)), position()
+    else:
+        raise ValueError(f"Nieobsługiwany format wejścia: {input_format}")
+
+
+def parse_profile(record: dict, model: str, offset: int, default_years: int) -> Tuple[object, dict, int]:
+    """
+    Zamienia rekord wejściowy na argumenty SimulationParams.
+
+    Args:
+        record: słownik kolumna -> wartość (tekst z CSV albo liczba z JSONL)
+        model: 'main' albo 'archive'
+        offset: numer rekordu (do komunikatów błędów i domyślnego id)
+        default_years: horyzont modelu archive, gdy rekord nie ma kolumny years
+
+    Returns:
+        (id, argumenty SimulationParams, horyzont w latach - tylko archive)
+    """
+    defaults = {f.name: f.default for f in dataclasses.fields(_params_class(model))}
+    profile_id = offset
+    years = default_years
+    kwargs = {}
+    for column, value in record.items():
+        if value is None or value == '':
+            continue
+        if column == 'id':
+            profile_id = value
+            continue
+        try:
+            if model == 'archive' and column == 'years':
+                years = int(value)
+            elif column in defaults:
+                # typ pola po wartości domyślnej (lata - int, kwoty i stopy - float)
+                kwargs[column] = int(value) if isinstance(defaults[column], int) else float(value)
+            else:
+                raise ValueError(f"nieznana kolumna {column!r}")
+        except ValueError as error:
+            raise ValueError(f"Rekord {offset}: {error}") from None
+    return profile_id, kwargs, years
+
+
+# --- Obliczenia (w procesach roboczych) ----------------------------------------
+
+def simulate_profile(model: str, profile_id, kwargs: dict, years: int,
+                     scenarios: str = 'best', analytical: bool = False) -> List[dict]:
+    """
+    Wiersze wynikowe dla jednego profilu.
+
+    Args:
+        model: 'main' albo 'archive'
+        profile_id: identyfikator profilu przepisywany do wyników
+        kwargs: argumenty SimulationParams
+        years: horyzont modelu archive
+        scenarios: model główny - 'best' (najlepszy rok zakupu) albo 'all' (wszystkie lata zakupu)
+        analytical: model główny - wzory zamknięte zamiast pętli rok po roku
+
+    Returns:
+        lista słowników (kolumny jak output_columns(model))
+    """
+    if model == 'main':
+        params = sim.SimulationParams(**kwargs)
+        simulate = sim.simulate_purchase_year_closed_form if analytical else sim.simulate_purchase_year
+        results = [simulate(year, params) for year in params.purchase_years]
+        if scenarios == 'best':
+            results = [max(results, key=lambda r: r.net_worth)]
+        return [dict(id=profile_id, **dataclasses.asdict(r)) for r in results]
+
+    result = archive.simulate(years, archive.SimulationParams(**kwargs))
+    return [dict(id=profile_id, years=result.years,
+                 buyer_net_worth=result.buyer_net_worth, renter_net_worth=result.renter_net_worth,
+                 **result.buyer_details, **result.renter_details)]
+
+
+def _simulate_chunk(task: tuple) -> List[dict]:
+    """Wiersze wynikowe dla paczki profili (w kolejności wejścia)."""
+    model, profiles, scenarios, analytical = task
+    rows: List[dict] = []
+    for profile_id, kwargs, years in profiles:
+        rows.extend(simulate_profile(model, profile_id, kwargs, years, scenarios, analytical))
+    return rows
+
+
+# --- Wyjście -----------------------------------------------------------------
+
+class CsvResultWriter:
+    """
+    Wyniki jako CSV (liczby z pełną precyzją).
+
+    Pozycja wyjścia (do pliku kontrolnego) to rozmiar pliku - każdą zapisaną
+    paczkę można utrwalić i wznowić od niej.
+    """
+
+    @staticmethod
+    def truncate(path: str, position: int):
+        """Odrzuca wyniki zapisane po pozycji z punktu kontrolnego."""
+        with open(path, 'r+b') as f:
+            f.truncate(position)
+
+    def __init__(self, path: str, columns: List[str], append: bool = False):
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._columns = columns
+        if not append or self._file.tell() == 0:
+            self._writer.writerow(columns)
+
+    def write_rows(self, rows: List[dict]):
+        self._writer.writerows([[row[c] for c in self._columns] for row in rows])
+
+    def sync(self) -> Optional[int]:
+        """Utrwala zapisane dane i zwraca pozycję wyjścia (rozmiar pliku)."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def finish(self) -> Optional[int]:
+        """Koniec danych - utrwala wszystko i zwraca końcową pozycję wyjścia."""
+        return self.sync()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlResultWriter(CsvResultWriter):
+    """Wyniki jako JSONL - jeden obiekt JSON na wiersz."""
+
+    def __init__(self, path: str, columns: List[str], append: bool = False):
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+        self._columns = columns
+
+    def write_rows(self, rows: List[dict]):
+        self._file.write(''.join(json.dumps({c: row[c] for c in self._columns}) + '\n' for row in rows))
+
+
+class ParquetResultWriter:
+    """
+    Wyniki jako Parquet - katalog plików części, jedna grupa wierszy na paczkę (wymaga pyarrow).
+
+    Plik Parquet jest kompletny dopiero po zapisaniu stopki, więc co
+    PARQUET_CHUNKS_PER_PART paczek bieżąca część jest zamykana i utrwalana.
+    Pozycja wyjścia (do pliku kontrolnego) to liczba zamkniętych części;
+    między zamknięciami sync() zwraca None - punktu kontrolnego nie ma.
+    """
+
+    @staticmethod
+    def part_path(path: str, part: int) -> str:
+        return os.path.join(path, f'part-{part:05d}.parquet')
+
+    @staticmethod
+    def truncate(path: str, position: int):
+        """Usuwa części o numerach >= position (niedokończone albo spoza punktu kontrolnego)."""
+        if not os.path.isdir(path):
+            return
+        for name in os.listdir(path):
+            stem, extension = os.path.splitext(name)
+            if name.startswith('part-') and extension == '.parquet' and stem[len('part-'):].isdigit():
+                if int(stem[len('part-'):]) >= position:
+                    os.remove(os.path.join(path, name))
+
+    def __init__(self, path: str, columns: List[str], append: bool = False):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Zapis do Parquet wymaga biblioteki pyarrow (pip install pyarrow)") from None
+        self._pyarrow = pyarrow
+        self._columns = columns
+        self._path = path
+        os.makedirs(path, exist_ok=True)
+        if not append:
+            self.truncate(path, 0)
+        self._part = 0  # numer bieżącej (jeszcze niezamkniętej) części
+        while os.path.exists(self.part_path(path, self._part)):
+            self._part += 1
+        # schemat ustalamy po pierwszej paczce (id może być liczbą albo tekstem); przy wznowieniu - z części 0
+        self._schema = pyarrow.parquet.read_schema(self.part_path(path, 0)) if self._part else None
+        self._writer = None
+        self._chunks = 0  # paczek w bieżącej części
+
+    def write_rows(self, rows: List[dict]):
+        if not rows:
+            return
+        table = self._pyarrow.table({c: [row[c] for row in rows] for c in self._columns})
+        if self._schema is None:
+            self._schema = table.schema
+        else:
+            table = table.cast(self._schema)
+        if self._writer is None:
+            self._writer = self._pyarrow.parquet.ParquetWriter(self.part_path(self._path, self._part), self._schema)
+        self._writer.write_table(table)
+        self._chunks += 1
+
+    def _close_part(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        with open(self.part_path(self._path, self._part), 'rb') as f:
+            os.fsync(f.fileno())
+        self._part += 1
+        self._chunks = 0
+
+    def sync(self) -> Optional[int]:
+        """Zamyka część co PARQUET_CHUNKS_PER_PART paczek i zwraca liczbę zamkniętych części (inaczej None)."""
+        if self._chunks < PARQUET_CHUNKS_PER_PART:
+            return None
+        self._close_part()
+        return self._part
+
+    def finish(self) -> Optional[int]:
+        """Koniec danych - zamyka ostatnią część i zwraca liczbę zamkniętych części."""
+        self._close_part()
+        return self._part
+
+    def close(self):
+        # bez finish() (np. po błędzie) bieżąca część nie ma punktu kontrolnego - wznowienie ją usunie
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+WRITERS = {'csv': CsvResultWriter, 'jsonl': JsonlResultWriter, 'parquet': ParquetResultWriter}
+
+
+# --- Plik kontrolny ------------------------------------------------------------
+
+def checkpoint_path(output_path: str) -> str:
+    return output_path + '.checkpoint.json'
+
+
+def load_checkpoint(output_path: str) -> Optional[Dict]:
+    """Ostatni zapisany stan albo None."""
+    try:
+        with open(checkpoint_path(output_path), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def run_settings(input_path: str, model: str, input_format: str, output_format: str,
+                 years: int, scenarios: str, analytical: bool) -> Dict:
+    """Ustawienia, od których zależy kształt i znaczenie wierszy wyniku (zapisywane w pliku kontrolnym)."""
+    settings = {'model': model, 'input': input_path if input_path == '-' else os.path.abspath(input_path),
+                'input_format': input_format, 'output_format': output_format}
+    if model == 'main':
+        settings.update(scenarios=scenarios, analytical=analytical)
+    else:
+        settings.update(years=years)
+    return settings
+
+
+def _save_checkpoint(output_path: str, state: Dict):
+    """Zapis atomowy (plik tymczasowy + os.replace) - po awarii zostaje stary albo nowy stan."""
+    path = checkpoint_path(output_path)
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+class _PrefixedStream:
+    """Strumień do read_records: najpierw podane bajty (nagłówek CSV), potem plik od bieżącej pozycji."""
+
+    def __init__(self, prefix: bytes, stream):
+        self._prefix = prefix
+        self._stream = stream
+
+    def __iter__(self):
+        if self._prefix:
+            yield self._prefix
+        yield from self._stream
+
+    def seekable(self) -> bool:
+        return self._stream.seekable()
+
+    def tell(self) -> int:
+        return self._stream.tell()
+
+
+# --- Przebieg wsadowy ----------------------------------------------------------
+
+class _Progress:
+    """Raport postępu na stderr (co PROGRESS_INTERVAL sekund i na końcu)."""
+
+    def __init__(self, total_bytes: Optional[int], start_records: int, enabled: bool):
+        self.total_bytes = total_bytes
+        self.start_records = start_records
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    def update(self, records: int, input_position: int, final: bool = False):
+        now = time.perf_counter()
+        if not self.enabled or (not final and now - self.last_report < PROGRESS_INTERVAL):
+            return
+        self.last_report = now
+        elapsed = now - self.started
+        rate = (records - self.start_records) / elapsed if elapsed > 0 else 0.0
+        line = f"Przetworzono {records:,} rekordów, {rate:,.0f} rek./s"
+        if self.total_bytes and input_position >= 0:
+            line += f" ({input_position / self.total_bytes:.1%} pliku)"
+        print(line, file=sys.stderr, flush=True)
+
+
+def run_batch(input_path: str, output_path: str, model: str = 'main',
+              input_format: Optional[str] = None, output_format: Optional[str] = None,
+              years: int = 10, scenarios: str = 'best', analytical: bool = False,
+              workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              offset: int = 0, resume: bool = False, progress: bool = True) -> int:
+    """
+    Przelicza wszystkie profile z pliku wejściowego i zapisuje wyniki.
+
+    Args:
+        input_path: plik CSV/JSONL z profilami ('-' = standardowe wejście)
+        output_path: plik wynikowy CSV/JSONL albo katalog części Parquet
+        model: 'main' (rok po roku, wszystkie lata zakupu) albo 'archive' (miesięcznie)
+        input_format, output_format: format plików (domyślnie po rozszerzeniu)
+        years: horyzont modelu archive dla rekordów bez kolumny years
+        scenarios: model główny - 'best' albo 'all' (wiersz na każdy rok zakupu)
+        analytical: model główny - wzory zamknięte (simulate_purchase_year_closed_form)
+        workers: liczba procesów (domyślnie liczba rdzeni, 1 = bez puli)
+        chunk_size: liczba rekordów w paczce
+        offset: pomiń tyle pierwszych rekordów wejścia
+        resume: wznów od stanu z pliku kontrolnego (nadpisuje offset)
+        progress: raportuj postęp na stderr
+
+    Returns:
+        numer pierwszego nieprzetworzonego rekordu (= liczba rekordów wejścia)
+    """
+    if model not in MODELS:
+        raise ValueError(f"Nieznany model: {model}")
+    if scenarios not in ('best', 'all'):
+        raise ValueError(f"Nieznany wybór scenariuszy: {scenarios}")
+    from_stdin = input_path == '-'
+    input_format = input_format or ('csv' if from_stdin else detect_format(input_path))
+    output_format = output_format or detect_format(output_path)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    settings = run_settings(input_path, model, input_format, output_format, years, scenarios, analytical)
+    state = load_checkpoint(output_path) if resume else None
+    if state is not None:
+        saved = state.get('settings', {'model': state.get('model')})
+        changed = sorted(name for name in settings.keys() | saved.keys() if saved.get(name) != settings.get(name))
+        if changed:
+            raise ValueError(f"Plik kontrolny dotyczy innych ustawień ({', '.join(changed)}) - "
+                             f"wznów z tymi samymi albo zapisz do nowego pliku")
+        offset = state['records']
+    append = state is not None
+    if append:
+        # odrzucamy wyniki zapisane po ostatnim punkcie kontrolnym
+        WRITERS[output_format].truncate(output_path, state['output_position'])
+
+    stream = sys.stdin.buffer if from_stdin else open(input_path, 'rb')
+    writer = WRITERS[output_format](output_path, output_columns(model), append)
+    try:
+        # Szybkie wznowienie: przewijamy plik do zapamiętanej pozycji zamiast czytać pominięte rekordy
+        skip = offset
+        if state is not None and state.get('input_bytes', -1) > 0 and stream.seekable():
+            header = stream.readline() if input_format == 'csv' else b''
+            stream.seek(state['input_bytes'])
+            records = read_records(_PrefixedStream(header, stream), input_format)
+            skip = 0
+        else:
+            records = read_records(stream, input_format)
+        for _ in range(skip):
+            if next(records, None) is None:
+                break
+
+        total_bytes = os.fstat(stream.fileno()).st_size if not from_stdin and stream.seekable() else None
+        report = _Progress(total_bytes, offset, progress)
+        done = offset
+        input_position = state['input_bytes'] if state is not None else -1
+
+        def chunks() -> Iterator[Tuple[tuple, int, int]]:
+            """Paczki do policzenia: (zadanie, liczba rekordów, pozycja w pliku za paczką)."""
+            index = offset
+            profiles = []
+            position = -1
+            for record, position in records:
+                profiles.append(parse_profile(record, model, index, years))
+                index += 1
+                if len(profiles) == chunk_size:
+                    yield (model, profiles, scenarios, analytical), len(profiles), position
+                    profiles = []
+            if profiles:
+                yield (model, profiles, scenarios, analytical), len(profiles), position
+
+        def commit(rows: List[dict], count: int, position: int):
+            nonlocal done, input_position
+            writer.write_rows(rows)
+            done += count
+            input_position = position
+            output_position = writer.sync()
+            if output_position is not None:
+                _save_checkpoint(output_path, {'model': model, 'settings': settings, 'records': done,
+                                               'input_bytes': position, 'output_position': output_position})
+            report.update(done, position)
+
+        if workers <= 1:
+            for task, count, position in chunks():
+                commit(_simulate_chunk(task), count, position)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()  # najwyżej CHUNKS_PER_WORKER paczek na proces - stała pamięć
+                for task, count, position in chunks():
+                    pending.append((executor.submit(_simulate_chunk, task), count, position))
+                    if len(pending) >= workers * CHUNKS_PER_WORKER:
+                        future, count, position = pending.popleft()
+                        commit(future.result(), count, position)
+                while pending:
+                    future, count, position = pending.popleft()
+                    commit(future.result(), count, position)
+        _save_checkpoint(output_path, {'model': model, 'settings': settings, 'records': done,
+                                       'input_bytes': input_position, 'output_position': writer.finish()})
+    finally:
+        writer.close()
+        if not from_stdin:
+            stream.close()
+
+    report.update(done, input_position, final=True)
+    return done
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Wsadowe przeliczanie profili z pliku CSV/JSONL")
+    parser.add_argument('input', help="plik z profilami (CSV/JSONL, '-' = stdin w formacie CSV)")
+    parser.add_argument('output', help="plik wynikowy (CSV/JSONL/Parquet)")
+    parser.add_argument('--model', choices=MODELS, default='main', help="model symulacji")
+    parser.add_argument('--input-format', choices=('csv', 'jsonl'), help="format wejścia (domyślnie po rozszerzeniu)")
+    parser.add_argument('--output-format', choices=tuple(WRITERS), help="format wyjścia (domyślnie po rozszerzeniu)")
+    parser.add_argument('--years', type=int, default=10, help="horyzont modelu archive (domyślnie 10)")
+    parser.add_argument('--scenarios', choices=('best', 'all'), default='best',
+                        help="model główny: tylko najlepszy rok zakupu albo wszystkie")
+    parser.add_argument('--closed-form', action='store_true', help="model główny: wzory zamknięte zamiast pętli")
+    parser.add_argument('--workers', type=int, default=None, help="liczba procesów")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="liczba rekordów w paczce")
+    parser.add_argument('--offset', type=int, default=0, help="pomiń tyle pierwszych rekordów")
+    parser.add_argument('--resume', action='store_true', help="wznów od ostatniego punktu kontrolnego")
+    parser.add_argument('--quiet', action='store_true', help="bez raportu postępu")
+    args = parser.parse_args()
+
+    run_batch(args.input, args.output, model=args.model,
+              input_format=args.input_format, output_format=args.output_format,
+              years=args.years, scenarios=args.scenarios, analytical=args.closed_form,
+              workers=args.workers, chunk_size=args.chunk_size,
+              offset=args.offset, resume=args.resume, progress=not args.quiet)
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Wsadowy (wektorowy) silnik symulacji zakupu vs wynajmu nieruchomości.
+
+Ten sam model co `simulate_purchase_year` z pliku
+real_estate_simulator_project_homework.py, ale zamiast jednego scenariusza
+liczymy naraz całą paczkę scenariuszy (rok zakupu × kapitał × oszczędności ×
+stopy × ceny). Pętla po latach zostaje, natomiast każdy krok roku to operacje
+na tablicach NumPy dla wszystkich scenariuszy jednocześnie.
+
+Wynik jest kolumnowy (BatchSimulationResult) - każde pole SimulationResult
+to osobna tablica o długości równej liczbie scenariuszy.
+
+Wymaga biblioteki numpy (główny symulator działa bez niej).
+"""
+
+from dataclasses import dataclass, fields
+from typing import Optional
+
+import numpy as np
+
+import real_estate_simulator_project_homework as sim
+
+
+# Nazwy kolumn wyniku - dokładnie pola SimulationResult
+RESULT_FIELDS = tuple(f.name for f in fields(sim.SimulationResult))
+
+
+@dataclass
+class BatchSimulationResult:
+    """Kolumnowy wynik symulacji wsadowej (jedna tablica na pole SimulationResult)"""
+    purchase_year: np.ndarray  # rok zakupu (int)
+    net_worth: np.ndarray  # końcowy majątek
+    property_value: np.ndarray  # wartość nieruchomości (0 jeśli nie kupiono)
+    investment: np.ndarray  # kapitał na lokacie
+    remaining_mortgage: np.ndarray  # pozostały kredyt
+    total_paid_rent: np.ndarray  # łączna suma zapłaconego czynszu
+    total_paid_mortgage: np.ndarray  # łączna suma spłaconych rat kredytu
+    total_paid_owning_costs: np.ndarray  # łączna suma kosztów posiadania
+    monthly_mortgage_payment: np.ndarray  # miesięczna rata kredytu
+    loan_amount: np.ndarray  # początkowa kwota kredytu
+
+    def __len__(self) -> int:
+        return len(self.net_worth)
+
+    def row(self, index: int) -> sim.SimulationResult:
+        """
+        Zwraca pojedynczy scenariusz jako SimulationResult.
+
+        Args:
+            index: numer scenariusza w paczce
+
+        Returns:
+            SimulationResult z wartościami danego scenariusza
+        """
+        values = {name: getattr(self, name)[index].item() for name in RESULT_FIELDS}
+        return sim.SimulationResult(**values)
+
+
+def annual_payment_batch(principal: np.ndarray, annual_rate: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Wektorowa wersja `annual_payment` - stała roczna rata kredytu (annuity).
+
+    Args:
+        principal: kwoty kredytu
+        annual_rate: roczne oprocentowanie
+        years: okresy kredytu w latach
+
+    Returns:
+        tablica rocznych rat kredytu
+    """
+    r = annual_rate
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + r) ** years
+        payment = principal * (r * growth) / (growth - 1)
+        zero_rate_payment = principal / years
+    payment = np.where(r == 0, zero_rate_payment, payment)
+    return np.where(principal <= 0, 0.0, payment)
+
+
+def simulate_batch(purchase_year,
+                   initial_capital=None,
+                   savings=None,
+                   deposit_interest_rate=None,
+                   property_price=None,
+                   lending_rate=None,
+                   mortgage_term_years=None,
+                   owning_cost=None,
+                   renting_cost=None,
+                   real_estate_price_change=None,
+                   n_years: Optional[int] = None,
+                   params: Optional[sim.SimulationParams] = None,
+                   deposit_rate_path: Optional[np.ndarray] = None,
+                   lending_rate_path: Optional[np.ndarray] = None,
+                   price_change_path: Optional[np.ndarray] = None,
+                   rent_change_path: Optional[np.ndarray] = None,
+                   path_index: Optional[np.ndarray] = None) -> BatchSimulationResult:
+    """
+    Symuluje paczkę scenariuszy naraz (wektorowo po wszystkich scenariuszach).
+
+    Każdy argument może być liczbą albo tablicą - tablice są rozgłaszane
+    (broadcast) do wspólnego kształtu i spłaszczane. Brakujące parametry
+    przyjmują wartości z `params` (domyślnie SimulationParams()).
+
+    Zamiast stałych stóp można podać ścieżki stóp rok po roku (tablice
+    o kształcie (liczba scenariuszy, n_years + 1)) - kolumna `year` to
+    stopa obowiązująca w danym roku. Przy ścieżce oprocentowania kredytu
+    rata jest co roku przeliczana (annuity) od pozostałego długu na
+    pozostałe lata, tak jak w kredycie o zmiennej stopie.
+
+    Gdy wiele scenariuszy dzieli tę samą ścieżkę (np. wszystkie lata zakupu
+    na jednej ścieżce Monte Carlo), zamiast powtarzać wiersze ścieżek można
+    podać path_index - numer wiersza ścieżki dla każdego scenariusza. Wtedy
+    co roku wybierana jest tylko jedna kolumna stóp, a ścieżki nie są
+    kopiowane dla każdego scenariusza.
+
+    Args:
+        purchase_year: rok zakupu (0 = od razu, n_years+1 = nigdy)
+        initial_capital, savings, ..., real_estate_price_change: parametry
+            modelu (odpowiedniki pól SimulationParams)
+        n_years: długość rozpatrywanego okresu (wspólna dla całej paczki)
+        params: parametry bazowe dla argumentów, które nie zostały podane
+        deposit_rate_path: roczne oprocentowanie lokaty w kolejnych latach
+        lending_rate_path: roczne oprocentowanie kredytu w kolejnych latach
+        price_change_path: roczna zmiana cen nieruchomości i czynszu w kolejnych
+            latach (kolumna 0 nie jest używana - w roku 0 nie ma wzrostu)
+        rent_change_path: roczna zmiana czynszu w kolejnych latach, jeśli czynsz
+            ma zmieniać się inaczej niż ceny nieruchomości (kolumna 0 nie jest używana)
+        path_index: numer wiersza ścieżek stóp dla każdego scenariusza
+            (domyślnie wiersz = numer scenariusza)
+
+    Returns:
+        BatchSimulationResult z wynikami wszystkich scenariuszy
+    """
+    if params is None:
+        params = sim.SimulationParams()
+    if n_years is None:
+        n_years = params.n_years
+
+    def default(value, param_value):
+        return param_value if value is None else value
+
+    (purchase_year, initial_capital, savings, deposit_interest_rate, property_price,
+     lending_rate, mortgage_term_years, owning_cost, renting_cost,
+     real_estate_price_change) = (np.ravel(a) for a in np.broadcast_arrays(
+        np.asarray(purchase_year, dtype=np.int64),
+        np.asarray(default(initial_capital, params.initial_capital), dtype=np.float64),
+        np.asarray(default(savings, params.savings), dtype=np.float64),
+        np.asarray(default(deposit_interest_rate, params.deposit_interest_rate), dtype=np.float64),
+        np.asarray(default(property_price, params.property_price), dtype=np.float64),
+        np.asarray(default(lending_rate, params.lending_rate), dtype=np.float64),
+        np.asarray(default(mortgage_term_years, params.mortgage_term_years), dtype=np.int64),
+        np.asarray(default(owning_cost, params.owning_cost), dtype=np.float64),
+        np.asarray(default(renting_cost, params.renting_cost), dtype=np.float64),
+        np.asarray(default(real_estate_price_change, params.real_estate_price_change), dtype=np.float64),
+    ))
+
+    size = purchase_year.shape[0]
+    price_growth = 1 + real_estate_price_change
+    deposit_growth = 1 + deposit_interest_rate
+    price_index = np.ones(size)  # skumulowany wzrost cen (tylko dla ścieżki zmian cen)
+
+    # Stan symulacji - po jednej wartości na scenariusz
+    investment = initial_capital.copy()  # kapitał na lokacie
+    property_value = np.zeros(size)  # wartość posiadanej nieruchomości
+    remaining_mortgage = np.zeros(size)  # pozostały kredyt do spłaty
+    current_rent = renting_cost.copy()  # aktualny czynsz
+
+    total_paid_rent = np.zeros(size)
+    total_paid_mortgage = np.zeros(size)
+    total_paid_owning_costs = np.zeros(size)
+
+    annual_mortgage_payment = np.zeros(size)
+    monthly_mortgage_payment = np.zeros(size)
+    mortgage_years_remaining = np.zeros(size, dtype=np.int64)
+    loan_amount = np.zeros(size)
+
+    def path_column(path: np.ndarray, year: int) -> np.ndarray:
+        column = path[:, year]
+        return column if path_index is None else column[path_index]
+
+    for year in range(n_years + 1):
+        # Stopy obowiązujące w tym roku (stałe albo z podanych ścieżek)
+        if deposit_rate_path is not None:
+            deposit_growth = 1 + path_column(deposit_rate_path, year)
+        if lending_rate_path is not None:
+            lending_rate = path_column(lending_rate_path, year)
+        if price_change_path is not None:
+            price_growth = 1 + path_column(price_change_path, year)
+            if year > 0:
+                price_index = price_index * price_growth
+
+        # ZAKUP NIERUCHOMOŚCI - tylko scenariusze, które kupują w tym roku
+        purchased_this_year = (purchase_year == year) & (property_value == 0)
+        if purchased_this_year.any():
+            if price_change_path is None:
+                current_property_price = property_price * price_growth ** year
+            else:
+                current_property_price = property_price * price_index
+            down_payment = np.minimum(investment, current_property_price)
+            new_loan = np.maximum(0.0, current_property_price - down_payment)
+            new_payment = annual_payment_batch(new_loan, lending_rate, mortgage_term_years)
+
+            loan_amount = np.where(purchased_this_year, new_loan, loan_amount)
+            remaining_mortgage = np.where(purchased_this_year, new_loan, remaining_mortgage)
+            mortgage_years_remaining = np.where(purchased_this_year, mortgage_term_years, mortgage_years_remaining)
+            annual_mortgage_payment = np.where(purchased_this_year, new_payment, annual_mortgage_payment)
+            monthly_mortgage_payment = np.where(purchased_this_year, new_payment / 12.0, monthly_mortgage_payment)
+            property_value = np.where(purchased_this_year, current_property_price, property_value)
+            investment = np.where(purchased_this_year, investment - down_payment, investment)
+
+        # Aprecjacja nieruchomości (poza rokiem zakupu) i wzrost czynszu
+        if year > 0:
+            appreciating = (property_value > 0) & ~purchased_this_year
+            property_value = np.where(appreciating, property_value * price_growth, property_value)
+            if rent_change_path is None:
+                current_rent = current_rent * price_growth
+            else:
+                current_rent = current_rent * (1 + path_column(rent_change_path, year))
+
+        owner = property_value > 0
+        owning_cost_this_year = property_value * owning_cost
+
+        # Spłata kredytu - tylko właściciele z niespłaconym kredytem
+        paying = owner & (remaining_mortgage > 0) & (mortgage_years_remaining > 0)
+        if lending_rate_path is not None:
+            # Zmienna stopa: rata przeliczana od pozostałego długu na pozostałe lata
+            annual_mortgage_payment = np.where(
+                paying,
+                annual_payment_batch(remaining_mortgage, lending_rate, np.maximum(mortgage_years_remaining, 1)),
+                annual_mortgage_payment,
+            )
+        yearly_interest = remaining_mortgage * lending_rate
+        actual_payment = np.minimum(annual_mortgage_payment, remaining_mortgage + yearly_interest)
+        principal_paid = actual_payment - yearly_interest
+        remaining_mortgage = np.where(paying, np.maximum(0.0, remaining_mortgage - principal_paid), remaining_mortgage)
+        mortgage_years_remaining = np.where(paying, mortgage_years_remaining - 1, mortgage_years_remaining)
+        total_paid_mortgage = total_paid_mortgage + np.where(paying, actual_payment, 0.0)
+
+        # Wydatki: właściciel - rata + utrzymanie, najemca - czynsz
+        yearly_expenses = np.where(
+            owner,
+            np.where(paying, actual_payment + owning_cost_this_year, owning_cost_this_year),
+            current_rent,
+        )
+        total_paid_owning_costs = total_paid_owning_costs + np.where(owner, owning_cost_this_year, 0.0)
+        total_paid_rent = total_paid_rent + np.where(owner, 0.0, current_rent)
+
+        # Kapitalizacja lokaty i dopisanie rocznej nadwyżki
+        investment = investment * deposit_growth
+        investment = investment + (savings - yearly_expenses)
+
+    return BatchSimulationResult(
+        purchase_year=purchase_year,
+        net_worth=property_value + investment - remaining_mortgage,
+        property_value=property_value,
+        investment=investment,
+        remaining_mortgage=remaining_mortgage,
+        total_paid_rent=total_paid_rent,
+        total_paid_mortgage=total_paid_mortgage,
+        total_paid_owning_costs=total_paid_owning_costs,
+        monthly_mortgage_payment=monthly_mortgage_payment,
+        loan_amount=loan_amount,
+    )
+
+
+def simulate_grid(purchase_years=None, n_years: Optional[int] = None,
+                  params: Optional[sim.SimulationParams] = None, **parameter_values) -> BatchSimulationResult:
+    """
+    Symuluje iloczyn kartezjański wartości parametrów (siatkę scenariuszy).
+
+    Przykład: simulate_grid(initial_capital=[1e5, 2e5], savings=[4e4, 6e4])
+    policzy 2 × 2 × (n_years + 2) scenariuszy - dla każdej pary parametrów
+    wszystkie lata zakupu razem z opcją "tylko wynajem".
+
+    Args:
+        purchase_years: lata zakupu (domyślnie 0 .. n_years+1)
+        n_years: długość rozpatrywanego okresu
+        params: parametry bazowe dla parametrów spoza siatki
+        **parameter_values: listy wartości parametrów simulate_batch
+
+    Returns:
+        BatchSimulationResult; kolejność scenariuszy jak w np.meshgrid(indexing='ij'),
+        rok zakupu jest pierwszą (najwolniej zmieniającą się) osią
+    """
+    if params is None:
+        params = sim.SimulationParams()
+    if n_years is None:
+        n_years = params.n_years
+    if purchase_years is None:
+        purchase_years = range(n_years + 2)
+
+    names = list(parameter_values)
+    axes = [np.asarray(purchase_years)] + [np.atleast_1d(parameter_values[name]) for name in names]
+    mesh = np.meshgrid(*axes, indexing='ij')
+    columns = {name: grid.ravel() for name, grid in zip(names, mesh[1:])}
+    return simulate_batch(mesh[0].ravel(), n_years=n_years, params=params, **columns)
+
+
+@dataclass
+class ArchiveBatchResult:
+    """
+    Kolumnowy wynik wsadowej symulacji modelu miesięcznego (plik archive).
+
+    Tablice *_net_worth_by_year mają kształt (liczba scenariuszy, years) -
+    kolumna h-1 to majątek po h latach (to samo co simulate(years=h)).
+    Pozostałe pola to stan końcowy, jak buyer_details / renter_details.
+    """
+    buyer_net_worth_by_year: np.ndarray
+    renter_net_worth_by_year: np.ndarray
+    property_value: np.ndarray
+    remaining_mortgage: np.ndarray
+    buyer_investment: np.ndarray
+    total_paid_interest: np.ndarray
+    total_paid_principal: np.ndarray
+    total_paid: np.ndarray
+    renter_investment: np.ndarray
+    total_paid_rent: np.ndarray
+
+    def __len__(self) -> int:
+        return self.buyer_net_worth_by_year.shape[0]
+
+
+def monthly_mortgage_payment_batch(principal: np.ndarray, annual_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Wektorowa wersja `monthly_mortgage_payment` (okres podany w miesiącach)."""
+    r = annual_rate / 12.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + r) ** months
+        payment = principal * (r * growth) / (growth - 1)
+        zero_rate_payment = principal / months
+    payment = np.where(r == 0, zero_rate_payment, payment)
+    return np.where(principal <= 0, 0.0, payment)
+
+
+def simulate_archive_batch(years: int,
+                           size: int = 1,
+                           appreciation_path: Optional[np.ndarray] = None,
+                           investment_return_path: Optional[np.ndarray] = None,
+                           mortgage_rate_path: Optional[np.ndarray] = None,
+                           rent_increase_path: Optional[np.ndarray] = None,
+                           params=None,
+                           **parameters) -> ArchiveBatchResult:
+    """
+    Wektorowa wersja `simulate` z pliku archive (model miesięczny kupujący vs najemca).
+
+    Parametry modelu pochodzą z `params` (archive.SimulationParams, domyślnie
+    wartości globalne modułu archive); pojedyncze pola można nadpisać liczbą
+    albo tablicą o długości size (price=..., initial_capital=..., ...).
+
+    Ścieżki stóp mają kształt (size, years) i zawierają wartości roczne:
+    appreciation_path - wzrost wartości nieruchomości stosowany na początku
+    roku (kolumna 0 nie jest używana), investment_return_path - roczny zwrot
+    z inwestycji w danym roku, mortgage_rate_path - oprocentowanie kredytu
+    w danym roku; przy zmianie stopy rata jest przeliczana od pozostałego
+    długu na pozostałe miesiące. rent_increase_path - wzrost czynszu stosowany
+    na początku roku (kolumna 0 nie jest używana).
+
+    Args:
+        years: horyzont symulacji w latach
+        size: liczba scenariuszy (ścieżek)
+        appreciation_path, investment_return_path, mortgage_rate_path, rent_increase_path: opcjonalne ścieżki stóp
+        params: parametry modelu archive (SimulationParams)
+        **parameters: nadpisane pola parametrów
+
+    Returns:
+        ArchiveBatchResult ze stanem po każdym roku i stanem końcowym
+    """
+    import real_estate_simulator_project_homework_archive as archive
+
+    if params is None:
+        params = archive.SimulationParams()
+
+    def param(name):
+        return np.broadcast_to(np.asarray(parameters.get(name, getattr(params, name)), dtype=np.float64), (size,))
+
+    price = param('price')
+    initial_capital = param('initial_capital')
+    down_payment = param('down_payment')
+    mortgage_rate = param('mortgage_rate')
+    term_months = param('mortgage_term_years') * 12
+    monthly_salary = param('monthly_salary')
+    living_cost = param('living_cost')
+    admin_monthly_buy = param('admin_monthly_buy')
+    maintenance_annual_pct = param('maintenance_annual_pct')
+    appreciation = 1 + param('property_annual_appreciation')
+    rent_growth = 1 + param('rent_annual_increase')
+    monthly_growth = 1 + ((1 + param('investment_annual_return')) ** (1 / 12) - 1)
+
+    # setup kupującego
+    principal = np.maximum(0.0, price - down_payment)
+    buyer_investment = np.maximum(0.0, initial_capital - down_payment)
+    remaining_mortgage = principal.copy()
+    property_value = price.copy()
+    if mortgage_rate_path is not None:
+        mortgage_rate = mortgage_rate_path[:, 0]
+    current_monthly_payment = monthly_mortgage_payment_batch(principal, mortgage_rate, term_months)
+
+    # setup najemcy
+    renter_investment = initial_capital.copy()
+    current_rent = param('rent_monthly').copy()
+
+    buyer_paid_interest = np.zeros(size)
+    buyer_paid_principal = np.zeros(size)
+    renter_total_paid_rent = np.zeros(size)
+    buyer_total_paid = np.zeros(size)
+
+    buyer_net_worth_by_year = np.empty((size, years))
+    renter_net_worth_by_year = np.empty((size, years))
+
+    for month in range(1, years * 12 + 1):
+        year = (month - 1) // 12
+        if archive.is_new_year(month):
+            if appreciation_path is not None:
+                appreciation = 1 + appreciation_path[:, year]
+            property_value = property_value * appreciation
+            if rent_increase_path is not None:
+                rent_growth = 1 + rent_increase_path[:, year]
+            current_rent = current_rent * rent_growth
+            if investment_return_path is not None:
+                monthly_growth = 1 + ((1 + investment_return_path[:, year]) ** (1 / 12) - 1)
+            if mortgage_rate_path is not None:
+                # Zmienna stopa - przeliczenie raty od pozostałego długu na pozostałe miesiące
+                mortgage_rate = mortgage_rate_path[:, year]
+                months_left = np.maximum(term_months - (month - 1), 1)
+                current_monthly_payment = np.where(
+                    remaining_mortgage > 0,
+                    monthly_mortgage_payment_batch(remaining_mortgage, mortgage_rate, months_left),
+                    0.0,
+                )
+        elif month == 1 and investment_return_path is not None:
+            monthly_growth = 1 + ((1 + investment_return_path[:, 0]) ** (1 / 12) - 1)
+
+        monthly_maintenance = property_value * maintenance_annual_pct / 12.0
+        monthly_interest = remaining_mortgage * (mortgage_rate / 12.0)
+
+        paying = remaining_mortgage > 0
+        payment = np.where(paying, np.minimum(current_monthly_payment, remaining_mortgage + monthly_interest), 0.0)
+        principal_component = np.where(paying, payment - monthly_interest, 0.0)
+        remaining_mortgage = np.where(paying, np.maximum(0.0, remaining_mortgage - principal_component), remaining_mortgage)
+        buyer_paid_interest = buyer_paid_interest + np.where(paying, monthly_interest, 0.0)
+        buyer_paid_principal = buyer_paid_principal + principal_component
+        buyer_total_paid = buyer_total_paid + np.where(paying, payment + monthly_maintenance + admin_monthly_buy, 0.0)
+
+        renter_total_paid_rent = renter_total_paid_rent + current_rent
+
+        monthly_surplus_renter = monthly_salary - living_cost - current_rent
+        monthly_surplus_buyer = monthly_salary - living_cost - payment - monthly_maintenance - admin_monthly_buy
+
+        buyer_investment = buyer_investment * monthly_growth
+        renter_investment = renter_investment * monthly_growth
+        renter_investment = renter_investment + monthly_surplus_renter
+        buyer_investment = buyer_investment + monthly_surplus_buyer
+
+        paid_off = remaining_mortgage <= 1e-8
+        remaining_mortgage = np.where(paid_off, 0.0, remaining_mortgage)
+        current_monthly_payment = np.where(paid_off, 0.0, current_monthly_payment)
+
+        if month % 12 == 0:
+            buyer_net_worth_by_year[:, year] = property_value - remaining_mortgage + buyer_investment
+            renter_net_worth_by_year[:, year] = renter_investment
+
+    return ArchiveBatchResult(
+        buyer_net_worth_by_year=buyer_net_worth_by_year,
+        renter_net_worth_by_year=renter_net_worth_by_year,
+        property_value=property_value,
+        remaining_mortgage=remaining_mortgage,
+        buyer_investment=buyer_investment,
+        total_paid_interest=buyer_paid_interest,
+        total_paid_principal=buyer_paid_principal,
+        total_paid=buyer_total_paid,
+        renter_investment=renter_investment,
+        total_paid_rent=renter_total_paid_rent,
+    )
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmarki obu symulatorów.
+
+Mierzy czas głównych funkcji dla rosnących horyzontów (10, 50, 100, 500 lat),
+rozmiarów paczek oraz rozdzielczości rocznej (główny symulator) i miesięcznej
+(plik archive). Raportuje przepustowość w scenariuszach na sekundę i szczytowe
+zużycie pamięci (tracemalloc).
+
+Użycie:
+    python benchmarks.py --output baseline.json            # zapis wyników
+    python benchmarks.py --compare baseline.json           # porównanie z bazą
+    python benchmarks.py --compare baseline.json --threshold 0.2 --quick
+
+W trybie porównania każde spowolnienie większe niż próg (domyślnie 10%)
+jest zgłaszane, a program kończy się kodem 1.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+import real_estate_simulator_project_homework as sim
+import real_estate_simulator_project_homework_archive as archive
+
+HORIZONS = (10, 50, 100, 500)
+QUICK_HORIZONS = (10, 50)
+BATCH_SIZES = (100, 1_000)
+MIN_MEASURE_TIME = 0.2  # minimalny łączny czas pomiaru jednego przypadku (s)
+REPEATS = 3  # liczba pomiarów - bierzemy najlepszy
+
+
+@dataclass
+class BenchmarkCase:
+    """Jeden przypadek benchmarku"""
+    name: str  # nazwa mierzonej funkcji
+    resolution: str  # 'yearly' albo 'monthly'
+    horizon: int  # horyzont symulacji w latach
+    batch_size: int  # liczba zestawów parametrów w jednym wywołaniu
+    scenarios: int  # liczba scenariuszy liczonych w jednym wywołaniu
+    run: Callable[[], object]  # mierzona funkcja
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.resolution},h={self.horizon},batch={self.batch_size}]"
+
+
+@dataclass
+class BenchmarkResult:
+    """Wynik pomiaru jednego przypadku"""
+    key: str
+    name: str
+    resolution: str
+    horizon: int
+    batch_size: int
+    scenarios: int
+    seconds_per_call: float
+    scenarios_per_second: float
+    peak_memory_bytes: int
+
+
+def _quiet(function: Callable[[], object]) -> Callable[[], object]:
+    """Wywołanie bez wypisywania na stdout (funkcje raportujące drukują wyniki)."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function()
+    return run
+
+
+def build_cases(horizons=HORIZONS, batch_sizes=BATCH_SIZES) -> List[BenchmarkCase]:
+    """Lista przypadków: każda funkcja × horyzont (× rozmiar paczki dla silnika wsadowego)."""
+    cases: List[BenchmarkCase] = []
+    for horizon in horizons:
+        params = sim.SimulationParams(n_years=horizon)
+        archive_params = archive.SimulationParams()
+        scenarios = horizon + 2  # wszystkie lata zakupu + tylko wynajem
+
+        cases.append(BenchmarkCase(
+            'simulate_purchase_year', 'yearly', horizon, 1, scenarios,
+            lambda p=params: [sim.simulate_purchase_year(y, p) for y in p.purchase_years]))
+        cases.append(BenchmarkCase(
+            'simulate_purchase_year_closed_form', 'yearly', horizon, 1, scenarios,
+            lambda p=params: [sim.simulate_purchase_year_closed_form(y, p) for y in p.purchase_years]))
+        cases.append(BenchmarkCase(
+            'run_all_scenarios', 'yearly', horizon, 1, scenarios,
+            _quiet(lambda p=params: sim.run_all_scenarios(p))))
+        cases.append(BenchmarkCase(
+            'archive.simulate', 'monthly', horizon, 1, 1,
+            lambda h=horizon, p=archive_params: archive.simulate(h, p)))
+        cases.append(BenchmarkCase(
+            'archive.run_scenarios', 'monthly', horizon, 1, horizon,
+            _quiet(lambda h=horizon, p=archive_params: archive.run_scenarios(1, h, p))))
+
+        try:
+            import numpy as np
+            import batch_simulator
+        except ImportError:  # silnik wsadowy wymaga numpy - bez niego pomijamy te przypadki
+            continue
+        for batch_size in batch_sizes:
+            capital = np.linspace(50_000.0, 500_000.0, batch_size)
+            cases.append(BenchmarkCase(
+                'batch_simulator.simulate_grid', 'yearly', horizon, batch_size, batch_size * scenarios,
+                lambda p=params, c=capital: batch_simulator.simulate_grid(params=p, initial_capital=c)))
+            cases.append(BenchmarkCase(
+                'batch_simulator.simulate_archive_batch', 'monthly', horizon, batch_size, batch_size,
+                lambda h=horizon, n=batch_size, c=capital: batch_simulator.simulate_archive_batch(
+                    h, size=n, initial_capital=c)))
+    return cases
+
+
+def measure(case: BenchmarkCase) -> BenchmarkResult:
+    """Mierzy czas (najlepszy z REPEATS pomiarów) i szczytową pamięć jednego wywołania."""
+    # Ile wywołań potrzeba, żeby pomiar trwał co najmniej MIN_MEASURE_TIME
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            case.run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_MEASURE_TIME:
+            break
+        calls *= 2
+    best = elapsed / calls
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            case.run()
+        best = min(best, (time.perf_counter() - start) / calls)
+
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        key=case.key,
+        name=case.name,
+        resolution=case.resolution,
+        horizon=case.horizon,
+        batch_size=case.batch_size,
+        scenarios=case.scenarios,
+        seconds_per_call=best,
+        scenarios_per_second=case.scenarios / best,
+        peak_memory_bytes=peak,
+    )
+
+
+def run_benchmarks(cases: List[BenchmarkCase], name_filter: Optional[str] = None) -> List[BenchmarkResult]:
+    """Mierzy wszystkie przypadki (opcjonalnie tylko te, których klucz zawiera name_filter)."""
+    results: List[BenchmarkResult] = []
+    for case in cases:
+        if name_filter and name_filter not in case.key:
+            continue
+        result = measure(case)
+        print_result(result)
+        results.append(result)
+    return results
+
+
+def print_result(result: BenchmarkResult):
+    print(f"{result.key:<75} {result.scenarios_per_second:>14,.1f} scen./s"
+          f" {result.seconds_per_call * 1e3:>10.3f} ms {result.peak_memory_bytes / 1024:>10,.1f} KiB")
+
+
+def write_baseline(results: List[BenchmarkResult], path: str):
+    """Zapisuje wyniki jako JSON (plik bazowy do późniejszych porównań)."""
+    document = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+
+
+def compare(results: List[BenchmarkResult], baseline_path: str, threshold: float) -> List[str]:
+    """
+    Porównuje wyniki z plikiem bazowym.
+
+    Args:
+        results: bieżące wyniki
+        baseline_path: ścieżka do JSON zapisanego przez write_baseline
+        threshold: dopuszczalne spowolnienie (0.1 = 10%)
+
+    Returns:
+        lista opisów regresji (pusta, jeśli nie ma spowolnień ponad próg)
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline: Dict[str, dict] = {r['key']: r for r in json.load(f)['results']}
+
+    regressions: List[str] = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        slowdown = base['scenarios_per_second'] / result.scenarios_per_second - 1
+        status = "REGRESJA" if slowdown > threshold else "ok"
+        print(f"{result.key:<75} {slowdown:>+8.1%}  {status}")
+        if slowdown > threshold:
+            regressions.append(f"{result.key}: wolniej o {slowdown:.1%} (próg {threshold:.0%})")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarki symulatorów zakupu vs wynajmu")
+    parser.add_argument('--output', help="zapisz wyniki do pliku JSON")
+    parser.add_argument('--compare', help="porównaj z plikiem bazowym JSON")
+    parser.add_argument('--threshold', type=float, default=0.10, help="dopuszczalne spowolnienie (domyślnie 0.10)")
+    parser.add_argument('--quick', action='store_true', help="tylko krótkie horyzonty (10, 50 lat)")
+    parser.add_argument('--filter', help="mierz tylko przypadki zawierające ten tekst")
+    args = parser.parse_args()
+
+    cases = build_cases(QUICK_HORIZONS if args.quick else HORIZONS)
+    results = run_benchmarks(cases, args.filter)
+    if args.output:
+        write_baseline(results, args.output)
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print("\nWykryto spowolnienia:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
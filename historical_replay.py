@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Odtwarzanie historycznych scenariuszy z szeregów czasowych w pliku mapowanym w pamięć.
+
+Zamiast stałych DEPOSIT_INTEREST_RATE / LENDING_RATE / REAL_ESTATE_PRICE_CHANGE
+modele liczone są na każdym kroczącym oknie długich szeregów historycznych
+(miesięczne stopy, indeksy cen i czynszów, wiele regionów):
+
+- model główny (simulate_purchase_year): każdy miesiąc startu × każdy rok
+  zakupu (0 .. n_years oraz tylko wynajem),
+- model miesięczny (archive simulate): każdy miesiąc startu × każdy horyzont
+  1 .. years (jeden przebieg daje wszystkie horyzonty).
+
+Format pliku (little-endian):
+
+    nagłówek   '<8sIIIII'  magic, liczba szeregów, regiony, miesiące,
+                            pierwszy miesiąc (rok*12 + miesiąc-1), długość nazw
+    nazwy      JSON z listą nazw regionów (UTF-8), dopełniony do 8 bajtów
+    dane       float64 [szereg][region][miesiąc] - szeregi w kolejności SERIES
+
+Plik jest mapowany w pamięć (mmap) i czytany przez widoki memoryview /
+numpy.frombuffer - bez kopiowania. Okna to widoki z krokiem (as_strided) na
+szeregach rocznych liczonych raz na region, więc do pamięci trafia tylko
+bieżący region i paczka okien, a system wczytuje tylko potrzebne strony pliku.
+
+Znaczenie szeregów (wartość na miesiąc):
+    deposit_rate - roczne oprocentowanie lokaty obowiązujące w danym miesiącu
+    lending_rate - roczne oprocentowanie kredytu obowiązujące w danym miesiącu
+    price_index  - indeks cen nieruchomości
+    rent_index   - indeks czynszów
+
+Rok symulacji zaczynający się w miesiącu m ma: stopę lokaty = średnia
+geometryczna 12 miesięcznych stóp (kapitalizacja miesięczna), oprocentowanie
+kredytu z miesiąca m (przeszacowanie raz w roku), zmianę cen i czynszu =
+indeks[m] / indeks[m-12] - 1.
+
+Wymaga biblioteki numpy (silnik wektorowy batch_simulator).
+
+Użycie:
+    python historical_replay.py convert series.csv series.bin
+    python historical_replay.py synthesize series.bin --regions 20 --years 60
+    python historical_replay.py replay series.bin --model main --years 10
+    python historical_replay.py replay series.bin --model archive --years 30 --stride 12
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+import batch_simulator
+import real_estate_simulator_project_homework as sim
+import real_estate_simulator_project_homework_archive as archive
+
+MAGIC = b'REPLAY01'
+SERIES = ('deposit_rate', 'lending_rate', 'price_index', 'rent_index')
+_HEADER = struct.Struct('<8sIIIII')
+_ITEM = 8  # bajty na wartość float64
+DEFAULT_WINDOW_CHUNK = 256  # ile okien liczyć w jednym wywołaniu silnika wektorowego
+
+
+def _padded(length: int) -> int:
+    return (length + _ITEM - 1) // _ITEM * _ITEM
+
+
+def write_series(path: str, regions: Sequence[str], start: Tuple[int, int], series: dict):
+    """
+    Zapisuje szeregi w formacie pliku odtwarzania.
+
+    Args:
+        path: plik wynikowy
+        regions: nazwy regionów
+        start: (rok, miesiąc 1-12) pierwszego miesiąca szeregów
+        series: nazwa z SERIES -> wiersze (po jednym na region) miesięcznych wartości
+                (listy, array albo tablice numpy); zapisywane wiersz po wierszu
+    """
+    rows = {name: list(series[name]) for name in SERIES}
+    months = len(rows[SERIES[0]][0]) if regions else 0
+    names = json.dumps(list(regions)).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(SERIES), len(regions), months, start[0] * 12 + start[1] - 1, len(names)))
+        f.write(names.ljust(_padded(len(names)), b'\0'))
+        for name in SERIES:
+            if len(rows[name]) != len(regions):
+                raise ValueError(f"szereg {name}: {len(rows[name])} wierszy zamiast {len(regions)}")
+            for row in rows[name]:
+                values = array('d', row)
+                if len(values) != months:
+                    raise ValueError(f"szereg {name}: wiersze muszą mieć po {months} miesięcy")
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                values.tofile(f)
+
+
+class SeriesFile:
+    """
+    Plik szeregów zmapowany w pamięć (tylko do odczytu).
+
+    Wszystkie zwracane szeregi są widokami na zmapowany plik - nie kopiują
+    danych. Zamknięcie (close / with) jest możliwe dopiero po zwolnieniu
+    widoków.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_series, n_regions, n_months, first_month, names_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or n_series != len(SERIES):
+            raise ValueError(f"{path}: to nie jest plik szeregów odtwarzania")
+        self.regions: List[str] = json.loads(self._mmap[_HEADER.size:_HEADER.size + names_length].decode('utf-8'))
+        self.months = n_months
+        self.first_month = first_month  # rok*12 + miesiąc-1
+        self._data_offset = _HEADER.size + _padded(names_length)
+        expected = self._data_offset + len(SERIES) * n_regions * n_months * _ITEM
+        if len(self._mmap) < expected:
+            raise ValueError(f"{path}: plik jest ucięty ({len(self._mmap)} z {expected} bajtów)")
+        self._data = np.frombuffer(self._mmap, dtype='<f8', count=len(SERIES) * n_regions * n_months,
+                                   offset=self._data_offset).reshape(len(SERIES), n_regions, n_months)
+
+    def __enter__(self) -> 'SeriesFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._data = None
+        self._mmap.close()
+        self._file.close()
+
+    def month_label(self, index: int) -> str:
+        """Miesiąc o numerze index (od początku szeregów) jako 'RRRR-MM'"""
+        year, month = divmod(self.first_month + index, 12)
+        return f"{year}-{month + 1:02d}"
+
+    def series(self, name: str, region: int) -> np.ndarray:
+        """Szereg miesięczny jednego regionu - widok tylko do odczytu na plik (bez kopiowania)."""
+        return self._data[SERIES.index(name), region]
+
+    def raw(self, name: str, region: int) -> memoryview:
+        """To samo co series(), ale jako memoryview float64 (bez numpy; tylko na maszynach little-endian)."""
+        if sys.byteorder != 'little':
+            raise ValueError("raw() wymaga maszyny little-endian - użyj series()")
+        start = self._data_offset + (SERIES.index(name) * len(self.regions) + region) * self.months * _ITEM
+        return memoryview(self._mmap)[start:start + self.months * _ITEM].cast('d')
+
+
+@dataclass
+class YearlyRates:
+    """Roczne stopy dla roku zaczynającego się w każdym miesiącu (indeks = miesiąc startu roku)"""
+    deposit_rate: np.ndarray  # stopa lokaty w roku [m, m+12)
+    lending_rate: np.ndarray  # oprocentowanie kredytu ustalone w miesiącu m
+    price_change: np.ndarray  # indeks cen[m] / indeks cen[m-12] - 1 (0 dla m < 12)
+    rent_change: np.ndarray  # to samo dla czynszów
+
+
+def _year_over_year(index: np.ndarray) -> np.ndarray:
+    change = np.zeros(len(index))
+    change[12:] = index[12:] / index[:-12] - 1
+    return change
+
+
+def yearly_rates(series: SeriesFile, region: int) -> YearlyRates:
+    """
+    Roczne stopy jednego regionu liczone raz dla wszystkich okien.
+
+    Stopa lokaty roku [m, m+12) to exp(średnia log(1 + stopa)) - 1 po jego
+    12 miesiącach (sumy kroczące przez cumsum) - przy stałej stopie r daje r.
+    Tablice mają długość liczby miesięcy (stopa lokaty - o 11 krótszą).
+    """
+    log_deposit = np.concatenate(([0.0], np.cumsum(np.log1p(series.series('deposit_rate', region)))))
+    return YearlyRates(
+        deposit_rate=np.expm1((log_deposit[12:] - log_deposit[:-12]) / 12),
+        lending_rate=series.series('lending_rate', region).copy(),  # kopia jednego regionu - nie blokuje zamknięcia pliku
+        price_change=_year_over_year(series.series('price_index', region)),
+        rent_change=_year_over_year(series.series('rent_index', region)),
+    )
+
+
+def window_paths(values: np.ndarray, first_start: int, windows: int, years: int, stride: int) -> np.ndarray:
+    """
+    Ścieżki roczne dla kolejnych okien - widok (windows, years) bez kopiowania.
+
+    Wiersz w to okno zaczynające się w miesiącu first_start + w*stride,
+    kolumna y to wartość dla roku zaczynającego się w miesiącu start + 12*y.
+    """
+    view = values[first_start:]
+    if windows and first_start + (windows - 1) * stride + 12 * (years - 1) >= len(values):
+        raise ValueError("okno wychodzi poza szereg")
+    return as_strided(view, shape=(windows, years), strides=(stride * view.strides[0], 12 * view.strides[0]),
+                      writeable=False)
+
+
+def window_starts(series: SeriesFile, years: int, stride: int = 1, warmup: int = 12) -> range:
+    """
+    Miesiące startu pełnych okien o długości `years` lat.
+
+    Pierwsze `warmup` miesięcy jest pomijane, żeby zmiana cen w pierwszym roku
+    okna była znana (indeks sprzed 12 miesięcy).
+    """
+    return range(warmup, series.months - 12 * years + 1, stride)
+
+
+def _chunks(starts: range, chunk: int) -> Iterator[range]:
+    for first in range(0, len(starts), chunk):
+        yield starts[first:first + chunk]
+
+
+@dataclass
+class MainReplayResult:
+    """Model główny: majątek końcowy [region, okno, rok zakupu]"""
+    regions: List[str]
+    start_labels: List[str]  # miesiąc startu każdego okna ('RRRR-MM')
+    purchase_years: np.ndarray  # 0 .. n_years+1 (ostatni = tylko wynajem)
+    net_worth: np.ndarray  # kształt (regiony, okna, lata zakupu)
+
+    def best_purchase_year(self) -> np.ndarray:
+        """Najlepszy rok zakupu w każdym oknie - kształt (regiony, okna)"""
+        return self.purchase_years[self.net_worth.argmax(axis=2)]
+
+    def best_share(self) -> np.ndarray:
+        """Jak często (ułamek okien, wszystkie regiony) dany rok zakupu był najlepszy"""
+        counts = np.bincount(self.net_worth.argmax(axis=2).ravel(), minlength=len(self.purchase_years))
+        return counts / max(1, counts.sum())
+
+
+@dataclass
+class ArchiveReplayResult:
+    """Model miesięczny: majątek po każdym roku [region, okno, horyzont-1]"""
+    regions: List[str]
+    start_labels: List[str]
+    buyer_net_worth: np.ndarray  # kształt (regiony, okna, lata)
+    renter_net_worth: np.ndarray
+
+    def buyer_wins(self) -> np.ndarray:
+        """Ułamek okien (wszystkie regiony), w których kupujący wygrywa - dla każdego horyzontu"""
+        wins = self.buyer_net_worth > self.renter_net_worth
+        return wins.reshape(-1, wins.shape[2]).mean(axis=0) if wins.size else np.zeros(wins.shape[2])
+
+
+def replay_main(series: SeriesFile, params: Optional[sim.SimulationParams] = None, stride: int = 1,
+                window_chunk: int = DEFAULT_WINDOW_CHUNK) -> MainReplayResult:
+    """
+    Model główny na wszystkich oknach × latach zakupu.
+
+    Stałe stopy z params są zastępowane ścieżkami historycznymi; pozostałe
+    parametry (kapitał, oszczędności, cena, koszty) pochodzą z params.
+
+    Args:
+        series: otwarty plik szeregów
+        params: parametry symulacji (horyzont n_years i kwoty)
+        stride: co ile miesięcy zaczyna się kolejne okno
+        window_chunk: ile okien liczyć w jednym wywołaniu simulate_batch
+
+    Returns:
+        MainReplayResult
+    """
+    if params is None:
+        params = sim.SimulationParams()
+    years = params.n_years + 1  # lata 0..n_years
+    starts = window_starts(series, years, stride)
+    purchase_years = np.arange(params.n_years + 2)
+    net_worth = np.empty((len(series.regions), len(starts), len(purchase_years)))
+    for region in range(len(series.regions)):
+        rates = yearly_rates(series, region)
+        done = 0
+        for chunk in _chunks(starts, window_chunk):
+            def paths(values):
+                return window_paths(values, chunk.start, len(chunk), years, stride)
+            # wszystkie lata zakupu okna czytają jego wiersz przez path_index - okna nie są kopiowane
+            result = batch_simulator.simulate_batch(
+                np.tile(purchase_years, len(chunk)), params=params,
+                deposit_rate_path=paths(rates.deposit_rate), lending_rate_path=paths(rates.lending_rate),
+                price_change_path=paths(rates.price_change), rent_change_path=paths(rates.rent_change),
+                path_index=np.repeat(np.arange(len(chunk)), len(purchase_years)))
+            net_worth[region, done:done + len(chunk)] = result.net_worth.reshape(len(chunk), len(purchase_years))
+            done += len(chunk)
+    return MainReplayResult(list(series.regions), [series.month_label(s) for s in starts], purchase_years, net_worth)
+
+
+def replay_archive(series: SeriesFile, years: int, params: Optional[archive.SimulationParams] = None,
+                   stride: int = 1, window_chunk: int = DEFAULT_WINDOW_CHUNK) -> ArchiveReplayResult:
+    """
+    Model miesięczny (archive) na wszystkich oknach; jeden przebieg daje horyzonty 1..years.
+
+    Args:
+        series: otwarty plik szeregów
+        years: najdłuższy horyzont w latach
+        params: parametry modelu archive (kwoty; stopy zastępowane ścieżkami)
+        stride, window_chunk: jak w replay_main
+
+    Returns:
+        ArchiveReplayResult
+    """
+    if params is None:
+        params = archive.SimulationParams()
+    starts = window_starts(series, years, stride)
+    shape = (len(series.regions), len(starts), years)
+    buyer = np.empty(shape)
+    renter = np.empty(shape)
+    for region in range(len(series.regions)):
+        rates = yearly_rates(series, region)
+        done = 0
+        for chunk in _chunks(starts, window_chunk):
+            def paths(values):
+                return window_paths(values, chunk.start, len(chunk), years, stride)
+            result = batch_simulator.simulate_archive_batch(
+                years, size=len(chunk), params=params,
+                appreciation_path=paths(rates.price_change), investment_return_path=paths(rates.deposit_rate),
+                mortgage_rate_path=paths(rates.lending_rate), rent_increase_path=paths(rates.rent_change))
+            buyer[region, done:done + len(chunk)] = result.buyer_net_worth_by_year
+            renter[region, done:done + len(chunk)] = result.renter_net_worth_by_year
+            done += len(chunk)
+    return ArchiveReplayResult(list(series.regions), [series.month_label(s) for s in starts], buyer, renter)
+
+
+def convert_csv(csv_path: str, output_path: str):
+    """
+    Zamienia CSV (kolumny: region, month 'RRRR-MM', deposit_rate, lending_rate,
+    price_index, rent_index) na plik odtwarzania. Wszystkie regiony muszą mieć
+    te same, kolejne miesiące.
+    """
+    rows = {}
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for record in csv.DictReader(f):
+            year, month = (int(part) for part in record['month'].split('-'))
+            rows.setdefault(record['region'], []).append((year * 12 + month - 1, record))
+    regions = list(rows)
+    for region in regions:
+        rows[region].sort(key=lambda item: item[0])
+    first = rows[regions[0]][0][0]
+    for region in regions:
+        months = [month for month, _ in rows[region]]
+        if months != list(range(first, first + len(rows[regions[0]]))):
+            raise ValueError(f"region {region}: miesiące muszą być kolejne i takie same jak w {regions[0]}")
+    series = {name: [[float(record[name]) for _, record in rows[region]] for region in regions] for name in SERIES}
+    write_series(output_path, regions, (first // 12, first % 12 + 1), series)
+
+
+def synthesize(path: str, regions: int, years: int, seed: int = 0, start: Tuple[int, int] = (1970, 1)):
+    """Losowe (ale realistyczne co do rzędu wielkości) szeregi - do prób i benchmarków."""
+    rng = np.random.default_rng(seed)
+    months = years * 12
+    names = [f"region-{i + 1}" for i in range(regions)]
+
+    def rate_rows(level, volatility):
+        walk = np.cumsum(rng.normal(0.0, volatility, (regions, months)), axis=1)
+        return np.clip(level + walk - walk.mean(axis=1, keepdims=True), 0.0, 0.25)
+
+    def index_rows(drift, volatility):
+        return 100.0 * np.exp(np.cumsum(rng.normal(drift / 12, volatility, (regions, months)), axis=1))
+
+    deposit = rate_rows(0.05, 0.002)
+    series = {
+        'deposit_rate': deposit,
+        'lending_rate': deposit + 0.015,
+        'price_index': index_rows(0.04, 0.01),
+        'rent_index': index_rows(0.035, 0.005),
+    }
+    write_series(path, names, start, series)
+
+
+def print_main_replay(result: MainReplayResult):
+    """Podsumowanie odtworzenia modelu głównego"""
+    best = result.best_purchase_year()
+    print("=" * 80)
+    print("ODTWORZENIE HISTORYCZNE - MODEL GŁÓWNY")
+    print("=" * 80)
+    print(f"Regiony: {len(result.regions)}, okna: {len(result.start_labels)} "
+          f"({result.start_labels[0] if result.start_labels else '-'} .. "
+          f"{result.start_labels[-1] if result.start_labels else '-'})")
+    print("\nJak często dany rok zakupu był najlepszy:")
+    last = len(result.purchase_years) - 1
+    for year, share in zip(result.purchase_years, result.best_share()):
+        label = "Tylko wynajem" if year == last else f"Zakup w roku {year}"
+        print(f"  {label:<20} {share:7.1%}   średni majątek: {result.net_worth[:, :, year].mean():>15,.2f} zł")
+    if best.size:
+        print(f"\nNajczęściej najlepszy: rok {np.bincount(best.ravel()).argmax()}")
+
+
+def print_archive_replay(result: ArchiveReplayResult):
+    """Podsumowanie odtworzenia modelu miesięcznego"""
+    print("=" * 80)
+    print("ODTWORZENIE HISTORYCZNE - MODEL MIESIĘCZNY (archive)")
+    print("=" * 80)
+    print(f"Regiony: {len(result.regions)}, okna: {len(result.start_labels)}")
+    print("\nHoryzont   kupujący wygrywa   średnia różnica kupujący - najemca")
+    for horizon, share in enumerate(result.buyer_wins(), start=1):
+        difference = (result.buyer_net_worth[:, :, horizon - 1] - result.renter_net_worth[:, :, horizon - 1]).mean()
+        print(f"  {horizon:>3} lat   {share:14.1%}   {difference:>20,.2f} zł")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Odtwarzanie scenariuszy z historycznych szeregów")
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help="CSV -> plik odtwarzania")
+    convert.add_argument('csv')
+    convert.add_argument('output')
+    synth = commands.add_parser('synthesize', help="losowy plik szeregów do prób")
+    synth.add_argument('output')
+    synth.add_argument('--regions', type=int, default=10)
+    synth.add_argument('--years', type=int, default=50)
+    synth.add_argument('--seed', type=int, default=0)
+    replay = commands.add_parser('replay', help="odtworzenie wszystkich okien")
+    replay.add_argument('series')
+    replay.add_argument('--model', choices=('main', 'archive'), default='main')
+    replay.add_argument('--years', type=int, default=None,
+                        help="model główny: n_years (domyślnie N_YEARS), archive: najdłuższy horyzont (domyślnie 30)")
+    replay.add_argument('--stride', type=int, default=1, help="co ile miesięcy zaczyna się kolejne okno")
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        convert_csv(args.csv, args.output)
+    elif args.command == 'synthesize':
+        synthesize(args.output, args.regions, args.years, args.seed)
+    else:
+        with SeriesFile(args.series) as series:
+            if args.model == 'main':
+                params = sim.SimulationParams() if args.years is None else sim.SimulationParams(n_years=args.years)
+                print_main_replay(replay_main(series, params, args.stride))
+            else:
+                print_archive_replay(replay_archive(series, args.years or 30, stride=args.stride))
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test obciążeniowy usługi simulation_service.py.
+
+Uruchamia usługę w osobnym procesie (albo łączy się z działającą przez
+--port), otwiera wiele połączeń keep-alive i wysyła mieszankę zapytań:
+część to powtarzające się "popularne" zapytania (sprawdzają scalanie), reszta
+ma losowe parametry. Raportuje przepustowość, percentyle opóźnień po stronie
+klienta i metryki usługi (scalone zapytania, rozmiary paczek, kolejka).
+
+Część odpowiedzi jest porównywana z bezpośrednim wywołaniem funkcji
+symulacji - wyniki muszą być zgodne z dokładnością do zaokrągleń
+(TOLERANCE, silnik wektorowy liczy potęgi inaczej niż pętla). Przy błędach albo różnicach
+program kończy się kodem 1.
+
+Użycie:
+    python load_test.py
+    python load_test.py --requests 20000 --connections 200 --workers 4
+    python load_test.py --port 8000          # istniejąca usługa
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import simulation_service as service
+
+DEFAULT_REQUESTS = 5_000
+DEFAULT_CONNECTIONS = 100
+TOLERANCE = 1e-9  # dopuszczalna różnica względna względem bezpośredniego wywołania
+HOT_SET_SIZE = 8  # liczba różnych "popularnych" zapytań
+SHUTDOWN_TIMEOUT = 10.0  # ile sekund czekać na zamknięcie uruchomionej usługi (potem kill)
+ENDPOINT_WEIGHTS = (('/simulate_purchase_year', 0.6), ('/run_all_scenarios', 0.25), ('/archive/simulate', 0.15))
+
+
+def random_request(rng: random.Random) -> Tuple[str, dict]:
+    """Losowe zapytanie (ścieżka, treść) z typowego zakresu parametrów."""
+    path = rng.choices([p for p, _ in ENDPOINT_WEIGHTS], [w for _, w in ENDPOINT_WEIGHTS])[0]
+    if path == '/archive/simulate':
+        params = {'price': rng.choice([600_000.0, 800_000.0, 1_000_000.0]),
+                  'mortgage_rate': round(rng.uniform(0.03, 0.09), 4),
+                  'investment_annual_return': round(rng.uniform(0.03, 0.09), 4)}
+        return path, {'years': rng.randint(1, 30), 'params': params}
+    params = {'n_years': rng.choice([10, 20, 30]),
+              'initial_capital': float(rng.randrange(50_000, 400_000, 10_000)),
+              'lending_rate': round(rng.uniform(0.03, 0.09), 4),
+              'real_estate_price_change': round(rng.uniform(0.0, 0.06), 4)}
+    body = {'params': params}
+    if path == '/simulate_purchase_year':
+        body['purchase_year'] = rng.randint(0, params['n_years'] + 1)
+    return path, body
+
+
+def matches(actual, expected) -> bool:
+    """Czy odpowiedź zgadza się z oczekiwaną (liczby z dokładnością względną TOLERANCE)."""
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and actual.keys() == expected.keys() and all(
+            matches(actual[key], value) for key, value in expected.items())
+    if isinstance(expected, list):
+        return isinstance(actual, list) and len(actual) == len(expected) and all(map(matches, actual, expected))
+    if isinstance(expected, float):
+        return abs(actual - expected) <= TOLERANCE * max(1.0, abs(expected))
+    return actual == expected
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  method: str, path: str, body: Optional[dict] = None) -> Tuple[int, dict]:
+    """Jedno zapytanie HTTP/1.1 na otwartym połączeniu keep-alive."""
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+    await writer.drain()
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+    status = int(head.split(' ', 2)[1])
+    length = 0
+    for line in head.split('\r\n')[1:]:
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def run_load(host: str, port: int, total_requests: int, connections: int,
+                   hot_fraction: float, verify: int, seed: int) -> int:
+    rng = random.Random(seed)
+    hot_set = [random_request(rng) for _ in range(HOT_SET_SIZE)]
+    plan = [rng.choice(hot_set) if rng.random() < hot_fraction else random_request(rng) for _ in range(total_requests)]
+    latencies: List[float] = []
+    failures: List[str] = []
+    checked: List[Tuple[str, dict, dict]] = []
+    next_index = 0
+
+    async def client():
+        nonlocal next_index
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while next_index < len(plan):
+                path, body = plan[next_index]
+                next_index += 1
+                started = time.perf_counter()
+                status, payload = await request(reader, writer, 'POST', path, body)
+                latencies.append((time.perf_counter() - started) * 1000.0)
+                if status != 200:
+                    failures.append(f"{path} -> {status}: {payload}")
+                elif len(checked) < verify:
+                    checked.append((path, body, payload))
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    # porównanie z bezpośrednim wywołaniem modelu
+    mismatches = 0
+    for path, body, payload in checked:
+        expected = service._evaluate_scalar(service.parse_job(service.ENDPOINTS[path], body))
+        if not matches(payload, expected):
+            mismatches += 1
+            failures.append(f"{path} {body}: wynik różni się od bezpośredniego wywołania")
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+    print("=" * 80)
+    print("TEST OBCIĄŻENIOWY USŁUGI SYMULACJI")
+    print("=" * 80)
+    print(f"Zapytania: {len(latencies):,} ({connections} połączeń, popularne: {hot_fraction:.0%})")
+    print(f"Czas: {elapsed:.2f} s, przepustowość: {len(latencies) / elapsed:,.0f} zapytań/s")
+    print(f"Opóźnienie (klient): p50 {percentile(50):.1f} ms, p90 {percentile(90):.1f} ms, "
+          f"p99 {percentile(99):.1f} ms, max {latencies[-1]:.1f} ms")
+    print(f"Scalone zapytania: {metrics['coalesced']:,}, paczki: {metrics['batches']:,} "
+          f"(średnio {metrics['mean_batch_size']:.1f}, max {metrics['max_batch_size']}), "
+          f"największa kolejka: {metrics['max_queue_depth']:,}")
+    print(f"Sprawdzone odpowiedzi: {len(checked):,}, różnice: {mismatches}, błędy: {len(failures) - mismatches}")
+    for failure in failures[:10]:
+        print(f"  ! {failure}")
+    return 1 if failures else 0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind((service.DEFAULT_HOST, 0))
+        return s.getsockname()[1]
+
+
+async def _wait_until_ready(host: str, port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await request(reader, writer, 'GET', '/health')
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Test obciążeniowy usługi simulation_service.py")
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help="liczba zapytań")
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS, help="liczba równoległych połączeń")
+    parser.add_argument('--hot-fraction', type=float, default=0.3, help="udział powtarzających się zapytań")
+    parser.add_argument('--verify', type=int, default=500, help="ile odpowiedzi porównać z bezpośrednim wywołaniem")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--port', type=int, default=None, help="port działającej usługi (domyślnie uruchamia własną)")
+    parser.add_argument('--workers', type=int, default=None, help="procesy robocze uruchamianej usługi")
+    args = parser.parse_args()
+
+    host = service.DEFAULT_HOST
+    server = None
+    port = args.port
+    if port is None:
+        port = _free_port()
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'simulation_service.py'), '--host', host, '--port', str(port)]
+        if args.workers is not None:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(_wait_until_ready(host, port))
+        code = asyncio.run(run_load(host, port, args.requests, args.connections,
+                                    args.hot_fraction, args.verify, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()  # usługa zamyka się porządnie po SIGTERM
+            try:
+                server.wait(timeout=SHUTDOWN_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+    sys.exit(code)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Symulacja Monte Carlo zakupu vs wynajmu nieruchomości.
+
+Zamiast stałych stóp (REAL_ESTATE_PRICE_CHANGE, DEPOSIT_INTEREST_RATE,
+LENDING_RATE w głównym symulatorze; PROPERTY_ANNUAL_APPRECIATION,
+INVESTMENT_ANNUAL_RETURN, MORTGAGE_RATE w pliku archive) losujemy roczne
+ścieżki stóp z generatora z ustalonym ziarnem i liczymy rozkład wyników.
+
+Ścieżki są liczone wektorowo w paczkach (batch_simulator), a paczki
+rozdzielane na procesy (ProcessPoolExecutor). Każda paczka ma własny
+generator wyprowadzony z (seed, numer paczki), więc wynik dla danego ziarna
+jest identyczny niezależnie od liczby procesów.
+
+Paczki nie zwracają ścieżek, tylko strumieniowe agregaty (streaming_stats):
+momenty i szkic kwantyli dla każdego roku zakupu / horyzontu. Agregaty są
+łączone na bieżąco, więc pamięć nie rośnie z liczbą ścieżek, a percentyle
+mają błąd względny najwyżej relative_accuracy (domyślnie 1%).
+
+Wymaga biblioteki numpy.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+import batch_simulator
+import real_estate_simulator_project_homework as sim
+import real_estate_simulator_project_homework_archive as archive
+from streaming_stats import DEFAULT_RELATIVE_ACCURACY, ResultAggregator
+
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+DEFAULT_CHUNK_SIZE = 10_000  # liczba ścieżek w jednej paczce
+
+
+@dataclass(frozen=True)
+class RateModel:
+    """
+    Model losowej rocznej stopy: AR(1) wokół średniej.
+
+    rate_t = mean + persistence * (rate_{t-1} - mean) + szok_t,
+    szoki normalne dobrane tak, żeby odchylenie standardowe stopy wynosiło volatility.
+    """
+    mean: float  # średnia stopa roczna
+    volatility: float  # odchylenie standardowe stopy rocznej
+    persistence: float = 0.0  # 0 = niezależne lata, bliżej 1 = długie cykle
+
+    def sample(self, rng: np.random.Generator, paths: int, periods: int) -> np.ndarray:
+        """
+        Losuje ścieżki stóp.
+
+        Args:
+            rng: generator liczb losowych
+            paths: liczba ścieżek
+            periods: liczba lat na ścieżce
+
+        Returns:
+            tablica (paths, periods) rocznych stóp
+        """
+        shocks = rng.standard_normal((paths, periods)) * self.volatility
+        if self.persistence == 0:
+            return self.mean + shocks
+        shocks[:, 1:] *= np.sqrt(1 - self.persistence ** 2)
+        deviation = np.empty_like(shocks)
+        deviation[:, 0] = shocks[:, 0]
+        for t in range(1, periods):
+            deviation[:, t] = self.persistence * deviation[:, t - 1] + shocks[:, t]
+        return self.mean + deviation
+
+
+@dataclass
+class MonteCarloSummary:
+    """Rozkład majątku końcowego dla danego roku zakupu (główny symulator)"""
+    purchase_year: int  # 0 = od razu, n_years+1 = nigdy
+    mean: float  # średni majątek końcowy
+    std: float  # odchylenie standardowe majątku końcowego
+    percentiles: Dict[float, float]  # percentyl -> majątek końcowy
+    probability_beats_rent: float  # odsetek ścieżek, w których wynik > tylko wynajem
+    vs_rent_mean: float  # średnia różnica: majątek - majątek przy tylko wynajmie
+    vs_rent_percentiles: Dict[float, float]  # percentyl -> różnica względem tylko wynajmu
+
+
+@dataclass
+class ArchiveMonteCarloSummary:
+    """Rozkład majątku kupującego i najemcy po danej liczbie lat (model archive)"""
+    years: int
+    buyer_mean: float
+    renter_mean: float
+    buyer_percentiles: Dict[float, float]
+    renter_percentiles: Dict[float, float]
+    probability_buyer_wins: float  # odsetek ścieżek, w których kupujący ma większy majątek
+    difference_mean: float  # średnia różnica: majątek kupującego - majątek najemcy
+    difference_percentiles: Dict[float, float]  # percentyl -> różnica kupujący - najemca
+
+
+def chunk_rng(seed: int, chunk_index: int) -> np.random.Generator:
+    """Generator dla danej paczki - zależy tylko od ziarna i numeru paczki."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+
+
+def _chunk_sizes(n_paths: int, chunk_size: int) -> List[int]:
+    full, rest = divmod(n_paths, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def _merge_chunks(function, tasks: Sequence[tuple], workers: Optional[int],
+                  relative_accuracy: float) -> ResultAggregator:
+    """Liczy paczki lokalnie albo w puli procesów i łączy ich agregaty na bieżąco, w kolejności paczek."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    total = ResultAggregator(relative_accuracy)
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            total.merge(function(task))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(function, tasks):
+            total.merge(partial)
+    return total
+
+
+def _simulate_main_chunk(task: tuple) -> ResultAggregator:
+    """Agregaty majątku końcowego dla każdego roku zakupu z jednej paczki ścieżek."""
+    params, rate_models, seed, chunk_index, paths, relative_accuracy = task
+    deposit_rate, lending_rate, price_change = rate_models
+    rng = chunk_rng(seed, chunk_index)
+    periods = params.n_years + 1
+    scenarios = params.n_years + 2  # lata zakupu 0..n_years + tylko wynajem
+
+    # Każda ścieżka stóp jest wspólna dla wszystkich lat zakupu - scenariusze
+    # wskazują swój wiersz przez path_index zamiast kopii ścieżki na scenariusz
+    result = batch_simulator.simulate_batch(
+        np.tile(np.arange(scenarios), paths),
+        params=params,
+        deposit_rate_path=deposit_rate.sample(rng, paths, periods),
+        lending_rate_path=lending_rate.sample(rng, paths, periods),
+        price_change_path=price_change.sample(rng, paths, periods),
+        path_index=np.arange(paths * scenarios) // scenarios,
+    )
+    net_worth = result.net_worth.reshape(paths, scenarios)
+    rent_only = net_worth[:, -1]
+
+    aggregate = ResultAggregator(relative_accuracy)
+    for purchase_year in range(scenarios):
+        aggregate.update(purchase_year, 'net_worth', net_worth[:, purchase_year])
+        aggregate.update(purchase_year, 'vs_rent', net_worth[:, purchase_year] - rent_only)
+    return aggregate
+
+
+def _simulate_archive_chunk(task: tuple) -> ResultAggregator:
+    """Agregaty majątku kupującego i najemcy po każdym roku z jednej paczki ścieżek."""
+    params, years, rate_models, seed, chunk_index, paths, relative_accuracy = task
+    appreciation, investment_return, mortgage_rate = rate_models
+    rng = chunk_rng(seed, chunk_index)
+    result = batch_simulator.simulate_archive_batch(
+        years,
+        size=paths,
+        appreciation_path=appreciation.sample(rng, paths, years),
+        investment_return_path=investment_return.sample(rng, paths, years),
+        mortgage_rate_path=mortgage_rate.sample(rng, paths, years),
+        params=params,
+    )
+    buyer, renter = result.buyer_net_worth_by_year, result.renter_net_worth_by_year
+
+    aggregate = ResultAggregator(relative_accuracy)
+    for year in range(years):
+        aggregate.update(year + 1, 'buyer_net_worth', buyer[:, year])
+        aggregate.update(year + 1, 'renter_net_worth', renter[:, year])
+        aggregate.update(year + 1, 'difference', buyer[:, year] - renter[:, year])
+    return aggregate
+
+
+def run_monte_carlo(n_paths: int,
+                    params: Optional[sim.SimulationParams] = None,
+                    seed: int = 0,
+                    workers: Optional[int] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    deposit_rate: Optional[RateModel] = None,
+                    lending_rate: Optional[RateModel] = None,
+                    price_change: Optional[RateModel] = None,
+                    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> List[MonteCarloSummary]:
+    """
+    Monte Carlo dla głównego symulatora - rozkład majątku dla każdego roku zakupu.
+
+    Args:
+        n_paths: liczba losowych ścieżek stóp
+        params: parametry symulacji (domyślnie SimulationParams())
+        seed: ziarno generatora (ten sam seed = ten sam wynik)
+        workers: liczba procesów (None = liczba rdzeni, 1 = bez puli procesów)
+        chunk_size: liczba ścieżek w paczce (wpływa na wynik - wyznacza podział strumieni losowych)
+        deposit_rate: model oprocentowania lokaty (domyślnie średnia params.deposit_interest_rate)
+        lending_rate: model oprocentowania kredytu (domyślnie średnia params.lending_rate)
+        price_change: model zmian cen i czynszu (domyślnie średnia params.real_estate_price_change)
+        percentiles: raportowane percentyle
+        relative_accuracy: dopuszczalny błąd względny percentyli (szkic kwantyli)
+
+    Returns:
+        lista MonteCarloSummary dla lat zakupu 0 .. n_years+1
+    """
+    if params is None:
+        params = sim.SimulationParams()
+    rate_models = (
+        deposit_rate or RateModel(params.deposit_interest_rate, 0.01),
+        lending_rate or RateModel(params.lending_rate, 0.01),
+        price_change or RateModel(params.real_estate_price_change, 0.03),
+    )
+    tasks = [(params, rate_models, seed, index, paths, relative_accuracy)
+             for index, paths in enumerate(_chunk_sizes(n_paths, chunk_size))]
+    aggregate = _merge_chunks(_simulate_main_chunk, tasks, workers, relative_accuracy)
+
+    summaries: List[MonteCarloSummary] = []
+    for purchase_year in aggregate.keys():
+        net_worth = aggregate.metric(purchase_year, 'net_worth')
+        vs_rent = aggregate.metric(purchase_year, 'vs_rent')
+        summaries.append(MonteCarloSummary(
+            purchase_year=purchase_year,
+            mean=net_worth.moments.mean,
+            std=net_worth.moments.std,
+            percentiles=net_worth.sketch.percentiles(percentiles),
+            probability_beats_rent=vs_rent.fraction_positive,
+            vs_rent_mean=vs_rent.moments.mean,
+            vs_rent_percentiles=vs_rent.sketch.percentiles(percentiles),
+        ))
+    return summaries
+
+
+def run_archive_monte_carlo(n_paths: int,
+                            years: int,
+                            params: Optional[archive.SimulationParams] = None,
+                            seed: int = 0,
+                            workers: Optional[int] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            appreciation: Optional[RateModel] = None,
+                            investment_return: Optional[RateModel] = None,
+                            mortgage_rate: Optional[RateModel] = None,
+                            percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                            relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> List[ArchiveMonteCarloSummary]:
+    """
+    Monte Carlo dla modelu miesięcznego z pliku archive - rozkład po każdym roku horyzontu.
+
+    Args:
+        n_paths: liczba losowych ścieżek stóp
+        years: najdłuższy horyzont w latach
+        params: parametry modelu archive (domyślnie archive.SimulationParams())
+        seed, workers, chunk_size, percentiles, relative_accuracy: jak w run_monte_carlo
+        appreciation: model wzrostu wartości nieruchomości (domyślnie średnia params.property_annual_appreciation)
+        investment_return: model zwrotu z inwestycji (domyślnie średnia params.investment_annual_return)
+        mortgage_rate: model oprocentowania kredytu (domyślnie średnia params.mortgage_rate)
+
+    Returns:
+        lista ArchiveMonteCarloSummary dla horyzontów 1 .. years
+    """
+    if params is None:
+        params = archive.SimulationParams()
+    rate_models = (
+        appreciation or RateModel(params.property_annual_appreciation, 0.03),
+        investment_return or RateModel(params.investment_annual_return, 0.01),
+        mortgage_rate or RateModel(params.mortgage_rate, 0.01),
+    )
+    tasks = [(params, years, rate_models, seed, index, paths, relative_accuracy)
+             for index, paths in enumerate(_chunk_sizes(n_paths, chunk_size))]
+    aggregate = _merge_chunks(_simulate_archive_chunk, tasks, workers, relative_accuracy)
+
+    summaries: List[ArchiveMonteCarloSummary] = []
+    for year in aggregate.keys():
+        buyer = aggregate.metric(year, 'buyer_net_worth')
+        renter = aggregate.metric(year, 'renter_net_worth')
+        difference = aggregate.metric(year, 'difference')
+        summaries.append(ArchiveMonteCarloSummary(
+            years=year,
+            buyer_mean=buyer.moments.mean,
+            renter_mean=renter.moments.mean,
+            buyer_percentiles=buyer.sketch.percentiles(percentiles),
+            renter_percentiles=renter.sketch.percentiles(percentiles),
+            probability_buyer_wins=difference.fraction_positive,
+            difference_mean=difference.moments.mean,
+            difference_percentiles=difference.sketch.percentiles(percentiles),
+        ))
+    return summaries
+
+
+def print_monte_carlo_summary(summaries: List[MonteCarloSummary], params: sim.SimulationParams):
+    """Wyświetla rozkład wyników Monte Carlo dla każdego roku zakupu"""
+    print("=" * 80)
+    print("SYMULACJA MONTE CARLO - ROZKŁAD MAJĄTKU KOŃCOWEGO")
+    print("=" * 80)
+    for s in summaries:
+        print(f"\n{sim.get_scenario_name(s.purchase_year, params)}:")
+        print(f"  Średni majątek końcowy: {s.mean:,.2f} zł (odch. std. {s.std:,.2f} zł)")
+        for p, value in s.percentiles.items():
+            print(f"    - percentyl {p:g}: {value:,.2f} zł")
+        if s.purchase_year <= params.n_years:
+            print(f"  Szansa, że zakup wygra z wynajmem: {s.probability_beats_rent:.1%}")
+            print(f"  Średnia przewaga nad wynajmem: {s.vs_rent_mean:,.2f} zł")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Symulacja Monte Carlo zakupu vs wynajmu")
+    parser.add_argument('--paths', type=int, default=100_000, help="liczba ścieżek")
+    parser.add_argument('--seed', type=int, default=0, help="ziarno generatora")
+    parser.add_argument('--workers', type=int, default=None, help="liczba procesów")
+    args = parser.parse_args()
+    params = sim.SimulationParams()
+    print_monte_carlo_summary(run_monte_carlo(args.paths, params, seed=args.seed, workers=args.workers), params)
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Miesięczny silnik modelu głównego: odroczony zakup i kredyt o zmiennej stopie.
+
+Model główny liczy raty rocznie (annual_payment), a model archiwalny
+liczy miesięcznie, ale bez wyboru momentu zakupu. Ten moduł to jeden silnik
+dla obu potrzeb: model simulate_purchase_year w okresach miesięcznych
+(konwencje jak w purchase_timing: oszczędności, czynsz, utrzymanie i raty
+co okres, lokata i ceny ze stopą równoważną rocznej), z zakupem w dowolnym
+okresie i oprocentowaniem kredytu według harmonogramu zmian stopy
+(RateResetSchedule):
+
+- kredyt o stałej stopie - bez harmonogramu (params.lending_rate przez cały okres),
+- kredyt o zmiennej stopie - stopa referencyjna + marża, ustalana co reset_every okresów,
+- kredyt o okresowo stałej stopie - fixed_rate przez fixed_periods okresów od zakupu,
+  potem jak zmienna.
+
+Przy każdej zmianie stopy rata jest przeliczana (annuity) od pozostałego
+salda na pozostałą liczbę rat. Dla periods_per_year = 1 i bez harmonogramu
+wyniki są takie same jak simulate_purchase_year.
+
+Dwie implementacje:
+- simulate_monthly - pętla okres po okresie dla jednego scenariusza (punkt odniesienia),
+- simulate_monthly_batch - paczka scenariuszy (numpy), wzory zamknięte na
+  odcinkach między zmianami stopy: faza wynajmu i przepływy posiadania
+  w O(1), kredyt w jednym kroku wektorowym na odcinek stałej stopy. Koszt
+  zależy od liczby zmian stopy, a nie od liczby miesięcy.
+
+simulate_all_purchase_periods (i uruchomienie z wiersza poleceń) bez numpy
+wraca do pętli simulate_monthly dla każdego okresu zakupu.
+
+Użycie:
+    python monthly_engine.py --years 40
+    python monthly_engine.py --years 30 --reference 0.05 --margin 0.02 --fixed-years 5
+    python monthly_engine.py --years 30 --reference-path 0.05 0.07 0.09 0.06 --margin 0.02 --reset-months 6
+"""
+
+import argparse
+from dataclasses import dataclass, fields
+from typing import Optional, Sequence, Tuple
+
+from purchase_timing import DEFAULT_PERIODS_PER_YEAR, period_payment, period_rate, total_periods
+from real_estate_simulator_project_homework import SimulationParams, cross_growth_sum_batch, growth_sum_batch
+
+DEFAULT_RESET_EVERY = 12  # okresów między zmianami stopy (12 = co rok przy okresach miesięcznych)
+
+
+@dataclass(frozen=True)
+class RateResetSchedule:
+    """
+    Harmonogram oprocentowania kredytu.
+
+    Stopa w okresie zakupu: fixed_rate (jeśli podana), inaczej stopa referencyjna
+    w okresie zakupu + marża. Potem stopa jest ustalana na nowo (referencyjna
+    w danym okresie + marża) po fixed_periods okresach od zakupu i dalej co
+    reset_every okresów.
+    """
+    reference_rates: Tuple[float, ...]  # roczna stopa referencyjna w kolejnych okresach symulacji (po końcu - ostatnia)
+    margin: float = 0.0  # marża banku
+    fixed_periods: int = 0  # okres stałej stopy od zakupu (0 = zmienna od początku)
+    fixed_rate: Optional[float] = None  # stopa w okresie stałym (None = referencyjna + marża w okresie zakupu)
+    reset_every: int = DEFAULT_RESET_EVERY  # co ile okresów stopa jest ustalana na nowo
+
+    def reference(self, period: int) -> float:
+        """Stopa referencyjna w okresie symulacji (po końcu ścieżki - ostatnia wartość)"""
+        return self.reference_rates[min(period, len(self.reference_rates) - 1)]
+
+    def initial_rate(self, purchase_period: int) -> float:
+        """Roczne oprocentowanie kredytu zaciągniętego w danym okresie"""
+        if self.fixed_rate is not None:
+            return self.fixed_rate
+        return self.reference(purchase_period) + self.margin
+
+    def is_reset(self, age: int) -> bool:
+        """Czy w okresie o tym numerze od zakupu (0 = okres zakupu) stopa jest ustalana na nowo"""
+        return age >= max(self.fixed_periods, 1) and (age - self.fixed_periods) % self.reset_every == 0
+
+    def segment_starts(self, term_periods: int) -> list:
+        """Początki odcinków stałej stopy (w okresach od zakupu) w ramach okresu kredytu"""
+        first = self.fixed_periods if self.fixed_periods > 0 else self.reset_every
+        return [0] + list(range(first, term_periods, self.reset_every))
+
+
+def yearly_path(rates: Sequence[float], periods_per_year: int = DEFAULT_PERIODS_PER_YEAR) -> Tuple[float, ...]:
+    """Ścieżka stóp na okresy z rocznych wartości (każda obowiązuje przez cały rok)."""
+    return tuple(rate for rate in rates for _ in range(periods_per_year))
+
+
+@dataclass
+class MonthlyResult:
+    """Wynik symulacji dla danego okresu zakupu"""
+    __slots__ = ('purchase_period', 'net_worth', 'property_value', 'investment', 'remaining_mortgage',
+                 'total_paid_rent', 'total_paid_mortgage', 'total_paid_interest', 'total_paid_owning_costs',
+                 'loan_amount', 'initial_payment', 'final_rate')
+    purchase_period: int  # 0 = od razu, total_periods = nigdy
+    net_worth: float  # końcowy majątek
+    property_value: float  # wartość nieruchomości (0 jeśli nie kupiono)
+    investment: float  # kapitał na lokacie
+    remaining_mortgage: float  # pozostały kredyt
+    total_paid_rent: float  # łączna suma zapłaconego czynszu
+    total_paid_mortgage: float  # łączna suma zapłaconych rat
+    total_paid_interest: float  # łączna suma zapłaconych odsetek
+    total_paid_owning_costs: float  # łączna suma kosztów posiadania
+    loan_amount: float  # początkowa kwota kredytu
+    initial_payment: float  # pierwsza rata (na okres)
+    final_rate: float  # roczne oprocentowanie kredytu na końcu (0 jeśli nie kupiono)
+
+
+def simulate_monthly(params: Optional[SimulationParams] = None, purchase_period: int = 0,
+                     periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
+                     rate_schedule: Optional[RateResetSchedule] = None,
+                     down_payment: Optional[float] = None,
+                     mortgage_term_years: Optional[int] = None) -> MonthlyResult:
+    """
+    Symulacja okres po okresie dla jednego okresu zakupu - punkt odniesienia dla simulate_monthly_batch.
+
+    Args:
+        params: parametry symulacji (domyślnie SimulationParams())
+        purchase_period: okres zakupu (0 = od razu, total_periods = nigdy)
+        periods_per_year: liczba okresów w roku (12 = miesiące, 1 = jak simulate_purchase_year)
+        rate_schedule: harmonogram oprocentowania kredytu (None = stałe params.lending_rate)
+        down_payment: wkład własny (None = cały kapitał, nie więcej niż cena)
+        mortgage_term_years: okres kredytu (None = params.mortgage_term_years)
+
+    Returns:
+        MonthlyResult
+    """
+    if params is None:
+        params = SimulationParams()
+    term = params.mortgage_term_years if mortgage_term_years is None else mortgage_term_years
+    term_periods = term * periods_per_year
+    d = period_rate(params.deposit_interest_rate, periods_per_year)
+    g = period_rate(params.real_estate_price_change, periods_per_year)
+
+    investment = params.initial_capital
+    property_value = 0.0
+    remaining_mortgage = 0.0
+    current_rent = params.renting_cost / periods_per_year
+    total_paid_rent = total_paid_mortgage = total_paid_interest = total_paid_owning_costs = 0.0
+    loan_amount = payment = initial_payment = annual_rate = 0.0
+    payments_made = 0
+    for period in range(total_periods(params, periods_per_year)):
+        purchased_this_period = False
+        if period == purchase_period and property_value == 0:
+            price = params.property_price * (1 + g) ** period
+            available = min(investment, price)
+            paid = available if down_payment is None else min(down_payment, available)
+            loan_amount = remaining_mortgage = max(0.0, price - paid)
+            annual_rate = params.lending_rate if rate_schedule is None else rate_schedule.initial_rate(period)
+            payment = initial_payment = period_payment(loan_amount, annual_rate / periods_per_year, term_periods)
+            property_value = price
+            investment -= paid
+            purchased_this_period = True
+        if period > 0:
+            if property_value > 0 and not purchased_this_period:
+                property_value *= 1 + g
+            current_rent *= 1 + g
+        if property_value > 0:
+            expenses = property_value * params.owning_cost / periods_per_year
+            total_paid_owning_costs += expenses
+            if remaining_mortgage > 0 and payments_made < term_periods:
+                if rate_schedule is not None and rate_schedule.is_reset(payments_made):
+                    # nowa stopa - rata przeliczana od salda na pozostałe raty
+                    annual_rate = rate_schedule.reference(period) + rate_schedule.margin
+                    payment = period_payment(remaining_mortgage, annual_rate / periods_per_year,
+                                       term_periods - payments_made)
+                interest = remaining_mortgage * (annual_rate / periods_per_year)
+                actual_payment = min(payment, remaining_mortgage + interest)
+                remaining_mortgage = max(0.0, remaining_mortgage - (actual_payment - interest))
+                total_paid_mortgage += actual_payment
+                total_paid_interest += interest
+                expenses += actual_payment
+                payments_made += 1
+        else:
+            expenses = current_rent
+            total_paid_rent += current_rent
+        investment *= 1 + d
+        investment += params.savings / periods_per_year - expenses
+
+    return MonthlyResult(purchase_period, property_value + investment - remaining_mortgage, property_value,
+                         investment, remaining_mortgage, total_paid_rent, total_paid_mortgage, total_paid_interest,
+                         total_paid_owning_costs, loan_amount, initial_payment,
+                         annual_rate if loan_amount > 0 else 0.0)
+
+
+# --- Wersja wektorowa (numpy) -----------------------------------------------------
+
+@dataclass
+class MonthlyBatchResult:
+    """Kolumnowy wynik simulate_monthly_batch (jedna tablica na pole MonthlyResult)"""
+    purchase_period: 'np.ndarray'
+    net_worth: 'np.ndarray'
+    property_value: 'np.ndarray'
+    investment: 'np.ndarray'
+    remaining_mortgage: 'np.ndarray'
+    total_paid_rent: 'np.ndarray'
+    total_paid_mortgage: 'np.ndarray'
+    total_paid_interest: 'np.ndarray'
+    total_paid_owning_costs: 'np.ndarray'
+    loan_amount: 'np.ndarray'
+    initial_payment: 'np.ndarray'
+    final_rate: 'np.ndarray'
+
+    def __len__(self) -> int:
+        return len(self.net_worth)
+
+    def row(self, index: int) -> MonthlyResult:
+        """Pojedynczy scenariusz jako MonthlyResult"""
+        return MonthlyResult(**{f.name: _item(getattr(self, f.name)[index]) for f in fields(self)})
+
+
+def _item(value):
+    """Liczba z elementu kolumny (skalar numpy albo zwykła liczba z listy)"""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _payment_batch(np, principal, rate, periods):
+    """Wektorowa wersja period_payment (stopa na okres)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + rate) ** periods
+        payment = principal * (rate * growth) / (growth - 1)
+        zero_rate_payment = principal / periods
+    payment = np.where(rate == 0, zero_rate_payment, payment)
+    return np.where(principal <= 0, 0.0, payment)
+
+
+def simulate_monthly_batch(purchase_period,
+                           n_years: Optional[int] = None,
+                           periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
+                           params: Optional[SimulationParams] = None,
+                           rate_schedule: Optional[RateResetSchedule] = None,
+                           reference_rates=None,
+                           margin=None,
+                           fixed_rate=None,
+                           down_payment=None,
+                           **parameters) -> MonthlyBatchResult:
+    """
+    Paczka scenariuszy naraz - wzory zamknięte na odcinkach stałej stopy.
+
+    Faza wynajmu i przepływy fazy posiadania (oszczędności, utrzymanie) są
+    liczone wzorami zamkniętymi jak w plan_net_worth. Kredyt: na każdym
+    odcinku stałej stopy saldo po L ratach to B(1+r)^L - R * suma (1+r)^j,
+    a raty przeniesione na lokatę to R * suma (1+d)^j - jeden krok wektorowy
+    na odcinek dla wszystkich scenariuszy. Ostatnia rata kredytu jest
+    ograniczona do salda z odsetkami, tak jak w pętli.
+
+    Args:
+        purchase_period: okres zakupu (liczba albo tablica; total_periods = nigdy)
+        n_years: długość rozpatrywanego okresu (wspólna dla paczki)
+        periods_per_year: liczba okresów w roku
+        params: parametry bazowe dla argumentów, które nie zostały podane
+        rate_schedule: harmonogram stopy (None = stałe lending_rate); fixed_periods
+            i reset_every są wspólne dla paczki
+        reference_rates: ścieżki stóp referencyjnych dla każdego scenariusza - tablica
+            (liczba scenariuszy, liczba okresów); domyślnie rate_schedule.reference_rates
+        margin, fixed_rate: marża i stopa okresu stałego dla każdego scenariusza
+            (domyślnie z rate_schedule; fixed_rate NaN = referencyjna + marża)
+        down_payment: wkład własny (NaN albo None = cały kapitał, nie więcej niż cena)
+        **parameters: pola SimulationParams (liczby albo tablice, rozgłaszane do wspólnego kształtu)
+
+    Returns:
+        MonthlyBatchResult; wyniki równe simulate_monthly z dokładnością do zaokrągleń
+    """
+    import numpy as np
+
+    if params is None:
+        params = SimulationParams()
+    if n_years is None:
+        n_years = parameters.pop('n_years', params.n_years)
+    names = [f.name for f in fields(SimulationParams) if f.name != 'n_years']
+    unknown = set(parameters) - set(names)
+    if unknown:
+        raise TypeError(f"nieznane parametry: {', '.join(sorted(unknown))}")
+    columns = [np.asarray(purchase_period, dtype=np.int64)]
+    columns += [np.asarray(parameters.get(name, getattr(params, name)), dtype=np.float64) for name in names]
+    columns.append(np.asarray(np.nan if down_payment is None else down_payment, dtype=np.float64))
+    if rate_schedule is not None:
+        columns.append(np.asarray(rate_schedule.margin if margin is None else margin, dtype=np.float64))
+        schedule_fixed_rate = np.nan if rate_schedule.fixed_rate is None else rate_schedule.fixed_rate
+        columns.append(np.asarray(schedule_fixed_rate if fixed_rate is None else fixed_rate, dtype=np.float64))
+    flat = [np.ravel(column) for column in np.broadcast_arrays(*columns)]
+    purchase_period = flat[0]
+    p = dict(zip(names, flat[1:]))
+    down_payment = flat[1 + len(names)]
+    size = purchase_period.shape[0]
+    ppy = periods_per_year
+
+    def equivalent(annual_rate):
+        return annual_rate if ppy == 1 else np.expm1(np.log1p(annual_rate) / ppy)
+
+    d = equivalent(p['deposit_interest_rate'])
+    g = equivalent(p['real_estate_price_change'])
+    periods = (n_years + 1) * ppy
+    buys = purchase_period < periods
+    rent_periods = np.minimum(purchase_period, periods).astype(np.float64)
+    owning_periods = periods - rent_periods
+
+    # Faza wynajmu
+    investment = (p['initial_capital'] * (1 + d) ** rent_periods
+                  + p['savings'] / ppy * growth_sum_batch(np, d, rent_periods)
+                  - p['renting_cost'] / ppy * cross_growth_sum_batch(np, g, d, rent_periods))
+    total_paid_rent = p['renting_cost'] / ppy * growth_sum_batch(np, g, rent_periods)
+
+    # Zakup
+    price = p['property_price'] * (1 + g) ** rent_periods
+    available = np.minimum(investment, price)
+    paid = np.where(np.isnan(down_payment), available, np.minimum(down_payment, available))
+    paid = np.where(buys, paid, 0.0)
+    loan_amount = np.where(buys, np.maximum(0.0, price - paid), 0.0)
+    investment = investment - paid
+
+    # Faza posiadania bez kredytu: oszczędności i koszty utrzymania
+    owning_flow = price * p['owning_cost'] / ppy
+    investment = (investment * (1 + d) ** owning_periods
+                  + p['savings'] / ppy * growth_sum_batch(np, d, owning_periods)
+                  - np.where(buys, owning_flow * cross_growth_sum_batch(np, g, d, owning_periods), 0.0))
+    total_paid_owning_costs = np.where(buys, owning_flow * growth_sum_batch(np, g, owning_periods), 0.0)
+    property_value = np.where(buys, price * (1 + g) ** (owning_periods - 1), 0.0)
+
+    # Kredyt - odcinki stałej stopy
+    term_periods = np.rint(p['mortgage_term_years']).astype(np.int64) * ppy
+    payments_count = np.where(loan_amount > 0, np.minimum(term_periods, owning_periods), 0)  # raty w horyzoncie
+    if rate_schedule is None:
+        annual_rate = p['lending_rate']
+        starts = [0]
+    else:
+        margin, fixed_rate = flat[-2], flat[-1]
+        path = np.asarray(rate_schedule.reference_rates if reference_rates is None else reference_rates,
+                          dtype=np.float64)
+
+        def reference(period):
+            index = np.minimum(period, path.shape[-1] - 1).astype(np.int64)
+            if path.ndim == 1:
+                return path[index]
+            return np.broadcast_to(path, (size, path.shape[-1]))[np.arange(size), index]
+
+        annual_rate = np.where(np.isnan(fixed_rate), reference(rent_periods) + margin, fixed_rate)
+        starts = rate_schedule.segment_starts(int(term_periods.max(initial=0)))
+    payment = _payment_batch(np, loan_amount, annual_rate / ppy, term_periods)
+    initial_payment = payment
+    balance = loan_amount
+    payments_future_value = np.zeros(size)
+    total_paid_mortgage = np.zeros(size)
+    ends = starts[1:] + [int(term_periods.max(initial=0))]
+    for start, end in zip(starts, ends):
+        if start > 0:
+            # zmiana stopy - rata przeliczana od salda na pozostałe raty
+            active = start < payments_count
+            new_rate = reference(rent_periods + start) + margin
+            payment = np.where(active, _payment_batch(np, balance, new_rate / ppy, term_periods - start), payment)
+            annual_rate = np.where(active, new_rate, annual_rate)
+        count = np.clip(np.minimum(end, payments_count) - start, 0, None)
+        # odcinek z ostatnią ratą kredytu - ta rata osobno (ograniczona do salda z odsetkami)
+        has_last = (count > 0) & (payments_count == term_periods) & (end >= term_periods)
+        full = count - has_last
+        r = annual_rate / ppy
+        grown = balance * (1 + r) ** full - payment * growth_sum_batch(np, r, full)
+        interest = grown * r
+        last_payment = np.where(has_last, np.minimum(payment, grown + interest), 0.0)
+        after_last = np.where(has_last, grown - (last_payment - interest), grown)
+        balance = np.where(count > 0, np.maximum(0.0, after_last), balance)
+        payments_future_value = payments_future_value + (
+            payment * growth_sum_batch(np, d, full) * (1 + d) ** (owning_periods - start - full)
+            + last_payment * (1 + d) ** (owning_periods - term_periods))
+        total_paid_mortgage = total_paid_mortgage + payment * full + last_payment
+
+    investment = investment - payments_future_value
+    return MonthlyBatchResult(
+        purchase_period=purchase_period,
+        net_worth=property_value + investment - balance,
+        property_value=property_value,
+        investment=investment,
+        remaining_mortgage=balance,
+        total_paid_rent=total_paid_rent,
+        total_paid_mortgage=total_paid_mortgage,
+        total_paid_interest=total_paid_mortgage - (loan_amount - balance),
+        total_paid_owning_costs=total_paid_owning_costs,
+        loan_amount=loan_amount,
+        initial_payment=initial_payment,
+        final_rate=np.where(loan_amount > 0, annual_rate, 0.0),
+    )
+
+
+def simulate_all_purchase_periods(params: Optional[SimulationParams] = None,
+                                  periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
+                                  rate_schedule: Optional[RateResetSchedule] = None) -> MonthlyBatchResult:
+    """
+    Wszystkie okresy zakupu 0..total_periods (ostatni = tylko wynajem) jedną paczką.
+
+    Bez numpy liczy każdy okres pętlą simulate_monthly - kolumny wyniku są wtedy listami.
+    """
+    if params is None:
+        params = SimulationParams()
+    periods = total_periods(params, periods_per_year)
+    try:
+        import numpy as np
+    except ImportError:
+        results = [simulate_monthly(params, purchase_period, periods_per_year, rate_schedule)
+                   for purchase_period in range(periods + 1)]
+        return MonthlyBatchResult(**{f.name: [getattr(result, f.name) for result in results]
+                                     for f in fields(MonthlyBatchResult)})
+    return simulate_monthly_batch(np.arange(periods + 1), periods_per_year=periods_per_year, params=params,
+                                  rate_schedule=rate_schedule)
+
+
+def describe_period(purchase_period: int, params: SimulationParams, periods_per_year: int) -> str:
+    """Opis okresu zakupu po polsku"""
+    if purchase_period >= total_periods(params, periods_per_year):
+        return "TYLKO WYNAJEM (nigdy nie kupujemy)"
+    year, period = divmod(purchase_period, periods_per_year)
+    if periods_per_year == 1:
+        return f"Zakup w roku {year}"
+    return f"Zakup w roku {year}, okres {period + 1}/{periods_per_year}"
+
+
+def print_comparison(params: SimulationParams, periods_per_year: int, fixed: MonthlyBatchResult,
+                     variable: MonthlyBatchResult, schedule: RateResetSchedule):
+    """Wyświetla najlepszy moment zakupu przy stałej i zmiennej stopie oraz majątek dla zakupu na początku roku"""
+    print("=" * 80)
+    print("KREDYT O STAŁEJ VS ZMIENNEJ STOPIE (SILNIK MIESIĘCZNY)")
+    print("=" * 80)
+    print(f"Okres symulacji: {params.n_years} lat, okresów w roku: {periods_per_year}")
+    fixed_part = (f"stała {schedule.fixed_rate:.2%} przez {schedule.fixed_periods} okresów, potem "
+                  if schedule.fixed_periods else "")
+    print(f"Oprocentowanie: {fixed_part}referencyjna + marża {schedule.margin:.2%}, "
+          f"zmiana co {schedule.reset_every} okresów")
+    for label, result in (("Stała stopa", fixed), ("Harmonogram stopy", variable)):
+        best = max(range(len(result)), key=result.net_worth.__getitem__)
+        print(f"\n{label}: najlepiej - {describe_period(best, params, periods_per_year)}")
+        print(f"  Majątek końcowy: {result.net_worth[best]:,.2f} zł")
+        if result.loan_amount[best] > 0:
+            print(f"  Pierwsza rata: {result.initial_payment[best]:,.2f} zł, "
+                  f"oprocentowanie na końcu: {result.final_rate[best]:.2%}")
+            print(f"  Suma odsetek: {result.total_paid_interest[best]:,.2f} zł")
+
+    print(f"\n{'Zakup':<40}{'Stała stopa':>19}{'Harmonogram':>19}")
+    print("-" * 78)
+    for year in range(params.n_years + 2):
+        period = min(year * periods_per_year, len(fixed) - 1)
+        print(f"{describe_period(period, params, periods_per_year):<40}"
+              f"{fixed.net_worth[period]:>17,.0f} zł{variable.net_worth[period]:>16,.0f} zł")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Miesięczny silnik: odroczony zakup i kredyt o zmiennej stopie")
+    parser.add_argument('--years', type=int, default=None, help="okres symulacji (domyślnie N_YEARS)")
+    parser.add_argument('--periods-per-year', type=int, default=DEFAULT_PERIODS_PER_YEAR)
+    parser.add_argument('--reference', type=float, default=None,
+                        help="stała stopa referencyjna (domyślnie LENDING_RATE - marża)")
+    parser.add_argument('--reference-path', type=float, nargs='+', default=None,
+                        help="roczne stopy referencyjne w kolejnych latach (ostatnia obowiązuje dalej)")
+    parser.add_argument('--margin', type=float, default=0.0)
+    parser.add_argument('--fixed-years', type=int, default=0, help="okres stałej stopy od zakupu")
+    parser.add_argument('--fixed-rate', type=float, default=None, help="stopa w okresie stałym")
+    parser.add_argument('--reset-months', type=int, default=DEFAULT_RESET_EVERY,
+                        help="co ile okresów stopa jest ustalana na nowo")
+    args = parser.parse_args()
+
+    params = SimulationParams() if args.years is None else SimulationParams(n_years=args.years)
+    ppy = args.periods_per_year
+    if args.reference_path:
+        reference_rates = yearly_path(args.reference_path, ppy)
+    else:
+        reference = params.lending_rate - args.margin if args.reference is None else args.reference
+        reference_rates = (reference,)
+    schedule = RateResetSchedule(reference_rates, args.margin, args.fixed_years * ppy,
+                                 params.lending_rate if args.fixed_years and args.fixed_rate is None
+                                 else args.fixed_rate, args.reset_months)
+    print_comparison(params, ppy, simulate_all_purchase_periods(params, ppy),
+                     simulate_all_purchase_periods(params, ppy, schedule), schedule)
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Podział dużych siatek parametrów na shardy liczone niezależnie (procesy, węzły).
+
+Siatka jest opisana deklaratywnie w JSON:
+
+    {
+      "base": {"mortgage_term_years": 30},
+      "axes": {
+        "initial_capital": {"start": 50000, "stop": 500000, "num": 10},
+        "savings": [40000, 60000, 80000],
+        "lending_rate": {"start": 0.03, "stop": 0.09, "step": 0.005},
+        "n_years": {"start": 5, "stop": 30, "step": 5}
+      },
+      "shard_size": 10000
+    }
+
+Punkty siatki są numerowane w systemie mieszanym (ostatnia oś zmienia się
+najszybciej), więc numer punktu jednoznacznie wyznacza jego parametry,
+a shard to po prostu przedział numerów [k*shard_size, (k+1)*shard_size).
+Podział nie zależy od liczby procesów ani węzłów.
+
+Dla każdego punktu liczone są wszystkie lata zakupu, a zapisywane
+podsumowanie: najlepszy rok zakupu, majątek w najlepszym scenariuszu
+i majątek przy samym wynajmie. Każdy policzony shard jest zapisywany
+atomowo (plik tymczasowy + fsync + os.replace) jako
+`<katalog>/shard-<numer>.bin` - istnienie pliku oznacza, że shard jest
+gotowy, więc przerwane zadanie po ponownym uruchomieniu liczy tylko
+brakujące shardy. Plik tymczasowy ma w nazwie host i pid piszącego procesu;
+pozostałości przerwanych zapisów usuwa tylko `run`, i to wyłącznie wtedy,
+gdy ten proces na tym hoście już nie istnieje (`status` i `merge` niczego
+nie usuwają). Nagłówek shardu zawiera skrót specyfikacji, silnika
+i wersji kodu modelu - wyniki innej siatki albo innej wersji modelu nie
+zostaną pomylone.
+
+Węzły dzielą shardy statycznie (--node i/n: shardy o numerach i, i+n, ...),
+więc wystarczy wspólny katalog (np. NFS). Polecenie `local` uruchamia
+n węzłów jako osobne procesy na jednej maszynie - zamiast klastra w testach.
+Na koniec `merge` łączy shardy w jeden plik wyników (kolejność punktów)
+i wypisuje podsumowanie.
+
+Użycie:
+    python parameter_sweep.py run sweep.json out/ --workers 8
+    python parameter_sweep.py run sweep.json out/ --node 3/16      # węzeł 3 z 16
+    python parameter_sweep.py local sweep.json out/ --nodes 4      # 4 "węzły" lokalnie
+    python parameter_sweep.py status sweep.json out/
+    python parameter_sweep.py merge sweep.json out/ results.bin
+"""
+
+import argparse
+import dataclasses
+import glob
+import hashlib
+import json
+import math
+import os
+import socket
+import struct
+import subprocess
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import real_estate_simulator_project_homework as sim
+from streaming_stats import QuantileSketch, RunningMoments
+
+ENGINES = ('batch', 'loop', 'closed-form')
+DEFAULT_SHARD_SIZE = 10_000  # punktów siatki w jednym shardzie
+VECTOR_CHUNK = 2_048  # punktów w jednym wywołaniu silnika wektorowego
+SHARDS_PER_WORKER = 2  # ile shardów na proces może jednocześnie czekać na wynik
+SPEC_FILE = 'sweep.json'  # kopia specyfikacji w katalogu wyników
+
+SHARD_MAGIC = b'SWEEPSH1'
+RESULTS_MAGIC = b'SWEEPRS1'
+# magic, numer shardu (wyniki: liczba shardów), pierwszy punkt, liczba punktów, skrót specyfikacji
+_HEADER = struct.Struct('<8sQQQ32s')
+
+
+@dataclasses.dataclass
+class SweepSpec:
+    """Deklaratywna siatka parametrów modelu głównego"""
+    axes: List[Tuple[str, list]]  # (pole SimulationParams, wartości) - kolejność = kolejność cyfr numeru punktu
+    base: Dict[str, float] = dataclasses.field(default_factory=dict)  # stałe pola poza siatką
+    shard_size: int = DEFAULT_SHARD_SIZE
+
+    @classmethod
+    def from_dict(cls, document: dict) -> 'SweepSpec':
+        fields = {f.name: f for f in dataclasses.fields(sim.SimulationParams)}
+
+        def convert(name, value):
+            if name not in fields:
+                raise ValueError(f"nieznany parametr {name!r}")
+            return int(round(value)) if fields[name].type in (int, 'int') else float(value)
+
+        axes = []
+        for name, values in document['axes'].items():
+            if isinstance(values, dict):
+                values = _expand_range(values)
+            values = [convert(name, value) for value in values]
+            if not values:
+                raise ValueError(f"oś {name!r} nie ma wartości")
+            axes.append((name, values))
+        base = {name: convert(name, value) for name, value in document.get('base', {}).items()}
+        return cls(axes, base, int(document.get('shard_size', DEFAULT_SHARD_SIZE)))
+
+    @classmethod
+    def load(cls, path: str) -> 'SweepSpec':
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> dict:
+        return {'base': self.base, 'axes': dict(self.axes), 'shard_size': self.shard_size}
+
+    def digest(self, engine: str) -> bytes:
+        """Skrót specyfikacji (po rozwinięciu osi), silnika i wersji kodu modelu - 32 znaki hex"""
+        document = {'spec': self.to_dict(), 'engine': engine, 'model_version': sim.MODEL_VERSION}
+        return hashlib.sha256(json.dumps(document, sort_keys=True).encode('utf-8')).hexdigest()[:32].encode('ascii')
+
+    @property
+    def total_points(self) -> int:
+        return math.prod(len(values) for _, values in self.axes)
+
+    @property
+    def shard_count(self) -> int:
+        return -(-self.total_points // self.shard_size)
+
+    def shard_range(self, shard: int) -> range:
+        """Numery punktów shardu"""
+        start = shard * self.shard_size
+        return range(start, min(start + self.shard_size, self.total_points))
+
+    def point(self, index: int) -> dict:
+        """Argumenty SimulationParams punktu o danym numerze"""
+        kwargs = dict(self.base)
+        for name, values in reversed(self.axes):
+            index, digit = divmod(index, len(values))
+            kwargs[name] = values[digit]
+        return kwargs
+
+
+def _expand_range(axis: dict) -> list:
+    """{"start", "stop", "num"} (jak linspace) albo {"start", "stop", "step"} (stop włącznie)"""
+    start, stop = axis['start'], axis['stop']
+    if 'num' in axis:
+        num = int(axis['num'])
+        return [start + (stop - start) * i / (num - 1) for i in range(num)] if num > 1 else [start]
+    step = axis['step']
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    return [start + i * step for i in range(max(0, count))]
+
+
+# --- Liczenie shardu ---------------------------------------------------------------
+
+def _summarize_loop(kwargs: dict, closed_form: bool) -> Tuple[int, float, float]:
+    params = sim.SimulationParams(**kwargs)
+    results = list(sim.branch_purchase_years(params, closed_form))
+    best = max(results, key=lambda r: r.net_worth)
+    return best.purchase_year, best.net_worth, results[-1].net_worth
+
+
+def _summarize_batch(points: List[dict]) -> List[Tuple[int, float, float]]:
+    import numpy as np
+    import batch_simulator
+
+    summaries: List[Optional[tuple]] = [None] * len(points)
+    by_horizon: Dict[int, List[int]] = {}
+    for position, kwargs in enumerate(points):
+        by_horizon.setdefault(kwargs.get('n_years', sim.N_YEARS), []).append(position)
+    names = [f.name for f in dataclasses.fields(sim.SimulationParams) if f.name != 'n_years']
+    defaults = sim.SimulationParams()
+    for n_years, positions in by_horizon.items():
+        scenarios = n_years + 2
+        for first in range(0, len(positions), VECTOR_CHUNK):
+            chunk = positions[first:first + VECTOR_CHUNK]
+            columns = {name: np.repeat([points[p].get(name, getattr(defaults, name)) for p in chunk], scenarios)
+                       for name in names}
+            result = batch_simulator.simulate_batch(np.tile(np.arange(scenarios), len(chunk)), n_years=n_years,
+                                                    **columns)
+            net_worth = result.net_worth.reshape(len(chunk), scenarios)
+            best = net_worth.argmax(axis=1)  # pierwszy największy - jak max() po liście wyników
+            best_net_worth = net_worth[np.arange(len(chunk)), best]
+            for p, year, value, rent in zip(chunk, best.tolist(), best_net_worth.tolist(), net_worth[:, -1].tolist()):
+                summaries[p] = (year, value, rent)
+    return summaries
+
+
+def compute_shard(spec: SweepSpec, shard: int, engine: str) -> Tuple[array, array, array]:
+    """
+    Podsumowania punktów shardu.
+
+    Returns:
+        (najlepszy rok zakupu array('q'), majątek w najlepszym scenariuszu array('d'),
+         majątek przy samym wynajmie array('d'))
+    """
+    points = [spec.point(index) for index in spec.shard_range(shard)]
+    if engine == 'batch':
+        summaries = _summarize_batch(points)
+    else:
+        summaries = [_summarize_loop(kwargs, engine == 'closed-form') for kwargs in points]
+    best_year = array('q', [s[0] for s in summaries])
+    best_net_worth = array('d', [s[1] for s in summaries])
+    rent_net_worth = array('d', [s[2] for s in summaries])
+    return best_year, best_net_worth, rent_net_worth
+
+
+def shard_path(directory: str, shard: int) -> str:
+    return os.path.join(directory, f'shard-{shard:06d}.bin')
+
+
+def _write_columns(f, columns: Sequence[array]):
+    for column in columns:
+        if sys.byteorder != 'little':
+            column = array(column.typecode, column)
+            column.byteswap()
+        column.tofile(f)
+
+
+def _temporary_path(path: str) -> str:
+    """Plik tymczasowy zapisu: <plik>.tmp-<host>-<pid> (pozwala rozpoznać porzucone zapisy)"""
+    return f'{path}.tmp-{socket.gethostname()}-{os.getpid()}'
+
+
+def write_shard(directory: str, shard: int, first_point: int, digest: bytes, columns: Sequence[array]):
+    """Zapis atomowy: plik tymczasowy, fsync, os.replace (gotowy plik zawsze jest kompletny)."""
+    path = shard_path(directory, shard)
+    temporary = _temporary_path(path)
+    with open(temporary, 'wb') as f:
+        f.write(_HEADER.pack(SHARD_MAGIC, shard, first_point, len(columns[0]), digest))
+        _write_columns(f, columns)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def read_columns(path: str, magic: bytes = SHARD_MAGIC) -> Tuple[tuple, Tuple[array, array, array]]:
+    """
+    Odczyt pliku shardu albo połączonych wyników.
+
+    Returns:
+        (nagłówek (magic, numer, pierwszy punkt, liczba punktów, skrót), kolumny jak w compute_shard)
+    """
+    with open(path, 'rb') as f:
+        header = _HEADER.unpack(f.read(_HEADER.size))
+        if header[0] != magic:
+            raise ValueError(f"{path}: nieprawidłowy plik wyników przeglądu")
+        count = header[3]
+        columns = []
+        for typecode in ('q', 'd', 'd'):
+            column = array(typecode)
+            column.fromfile(f, count)
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns.append(column)
+    return header, tuple(columns)
+
+
+def shard_done(spec: SweepSpec, directory: str, shard: int, digest: bytes) -> bool:
+    """Czy shard jest policzony dla tej specyfikacji (plik istnieje i ma właściwy nagłówek)."""
+    path = shard_path(directory, shard)
+    try:
+        with open(path, 'rb') as f:
+            header = _HEADER.unpack(f.read(_HEADER.size))
+    except (FileNotFoundError, struct.error):
+        return False
+    if header[4] != digest:
+        raise ValueError(f"{path} pochodzi z innej specyfikacji, silnika albo wersji modelu - użyj nowego katalogu")
+    expected_size = _HEADER.size + 24 * len(spec.shard_range(shard))
+    return header[3] == len(spec.shard_range(shard)) and os.path.getsize(path) == expected_size
+
+
+def _run_shard_task(task: tuple) -> int:
+    spec_document, shard, directory, engine = task
+    spec = SweepSpec.from_dict(spec_document)
+    columns = compute_shard(spec, shard, engine)
+    write_shard(directory, shard, spec.shard_range(shard).start, spec.digest(engine), columns)
+    return shard
+
+
+# --- Koordynacja -------------------------------------------------------------------
+
+def default_engine() -> str:
+    """'batch' (silnik wektorowy), jeśli jest numpy; inaczej 'loop'"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return 'loop'
+    return 'batch'
+
+
+def prepare_directory(spec: SweepSpec, directory: str):
+    """Tworzy katalog wyników i zapisuje w nim specyfikację (albo sprawdza zgodność z zapisaną)."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, SPEC_FILE)
+    document = spec.to_dict()
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            if SweepSpec.from_dict(json.load(f)).to_dict() != document:
+                raise ValueError(f"{directory} zawiera wyniki innej siatki - użyj nowego katalogu")
+        return
+    temporary = _temporary_path(path)
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    os.replace(temporary, path)
+
+
+def node_shards(spec: SweepSpec, node: int = 0, nodes: int = 1) -> range:
+    """Shardy przypisane węzłowi: node, node+nodes, node+2*nodes, ..."""
+    return range(node, spec.shard_count, nodes)
+
+
+def pending_shards(spec: SweepSpec, directory: str, engine: str, node: int = 0, nodes: int = 1) -> List[int]:
+    """Niepoliczone shardy węzła (tylko odczyt - nic nie jest usuwane)."""
+    digest = spec.digest(engine)
+    return [shard for shard in node_shards(spec, node, nodes) if not shard_done(spec, directory, shard, digest)]
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # proces istnieje, ale należy do innego użytkownika
+    return True
+
+
+def remove_abandoned_temporaries(spec: SweepSpec, directory: str, node: int = 0, nodes: int = 1) -> int:
+    """
+    Usuwa pliki tymczasowe przerwanych zapisów shardów węzła.
+
+    Usuwany jest tylko plik, którego proces piszący na pewno nie żyje: ten sam
+    host i pid, którego już nie ma. Zapisy trwające w innych procesach
+    i na innych hostach (wspólny katalog) zostają nietknięte.
+
+    Returns:
+        liczba usuniętych plików
+    """
+    mine = node_shards(spec, node, nodes)
+    host = socket.gethostname()
+    removed = 0
+    for temporary in glob.glob(os.path.join(directory, 'shard-*.bin.tmp-*')):
+        name = os.path.basename(temporary)
+        writer_host, _, pid = name.split('.tmp-', 1)[1].rpartition('-')
+        try:
+            shard, pid = int(name[len('shard-'):].split('.', 1)[0]), int(pid)
+        except ValueError:
+            continue  # nie nasz format nazwy - nie ruszamy
+        if shard in mine and writer_host == host and not _process_exists(pid):
+            try:
+                os.remove(temporary)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def run_sweep(spec: SweepSpec, directory: str, workers: Optional[int] = None, engine: Optional[str] = None,
+              node: int = 0, nodes: int = 1, progress: bool = True) -> int:
+    """
+    Liczy niepoliczone shardy węzła w puli procesów.
+
+    Args:
+        spec: siatka
+        directory: katalog wyników (wspólny dla wszystkich węzłów)
+        workers: liczba procesów (domyślnie liczba procesorów)
+        engine: 'batch', 'loop' albo 'closed-form' (domyślnie default_engine())
+        node, nodes: numer węzła i liczba węzłów
+        progress: raportuj postęp na stderr
+
+    Returns:
+        liczba policzonych teraz shardów
+    """
+    engine = engine or default_engine()
+    if engine not in ENGINES:
+        raise ValueError(f"nieznany silnik {engine!r}")
+    prepare_directory(spec, directory)
+    remove_abandoned_temporaries(spec, directory, node, nodes)
+    shards = pending_shards(spec, directory, engine, node, nodes)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    document = spec.to_dict()
+    tasks = [(document, shard, directory, engine) for shard in shards]
+    started = time.monotonic()
+
+    def report(done: int):
+        if progress:
+            elapsed = time.monotonic() - started
+            print(f"\r[węzeł {node}/{nodes}] shardy: {done}/{len(tasks)} "
+                  f"({elapsed:.0f} s)", end='', file=sys.stderr, flush=True)
+
+    done = 0
+    if workers <= 1:
+        for task in tasks:
+            _run_shard_task(task)
+            done += 1
+            report(done)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            queue = iter(tasks)
+            for task in queue:
+                in_flight.append(executor.submit(_run_shard_task, task))
+                if len(in_flight) >= workers * SHARDS_PER_WORKER:
+                    in_flight.popleft().result()
+                    done += 1
+                    report(done)
+            while in_flight:
+                in_flight.popleft().result()
+                done += 1
+                report(done)
+    if progress and tasks:
+        print(file=sys.stderr)
+    return done
+
+
+def run_local_cluster(spec_path: str, directory: str, nodes: int, engine: Optional[str] = None) -> List[int]:
+    """
+    Zamiast klastra: uruchamia `nodes` niezależnych procesów-węzłów (run --node i/nodes) i czeka na nie.
+
+    Returns:
+        kody wyjścia węzłów
+    """
+    spec = SweepSpec.load(spec_path)
+    prepare_directory(spec, directory)  # raz, zanim węzły zaczną równolegle
+    script = os.path.abspath(__file__)
+    processes = []
+    for node in range(nodes):
+        command = [sys.executable, script, 'run', spec_path, directory, '--node', f'{node}/{nodes}',
+                   '--workers', '1', '--quiet']
+        if engine:
+            command += ['--engine', engine]
+        processes.append(subprocess.Popen(command))
+    return [process.wait() for process in processes]
+
+
+@dataclasses.dataclass
+class SweepSummary:
+    """Podsumowanie całej siatki (strumieniowo, bez trzymania wszystkich punktów)"""
+    points: int
+    best_year_counts: Dict[int, int]  # najlepszy rok zakupu -> liczba punktów
+    buy_wins: int  # punkty, w których zakup (w którymś roku) wygrywa z samym wynajmem
+    best_net_worth: RunningMoments
+    advantage: QuantileSketch  # majątek najlepszy - majątek przy wynajmie
+
+
+def merge_shards(spec: SweepSpec, directory: str, output: Optional[str], engine: Optional[str] = None) -> SweepSummary:
+    """
+    Łączy shardy w jeden plik wyników (w kolejności punktów) i liczy podsumowanie.
+
+    Każdy shard jest czytany raz, po kolei, więc pamięć zależy od rozmiaru
+    shardu, nie siatki. Tylko odczyt shardów - nic w katalogu nie jest usuwane.
+
+    Raises:
+        ValueError: brakuje shardów albo pochodzą z innej specyfikacji
+    """
+    engine = engine or default_engine()
+    digest = spec.digest(engine)
+    missing = pending_shards(spec, directory, engine)
+    if missing:
+        raise ValueError(f"brakuje {len(missing)} shardów (np. {missing[:5]}) - dokończ `run`")
+    summary = SweepSummary(spec.total_points, {}, 0, RunningMoments(), QuantileSketch())
+    f = open(output + '.tmp', 'wb') if output else None
+    try:
+        if f:
+            f.write(_HEADER.pack(RESULTS_MAGIC, spec.shard_count, 0, spec.total_points, digest))
+        # kolumny leżą jedna po drugiej (po 8 bajtów na punkt) - każdy shard jest czytany
+        # raz, a jego części kolumn zapisywane w wyliczonych miejscach trzech obszarów pliku
+        column_bytes = 8 * spec.total_points
+        for shard in range(spec.shard_count):
+            _, columns = read_columns(shard_path(directory, shard))
+            if f:
+                offset = _HEADER.size + 8 * spec.shard_range(shard).start
+                for column_index, column in enumerate(columns):
+                    f.seek(offset + column_index * column_bytes)
+                    _write_columns(f, [column])
+            best_year, best_net_worth, rent_net_worth = columns
+            for year in best_year:
+                summary.best_year_counts[year] = summary.best_year_counts.get(year, 0) + 1
+            summary.best_net_worth.update(best_net_worth)
+            for best, rent in zip(best_net_worth, rent_net_worth):
+                summary.advantage.add(best - rent)
+                summary.buy_wins += best > rent
+        if f:
+            f.flush()
+            os.fsync(f.fileno())
+    finally:
+        if f:
+            f.close()
+    if output:
+        os.replace(output + '.tmp', output)
+    return summary
+
+
+def print_summary(spec: SweepSpec, summary: SweepSummary):
+    """Wyświetla podsumowanie siatki"""
+    print("=" * 80)
+    print("PRZEGLĄD SIATKI PARAMETRÓW")
+    print("=" * 80)
+    print(f"Osie: {', '.join(f'{name} ({len(values)})' for name, values in spec.axes)}")
+    print(f"Punkty: {summary.points:,}, shardy: {spec.shard_count:,}")
+    print(f"Zakup wygrywa z wynajmem w {summary.buy_wins / max(1, summary.points):.1%} punktów")
+    print(f"Średni majątek w najlepszym scenariuszu: {summary.best_net_worth.mean:,.2f} zł")
+    p50, p90 = (summary.advantage.quantile(q) for q in (0.5, 0.9))
+    print(f"Przewaga najlepszego scenariusza nad wynajmem: mediana {p50:,.2f} zł, p90 {p90:,.2f} zł")
+    print("\nNajlepszy rok zakupu (liczba punktów):")
+    for year, count in sorted(summary.best_year_counts.items()):
+        print(f"  rok {year:>3}: {count:>12,}")
+
+
+def _parse_node(text: str) -> Tuple[int, int]:
+    node, nodes = (int(part) for part in text.split('/'))
+    if not 0 <= node < nodes:
+        raise argparse.ArgumentTypeError("węzeł w postaci i/n, 0 <= i < n")
+    return node, nodes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Shardowane, wznawialne przeglądy siatek parametrów")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('run', "policz niepoliczone shardy (tego węzła)"),
+                            ('local', "uruchom kilka węzłów lokalnie i połącz wyniki"),
+                            ('status', "ile shardów jest policzonych"),
+                            ('merge', "połącz shardy w jeden plik wyników")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('spec', help="plik JSON ze specyfikacją siatki")
+        command.add_argument('directory', help="katalog shardów")
+        command.add_argument('--engine', choices=ENGINES, default=None,
+                             help="batch (numpy, domyślnie), loop albo closed-form")
+        if name == 'run':
+            command.add_argument('--workers', type=int, default=None)
+            command.add_argument('--node', type=_parse_node, default=(0, 1), help="numer węzła i/n")
+            command.add_argument('--quiet', action='store_true', help="bez raportu postępu")
+        if name == 'local':
+            command.add_argument('--nodes', type=int, default=2)
+        if name in ('local', 'merge'):
+            command.add_argument('output', nargs='?', help="plik połączonych wyników")
+    args = parser.parse_args()
+
+    spec = SweepSpec.load(args.spec)
+    if args.command == 'run':
+        run_sweep(spec, args.directory, args.workers, args.engine, *args.node, progress=not args.quiet)
+    elif args.command == 'status':
+        missing = len(pending_shards(spec, args.directory, args.engine or default_engine()))
+        print(f"Policzone shardy: {spec.shard_count - missing}/{spec.shard_count} "
+              f"(punkty: {spec.total_points:,})")
+    else:
+        if args.command == 'local':
+            codes = run_local_cluster(args.spec, args.directory, args.nodes, args.engine)
+            if any(codes):
+                sys.exit(f"węzły zakończone błędem: {codes}")
+        print_summary(spec, merge_shards(spec, args.directory, args.output, args.engine))
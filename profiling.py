@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Opcjonalne profilowanie pętli symulacji i funkcji raportujących.
+
+Funkcje oznaczone dekoratorem @instrumented mają w kodzie bloki
+`if profiler is not None: ...`, które mierzą czas poszczególnych faz pętli
+(zakup, aprecjacja, kredyt, lokata, ...). Dekorator kompiluje z tego samego
+źródła drugą wersję funkcji bez tych bloków i to ona jest używana normalnie -
+wyłączone profilowanie nie kosztuje więc nic (w pętli nie ma żadnych
+dodatkowych instrukcji). Dopiero enable() / profile() podmienia funkcje
+w modułach na wersje z pomiarami, a disable() przywraca wersje bez pomiarów.
+
+Uwaga: podmiana działa przez atrybuty modułu, więc obejmuje wywołania
+`modul.funkcja(...)` i wywołania wewnątrz modułu, ale nie kopie zrobione
+przez `from modul import funkcja`.
+
+Wynik: tabela (czas łączny, liczba wywołań, średnia na fazę) oraz plik JSON
+w formacie Chrome Trace (chrome://tracing, Perfetto).
+
+Użycie:
+    python profiling.py                      # główny symulator
+    python profiling.py archive --trace trace.json
+"""
+
+import argparse
+import ast
+import contextlib
+import functools
+import inspect
+import io
+import json
+import os
+import textwrap
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+PROFILER_NAME = 'profiler'  # nazwa zmiennej lokalnej strzegącej bloków pomiarowych
+
+# Aktywny profiler (None = profilowanie wyłączone)
+ACTIVE: Optional['Profiler'] = None
+
+# Zarejestrowane funkcje: (słownik globali modułu, nazwa, wersja bez pomiarów, wersja z pomiarami)
+_REGISTRY: List[tuple] = []
+
+
+@dataclass
+class PhaseStats:
+    """Zagregowane pomiary jednej fazy"""
+    calls: int = 0
+    total_ns: int = 0
+    min_ns: int = 0
+    max_ns: int = 0
+
+    def add(self, duration_ns: int):
+        if self.calls == 0 or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.calls += 1
+        self.total_ns += duration_ns
+
+
+class Profiler:
+    """Zbiera czasy faz i liczbę wywołań oraz (opcjonalnie) zdarzenia do Chrome Trace."""
+
+    def __init__(self, trace: bool = True, max_trace_events: int = 1_000_000):
+        self.stats: Dict[str, PhaseStats] = {}
+        self.trace = trace
+        self.max_trace_events = max_trace_events
+        self.events: List[tuple] = []  # (nazwa, kategoria, start_ns, czas_ns, id wątku)
+        self.dropped_events = 0
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    now = staticmethod(time.perf_counter_ns)
+
+    def record(self, name: str, start_ns: int, end_ns: int, category: str = 'phase'):
+        """Zapisuje jeden pomiar fazy `name` trwającej od start_ns do end_ns."""
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = PhaseStats()
+            stats.add(end_ns - start_ns)
+            if self.trace:
+                if len(self.events) < self.max_trace_events:
+                    self.events.append((name, category, start_ns, end_ns - start_ns, threading.get_ident()))
+                else:
+                    self.dropped_events += 1
+
+    def lap(self, name: str, start_ns: int) -> int:
+        """Kończy fazę rozpoczętą w start_ns i zwraca bieżący czas (początek następnej fazy)."""
+        end_ns = time.perf_counter_ns()
+        self.record(name, start_ns, end_ns)
+        return end_ns
+
+    def summary_table(self) -> str:
+        """Tabela faz posortowana malejąco po czasie łącznym."""
+        lines = [f"{'Faza':<45} {'Wywołania':>10} {'Łącznie [ms]':>13} {'Średnio [µs]':>13} {'Min [µs]':>10} {'Max [µs]':>10}",
+                 "-" * 106]
+        for name, s in sorted(self.stats.items(), key=lambda item: -item[1].total_ns):
+            lines.append(f"{name:<45} {s.calls:>10,} {s.total_ns / 1e6:>13.3f} {s.total_ns / s.calls / 1e3:>13.3f}"
+                         f" {s.min_ns / 1e3:>10.3f} {s.max_ns / 1e3:>10.3f}")
+        if self.dropped_events:
+            lines.append(f"(pominięto {self.dropped_events:,} zdarzeń śladu ponad limit {self.max_trace_events:,})")
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path: str):
+        """Zapisuje zdarzenia w formacie Chrome Trace Event (JSON, czasy w µs)."""
+        pid = os.getpid()
+        events = [{
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1e3,
+            "dur": duration_ns / 1e3,
+            "pid": pid,
+            "tid": tid,
+        } for name, category, start_ns, duration_ns, tid in self.events]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def current() -> Optional[Profiler]:
+    """Aktywny profiler albo None."""
+    return ACTIVE
+
+
+def _is_profiler_guard(node: ast.AST) -> bool:
+    """Czy to `if profiler is not None:` albo `profiler = ...`."""
+    if isinstance(node, ast.If):
+        test = node.test
+        return (isinstance(test, ast.Compare) and isinstance(test.left, ast.Name)
+                and test.left.id == PROFILER_NAME and len(test.ops) == 1
+                and isinstance(test.ops[0], ast.IsNot))
+    if isinstance(node, ast.Assign):
+        return any(isinstance(t, ast.Name) and t.id == PROFILER_NAME for t in node.targets)
+    return False
+
+
+class _StripProfilerGuards(ast.NodeTransformer):
+    """Usuwa bloki pomiarowe ze wszystkich list instrukcji funkcji."""
+
+    def generic_visit(self, node):
+        for field in ('body', 'orelse', 'finalbody'):
+            statements = getattr(node, field, None)
+            if isinstance(statements, list) and statements and isinstance(statements[0], ast.stmt):
+                kept = [s for s in statements if not _is_profiler_guard(s)]
+                if not kept and field == 'body':
+                    kept = [ast.copy_location(ast.Pass(), statements[0])]
+                setattr(node, field, kept)
+        return super().generic_visit(node)
+
+
+def _compile_without_guards(function: Callable) -> Callable:
+    """Kompiluje kopię funkcji bez bloków pomiarowych (numery linii jak w pliku źródłowym)."""
+    try:
+        source = textwrap.dedent(inspect.getsource(function))
+    except (OSError, TypeError):  # brak źródła - zostaje wersja z blokami (nadal poprawna)
+        return function
+    tree = ast.parse(source)
+    definition = tree.body[0]
+    definition.decorator_list = []
+    _StripProfilerGuards().visit(tree)
+    ast.increment_lineno(tree, function.__code__.co_firstlineno - definition.lineno)
+    namespace: dict = {}
+    exec(compile(tree, function.__code__.co_filename, 'exec'), function.__globals__, namespace)
+    plain = namespace[function.__name__]
+    functools.update_wrapper(plain, function)
+    del plain.__wrapped__
+    return plain
+
+
+def instrumented(function: Callable) -> Callable:
+    """
+    Dekorator: rejestruje funkcję do profilowania.
+
+    Zwraca wersję bez bloków `if profiler is not None:` (zero narzutu). Wersja
+    z pomiarami mierzy też czas całego wywołania i liczbę wywołań funkcji.
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def profiled(*args, **kwargs):
+        profiler = ACTIVE
+        if profiler is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.record(name, start, time.perf_counter_ns(), category='call')
+
+    plain = _compile_without_guards(function)
+    _REGISTRY.append((function.__globals__, function.__name__, plain, profiled))
+    return plain
+
+
+def _swap(enabled: bool):
+    for module_globals, name, plain, profiled in _REGISTRY:
+        module_globals[name] = profiled if enabled else plain
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """Włącza profilowanie (podmienia zarejestrowane funkcje na wersje z pomiarami)."""
+    global ACTIVE
+    ACTIVE = profiler if profiler is not None else Profiler()
+    _swap(True)
+    return ACTIVE
+
+
+def disable() -> Optional[Profiler]:
+    """Wyłącza profilowanie i zwraca profiler z zebranymi pomiarami."""
+    global ACTIVE
+    profiler, ACTIVE = ACTIVE, None
+    _swap(False)
+    return profiler
+
+
+@contextlib.contextmanager
+def profile(trace: bool = True, max_trace_events: int = 1_000_000):
+    """Kontekst: `with profile() as p: ...; print(p.summary_table())`."""
+    profiler = enable(Profiler(trace, max_trace_events))
+    try:
+        yield profiler
+    finally:
+        disable()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Profilowanie symulatorów zakupu vs wynajmu")
+    parser.add_argument('model', nargs='?', choices=('main', 'archive'), default='main',
+                        help="main = run_all_scenarios, archive = run_scenarios(1, 10)")
+    parser.add_argument('--trace', help="zapisz ślad Chrome Trace do pliku JSON")
+    parser.add_argument('--repeat', type=int, default=1, help="ile razy uruchomić symulację")
+    parser.add_argument('--show-output', action='store_true', help="nie ukrywaj wyników symulacji")
+    args = parser.parse_args()
+
+    # Symulatory rejestrują funkcje w module `profiling`, nie w `__main__`
+    import profiling
+    import real_estate_simulator_project_homework as sim
+    import real_estate_simulator_project_homework_archive as archive
+
+    with profiling.profile(trace=args.trace is not None) as p:
+        for _ in range(args.repeat):
+            with contextlib.ExitStack() as stack:
+                if not args.show_output:
+                    stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+                if args.model == 'main':
+                    sim.run_all_scenarios()
+                else:
+                    archive.run_scenarios(1, 10)
+    print(p.summary_table())
+    if args.trace:
+        p.write_chrome_trace(args.trace)
+        print(f"\nZapisano ślad: {args.trace}")
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Optymalny moment zakupu z dokładnością do miesiąca (model główny).
+
+run_all_scenarios sprawdza tylko pełne lata zakupu. Tutaj model
+simulate_purchase_year jest uogólniony na okresy krótsze niż rok
+(periods_per_year = 12: miesięczne oszczędności, czynsz, koszty
+utrzymania i raty, stopy przeliczone na okres) - dla periods_per_year = 1
+daje dokładnie te same wyniki co simulate_purchase_year. Oprócz miesiąca
+zakupu zmiennymi decyzyjnymi mogą być wkład własny i okres kredytu.
+
+Przeszukiwanie jest przycinane tym, co model gwarantuje:
+
+- Dla ustalonego miesiąca zakupu i okresu kredytu majątek końcowy jest
+  funkcją liniową wkładu własnego (rata, saldo i odsetki są liniowe
+  w kwocie kredytu, a lokata nie ma innego oprocentowania dla sald
+  ujemnych), więc optimum leży na końcu przedziału: minimalny albo
+  maksymalny możliwy wkład.
+- Zobowiązanie kredytowe wycenione na koniec okresu (raty przeniesione na
+  lokatę + saldo) wynosi K(1+d)^m + (r - d) * suma B_j (1+d)^(m-1-j), gdzie
+  B_j to salda, które przy dłuższym okresie kredytu są nie mniejsze. Majątek
+  jest więc monotoniczny w okresie kredytu - optimum to najkrótszy albo
+  najdłuższy dopuszczalny okres (zależnie od znaku r - d).
+- Dla każdego miesiąca zakupu majątek liczymy wzorami zamkniętymi w O(1)
+  (jak simulate_purchase_year_closed_form), zamiast pętli po miesiącach.
+
+Zostaje najwyżej 4 wyliczenia O(1) na miesiąc zakupu zamiast pętli
+O(horyzont) dla każdej kombinacji miesiąc × wkład × okres kredytu.
+
+Użycie:
+    python purchase_timing.py --years 40
+    python purchase_timing.py --years 30 --optimize-down-payment --min-down-payment 0.2 --terms 10 35
+"""
+
+import argparse
+import heapq
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import real_estate_simulator_project_homework as sim
+from amortization import amortization_schedule
+from real_estate_simulator_project_homework import SimulationParams, cross_growth_sum, growth_sum
+
+DEFAULT_PERIODS_PER_YEAR = 12  # okres = miesiąc
+DEFAULT_RUNNERS_UP = 5  # ile kolejnych najlepszych miesięcy zakupu raportować
+
+
+@dataclass
+class PurchasePlan:
+    """Jeden wariant decyzji: kiedy kupić, jaki wkład własny, na ile lat kredyt"""
+    purchase_period: int  # okres zakupu (0 = od razu); liczba wszystkich okresów = nigdy
+    periods_per_year: int  # liczba okresów w roku (12 = miesiące)
+    buys: bool  # False = tylko wynajem
+    down_payment: float  # wkład własny
+    mortgage_term_years: int  # okres kredytu w latach
+    loan_amount: float  # kwota kredytu
+    payment: float  # rata kredytu na okres
+    net_worth: float  # majątek końcowy
+
+    @property
+    def purchase_year_and_period(self) -> Tuple[int, int]:
+        """(pełne lata, okres w roku) - np. (3, 5) = 6. miesiąc 4. roku"""
+        return divmod(self.purchase_period, self.periods_per_year)
+
+
+@dataclass
+class TimingResult:
+    """Wynik optymalizacji: najlepszy plan i kolejne (najlepsze dla innych okresów zakupu)"""
+    best: PurchasePlan
+    runners_up: List[Tuple[PurchasePlan, float]]  # (plan, strata majątku względem najlepszego)
+    evaluations: int  # liczba wyliczeń majątku (wzorów zamkniętych)
+
+
+def period_rate(annual_rate: float, periods_per_year: int) -> float:
+    """Stopa na okres równoważna stopie rocznej przy kapitalizacji co okres."""
+    if periods_per_year == 1:
+        return annual_rate
+    return math.expm1(math.log1p(annual_rate) / periods_per_year)
+
+
+def total_periods(params: SimulationParams, periods_per_year: int) -> int:
+    """Liczba okresów przepływów: (n_years + 1) lat, jak lata 0..n_years w simulate_purchase_year."""
+    return (params.n_years + 1) * periods_per_year
+
+
+def period_payment(loan_amount: float, rate: float, periods: int) -> float:
+    """Rata annuitetowa przy stopie na okres rate (0 przy braku kredytu, kwota / liczba rat przy stopie 0)."""
+    if loan_amount <= 0:
+        return 0.0
+    if rate == 0:
+        return loan_amount / periods
+    return sim.annual_payment(loan_amount, rate, periods)
+
+
+def _rent_phase(params: SimulationParams, purchase_period: int, periods_per_year: int) -> Tuple[float, float]:
+    """Kapitał na lokacie i cena nieruchomości na początku okresu zakupu."""
+    g = period_rate(params.real_estate_price_change, periods_per_year)
+    d = period_rate(params.deposit_interest_rate, periods_per_year)
+    investment = (params.initial_capital * (1 + d) ** purchase_period
+                  + params.savings / periods_per_year * growth_sum(d, purchase_period)
+                  - params.renting_cost / periods_per_year * cross_growth_sum(g, d, purchase_period))
+    return investment, params.property_price * (1 + g) ** purchase_period
+
+
+def plan_net_worth(params: SimulationParams, purchase_period: int,
+                   periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
+                   down_payment: Optional[float] = None,
+                   mortgage_term_years: Optional[int] = None) -> PurchasePlan:
+    """
+    Majątek końcowy dla planu - wzory zamknięte, O(1).
+
+    Args:
+        params: parametry symulacji
+        purchase_period: okres zakupu (0 .. total_periods-1; total_periods = nigdy)
+        periods_per_year: liczba okresów w roku (1 = jak simulate_purchase_year)
+        down_payment: wkład własny (None = cały kapitał, nie więcej niż cena - jak w modelu);
+                      zawsze ograniczony do min(kapitał, cena)
+        mortgage_term_years: okres kredytu (None = params.mortgage_term_years)
+
+    Returns:
+        PurchasePlan z majątkiem końcowym
+    """
+    term = params.mortgage_term_years if mortgage_term_years is None else mortgage_term_years
+    periods = total_periods(params, periods_per_year)
+    d = period_rate(params.deposit_interest_rate, periods_per_year)
+    g = period_rate(params.real_estate_price_change, periods_per_year)
+    buys = purchase_period < periods
+
+    investment, price = _rent_phase(params, purchase_period if buys else periods, periods_per_year)
+    if not buys:
+        return PurchasePlan(purchase_period, periods_per_year, False, 0.0, term, 0.0, 0.0, investment)
+
+    available = min(investment, price)
+    paid = available if down_payment is None else min(down_payment, available)
+    loan_amount = max(0.0, price - paid)
+    investment -= paid
+    rate = params.lending_rate / periods_per_year
+    term_periods = term * periods_per_year
+    payment = period_payment(loan_amount, rate, term_periods)
+
+    owning_periods = periods - purchase_period
+    payments_count = min(term_periods, owning_periods) if loan_amount > 0 else 0
+    remaining_mortgage = 0.0
+    payments_future_value = 0.0
+    if payments_count > 0:
+        full_payments = payments_count - 1
+        balance = loan_amount * (1 + rate) ** full_payments - payment * growth_sum(rate, full_payments)
+        interest = balance * rate
+        last_payment = min(payment, balance + interest)
+        remaining_mortgage = max(0.0, balance - (last_payment - interest))
+        payments_future_value = (1 + d) ** (owning_periods - payments_count) * (
+            payment * growth_sum(d, full_payments) * (1 + d) + last_payment)
+
+    investment = (investment * (1 + d) ** owning_periods
+                  + params.savings / periods_per_year * growth_sum(d, owning_periods)
+                  - price * params.owning_cost / periods_per_year * cross_growth_sum(g, d, owning_periods)
+                  - payments_future_value)
+    property_value = price * (1 + g) ** (owning_periods - 1)
+    return PurchasePlan(purchase_period, periods_per_year, True, paid, term, loan_amount, payment,
+                        property_value + investment - remaining_mortgage)
+
+
+def simulate_purchase_plan(params: SimulationParams, purchase_period: int,
+                           periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
+                           down_payment: Optional[float] = None,
+                           mortgage_term_years: Optional[int] = None) -> float:
+    """
+    Majątek końcowy dla planu - pętla okres po okresie (jak simulate_purchase_year), O(horyzont).
+
+    Punkt odniesienia dla plan_net_worth i pełnego przeszukiwania; argumenty jak w plan_net_worth.
+    """
+    term = params.mortgage_term_years if mortgage_term_years is None else mortgage_term_years
+    d = period_rate(params.deposit_interest_rate, periods_per_year)
+    g = period_rate(params.real_estate_price_change, periods_per_year)
+    investment = params.initial_capital
+    property_value = 0.0
+    remaining_mortgage = 0.0
+    current_rent = params.renting_cost / periods_per_year
+    schedule = None
+    payments_made = 0
+    for period in range(total_periods(params, periods_per_year)):
+        purchased_this_period = False
+        if period == purchase_period and property_value == 0:
+            price = params.property_price * (1 + g) ** period
+            available = min(investment, price)
+            paid = available if down_payment is None else min(down_payment, available)
+            remaining_mortgage = max(0.0, price - paid)
+            schedule = amortization_schedule(remaining_mortgage, params.lending_rate, term,
+                                             periods_per_year=periods_per_year)
+            property_value = price
+            investment -= paid
+            purchased_this_period = True
+        if period > 0:
+            if property_value > 0 and not purchased_this_period:
+                property_value *= 1 + g
+            current_rent *= 1 + g
+        if property_value > 0:
+            expenses = property_value * params.owning_cost / periods_per_year
+            if remaining_mortgage > 0 and payments_made < term * periods_per_year:
+                expenses += schedule.payments[payments_made]
+                remaining_mortgage = schedule.balance[payments_made]
+                payments_made += 1
+        else:
+            expenses = current_rent
+        investment *= 1 + d
+        investment += params.savings / periods_per_year - expenses
+    return property_value + investment - remaining_mortgage
+
+
+def _down_payment_bounds(params: SimulationParams, purchase_period: int, periods_per_year: int,
+                         min_down_payment: float) -> Optional[Tuple[float, float]]:
+    """Dopuszczalny przedział wkładu własnego (None = zakupu w tym okresie nie da się sfinansować)."""
+    investment, price = _rent_phase(params, purchase_period, periods_per_year)
+    upper = min(investment, price)
+    lower = min_down_payment * price
+    if upper < lower:
+        return None
+    return lower, upper
+
+
+def optimize_purchase_timing(params: Optional[SimulationParams] = None,
+                             periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
+                             optimize_down_payment: bool = False,
+                             min_down_payment: float = 0.0,
+                             mortgage_terms: Optional[Sequence[int]] = None,
+                             runners_up: int = DEFAULT_RUNNERS_UP) -> TimingResult:
+    """
+    Najlepszy okres zakupu (i opcjonalnie wkład własny oraz okres kredytu).
+
+    Args:
+        params: parametry symulacji (domyślnie SimulationParams())
+        periods_per_year: rozdzielczość decyzji (12 = miesiące, 1 = lata jak run_all_scenarios)
+        optimize_down_payment: False = cały kapitał jako wkład (jak w modelu);
+                               True = dowolny wkład od min_down_payment * cena do min(kapitał, cena)
+        min_down_payment: minimalny wkład jako ułamek ceny (np. 0.2 = 20%) przy optimize_down_payment
+        mortgage_terms: dopuszczalne okresy kredytu w latach (None = tylko params.mortgage_term_years)
+        runners_up: ile kolejnych najlepszych okresów zakupu zwrócić
+
+    Returns:
+        TimingResult z najlepszym planem i stratą kolejnych planów względem niego
+    """
+    if params is None:
+        params = SimulationParams()
+    terms = sorted(set(mortgage_terms)) if mortgage_terms else [params.mortgage_term_years]
+    # monotoniczność w okresie kredytu - wystarczą skrajne wartości
+    term_candidates = [terms[0], terms[-1]] if len(terms) > 1 else terms
+
+    periods = total_periods(params, periods_per_year)
+    best_per_period: List[PurchasePlan] = []
+    evaluations = 0
+    for purchase_period in range(periods):
+        if optimize_down_payment:
+            bounds = _down_payment_bounds(params, purchase_period, periods_per_year, min_down_payment)
+            if bounds is None:
+                continue
+            # liniowość w wkładzie własnym - wystarczą końce przedziału
+            down_payments = [bounds[0], bounds[1]]
+        else:
+            down_payments = [None]
+        candidates = [plan_net_worth(params, purchase_period, periods_per_year, down_payment, term)
+                      for down_payment in down_payments for term in term_candidates]
+        evaluations += len(candidates)
+        best_per_period.append(max(candidates, key=lambda plan: plan.net_worth))
+    best_per_period.append(plan_net_worth(params, periods, periods_per_year))  # tylko wynajem
+    evaluations += 1
+
+    ranked = heapq.nlargest(runners_up + 1, best_per_period, key=lambda plan: plan.net_worth)
+    best = ranked[0]
+    return TimingResult(best, [(plan, best.net_worth - plan.net_worth) for plan in ranked[1:]], evaluations)
+
+
+def exhaustive_search(params: SimulationParams, periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
+                      down_payment_steps: int = 1, min_down_payment: float = 0.0,
+                      mortgage_terms: Optional[Sequence[int]] = None) -> PurchasePlan:
+    """
+    Pełne przeszukiwanie pętlą simulate_purchase_plan - punkt odniesienia dla optimize_purchase_timing.
+
+    Args:
+        down_payment_steps: liczba punktów siatki wkładu własnego (1 = cały kapitał jak w modelu)
+        pozostałe jak w optimize_purchase_timing
+    """
+    terms = list(mortgage_terms) if mortgage_terms else [params.mortgage_term_years]
+    periods = total_periods(params, periods_per_year)
+    best: Optional[PurchasePlan] = None
+    for purchase_period in range(periods + 1):
+        if purchase_period == periods or down_payment_steps == 1:
+            down_payments = [None]
+        else:
+            bounds = _down_payment_bounds(params, purchase_period, periods_per_year, min_down_payment)
+            if bounds is None:
+                continue
+            lower, upper = bounds
+            down_payments = [lower + (upper - lower) * i / (down_payment_steps - 1) for i in range(down_payment_steps)]
+        for down_payment in down_payments:
+            for term in terms:
+                net_worth = simulate_purchase_plan(params, purchase_period, periods_per_year, down_payment, term)
+                if best is None or net_worth > best.net_worth:
+                    best = PurchasePlan(purchase_period, periods_per_year, purchase_period < periods,
+                                        down_payment or 0.0, term, 0.0, 0.0, net_worth)
+    return best
+
+
+def describe_plan(plan: PurchasePlan) -> str:
+    """Opis planu po polsku"""
+    if not plan.buys:
+        return "Tylko wynajem"
+    years, period = plan.purchase_year_and_period
+    when = f"rok {years}, miesiąc {period + 1}" if plan.periods_per_year == 12 else f"rok {years}, okres {period + 1}"
+    return (f"Zakup: {when}, wkład własny {plan.down_payment:,.0f} zł, kredyt {plan.loan_amount:,.0f} zł "
+            f"na {plan.mortgage_term_years} lat")
+
+
+def print_timing_result(result: TimingResult):
+    """Wyświetla najlepszy plan i kolejne warianty"""
+    print("=" * 80)
+    print("OPTYMALNY MOMENT ZAKUPU")
+    print("=" * 80)
+    print(f"{describe_plan(result.best)}")
+    print(f"Majątek końcowy: {result.best.net_worth:,.2f} zł")
+    print(f"\nKolejne warianty (strata względem najlepszego):")
+    for plan, gap in result.runners_up:
+        print(f"  - {describe_plan(plan)}: {plan.net_worth:,.2f} zł (-{gap:,.2f} zł)")
+    print(f"\nLiczba wyliczeń wzorów zamkniętych: {result.evaluations:,}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Optymalny miesiąc zakupu nieruchomości")
+    parser.add_argument('--years', type=int, default=None, help="horyzont w latach (domyślnie N_YEARS)")
+    parser.add_argument('--periods-per-year', type=int, default=DEFAULT_PERIODS_PER_YEAR,
+                        help="rozdzielczość (12 = miesiące)")
+    parser.add_argument('--optimize-down-payment', action='store_true', help="optymalizuj też wkład własny")
+    parser.add_argument('--min-down-payment', type=float, default=0.0, help="minimalny wkład (ułamek ceny)")
+    parser.add_argument('--terms', type=int, nargs=2, metavar=('MIN', 'MAX'),
+                        help="dopuszczalne okresy kredytu w latach (od-do)")
+    args = parser.parse_args()
+
+    params = SimulationParams() if args.years is None else SimulationParams(n_years=args.years)
+    terms = range(args.terms[0], args.terms[1] + 1) if args.terms else None
+    print_timing_result(optimize_purchase_timing(params, args.periods_per_year, args.optimize_down_payment,
+                                                 args.min_down_payment, terms))
@@ -26,8 +26,17 @@ Założenia:
 - Raty kredytu: równe (annuity), płatne rocznie
 """
 
+import inspect
+import math
 from dataclasses import dataclass
-from typing import List
+from functools import cached_property
+from typing import Iterator, Optional
+
+import profiling
+import reporters
+from amortization import amortization_schedule
+from result_cache import ResultCache, source_fingerprint
+from result_table import ResultTable
 
 # Parametry globalne symulacji
 N_YEARS = 10 # długość rozpatrywanego okresu (lata)
@@ -41,11 +50,57 @@ OWNING_COST = 0.01  # 1% wartości nieruchomości rocznie, roczny koszt posiadan
 RENTING_COST = 36_000.0 # roczny koszt wynajmu wraz z opłatami
 REAL_ESTATE_PRICE_CHANGE = 0.04  # 4% roczna zmiana cen nieruchomości i czynszu (%)
 
+# Wersja kodu modelu dla trwałej pamięci podręcznej (zmiana źródeł unieważnia zapisane wyniki)
+MODEL_NAME = 'main'
+MODEL_VERSION = source_fingerprint(__file__, inspect.getfile(amortization_schedule))
+
+
+@dataclass(frozen=True)
+class SimulationParams:
+    """
+    Parametry symulacji jako niezmienny (frozen) i hashowalny obiekt.
+    
+    Domyślne wartości to zmienne globalne z góry pliku. Każdy zestaw parametrów
+    jest osobnym obiektem, więc wiele gospodarstw domowych można liczyć
+    równolegle (wątki, jeden proces roboczy) bez podmieniania zmiennych
+    globalnych, a wyniki można zapamiętywać w słowniku po kluczu params.
+    Wielkości pochodne są liczone raz na obiekt (cached_property).
+    """
+    n_years: int = N_YEARS  # długość rozpatrywanego okresu (lata)
+    initial_capital: float = INITIAL_CAPITAL  # kapitał jakim dysponujemy na początku
+    savings: float = SAVINGS  # roczny dochód po odjęciu kosztów życia
+    deposit_interest_rate: float = DEPOSIT_INTEREST_RATE  # oprocentowanie na lokacie
+    property_price: float = PROPERTY_PRICE  # cena nieruchomości
+    lending_rate: float = LENDING_RATE  # oprocentowanie kredytu hipotecznego
+    mortgage_term_years: int = MORTGAGE_TERM_YEARS  # okres kredytu w latach
+    owning_cost: float = OWNING_COST  # roczny koszt posiadania nieruchomości (% wartości)
+    renting_cost: float = RENTING_COST  # roczny koszt wynajmu wraz z opłatami
+    real_estate_price_change: float = REAL_ESTATE_PRICE_CHANGE  # roczna zmiana cen nieruchomości i czynszu
+
+    @cached_property
+    def price_growth(self) -> float:
+        """Roczny mnożnik cen nieruchomości i czynszu"""
+        return 1 + self.real_estate_price_change
+
+    @cached_property
+    def deposit_growth(self) -> float:
+        """Roczny mnożnik kapitału na lokacie"""
+        return 1 + self.deposit_interest_rate
+
+    @cached_property
+    def purchase_years(self) -> range:
+        """Wszystkie scenariusze: zakup w latach 0..n_years oraz n_years+1 = tylko wynajem"""
+        return range(self.n_years + 2)
+
 
 @dataclass
 class SimulationResult:
     """Wynik symulacji dla danego roku zakupu"""
-    purchase_year: int  # 0 = od razu, N_YEARS+1 = nigdy
+    # __slots__ zamiast __dict__ - kilkukrotnie mniej pamięci na obiekt (pola nie mają wartości domyślnych)
+    __slots__ = ('purchase_year', 'net_worth', 'property_value', 'investment', 'remaining_mortgage',
+                 'total_paid_rent', 'total_paid_mortgage', 'total_paid_owning_costs',
+                 'monthly_mortgage_payment', 'loan_amount')
+    purchase_year: int  # 0 = od razu, n_years+1 = nigdy
     net_worth: float  # końcowy majątek
     property_value: float  # wartość nieruchomości (0 jeśli nie kupiono)
     investment: float  # kapitał na lokacie
@@ -81,45 +136,108 @@ def annual_payment(principal: float, annual_rate: float, years: int) -> float:
     return payment
 
 
-def simulate_purchase_year(purchase_year: int) -> SimulationResult:
+@dataclass
+class SimulationState:
     """
-    Symuluje scenariusz zakupu nieruchomości w danym roku.
+    Stan symulacji na granicy lat (przed rokiem `year`).
+    
+    Stan można zapisać i rozgałęzić (fork) - np. wszystkie scenariusze zakupu
+    zaczynają się od tej samej fazy wynajmu, więc zamiast powtarzać ją dla
+    każdego roku zakupu liczymy ją raz, a w roku zakupu odgałęziamy kopię.
+    Z kopii można też liczyć warianty "co jeśli" (inne parametry od danego roku).
+    """
+    __slots__ = ('year', 'investment', 'property_value', 'remaining_mortgage', 'current_rent',
+                 'total_paid_rent', 'total_paid_mortgage', 'total_paid_owning_costs',
+                 'mortgage_schedule', 'mortgage_years_remaining', 'monthly_mortgage_payment', 'loan_amount')
+    year: int  # następny rok do zasymulowania
+    investment: float  # kapitał na lokacie
+    property_value: float  # wartość posiadanej nieruchomości (0 = wynajmujemy)
+    remaining_mortgage: float  # pozostały kredyt do spłaty
+    current_rent: float  # aktualny czynsz
+    total_paid_rent: float  # łączna suma zapłaconego czynszu
+    total_paid_mortgage: float  # łączna suma spłaconych rat kredytu
+    total_paid_owning_costs: float  # łączna suma kosztów posiadania nieruchomości
+    mortgage_schedule: object  # harmonogram spłaty kredytu (None przed zakupem)
+    mortgage_years_remaining: int  # pozostałe lata kredytu
+    monthly_mortgage_payment: float  # miesięczna rata kredytu
+    loan_amount: float  # początkowa kwota kredytu
+    
+    @classmethod
+    def initial(cls, params: SimulationParams) -> 'SimulationState':
+        """Stan na początku roku 0: cały kapitał na lokacie, wynajmujemy"""
+        return cls(0, params.initial_capital, 0.0, 0.0, params.renting_cost,
+                   0.0, 0.0, 0.0, None, 0, 0.0, 0.0)
+    
+    def fork(self) -> 'SimulationState':
+        """Niezależna kopia stanu (harmonogram kredytu jest niezmienny, więc jest współdzielony)"""
+        return SimulationState(self.year, self.investment, self.property_value, self.remaining_mortgage,
+                               self.current_rent, self.total_paid_rent, self.total_paid_mortgage,
+                               self.total_paid_owning_costs, self.mortgage_schedule,
+                               self.mortgage_years_remaining, self.monthly_mortgage_payment, self.loan_amount)
+    
+    def to_result(self, purchase_year: int) -> SimulationResult:
+        """Wynik scenariusza ze stanu (zwykle po ostatnim roku)"""
+        return SimulationResult(
+            purchase_year=purchase_year,
+            net_worth=self.property_value + self.investment - self.remaining_mortgage,
+            property_value=self.property_value,
+            investment=self.investment,
+            remaining_mortgage=self.remaining_mortgage,
+            total_paid_rent=self.total_paid_rent,
+            total_paid_mortgage=self.total_paid_mortgage,
+            total_paid_owning_costs=self.total_paid_owning_costs,
+            monthly_mortgage_payment=self.monthly_mortgage_payment,
+            loan_amount=self.loan_amount
+        )
+
+
+@profiling.instrumented
+def advance(state: SimulationState, params: SimulationParams, purchase_year: int, end_year: int) -> SimulationState:
+    """
+    Symuluje lata state.year .. end_year-1 scenariusza zakupu w roku purchase_year.
+    
+    Zmienia i zwraca `state` (żeby zachować stan sprzed kroku, użyj state.fork()).
     
     Args:
-        purchase_year: rok zakupu 
-                      0 = od razu (na początku)
-                      1 do N_YEARS = zakup w tym roku
-                      N_YEARS+1 = nigdy nie kupujemy
+        state: stan na początku roku state.year
+        params: parametry symulacji dla tych lat
+        purchase_year: rok zakupu (0 = od razu, n_years+1 = nigdy)
+        end_year: rok, przed którym się zatrzymujemy (n_years+1 = do końca okresu)
     
     Returns:
-        SimulationResult z wynikami symulacji
+        state po roku end_year-1
     """
-    # Inicjalizacja zmiennych
-    investment = INITIAL_CAPITAL  # kapitał na lokacie
-    property_value = 0.0  # wartość posiadanej nieruchomości
-    remaining_mortgage = 0.0  # pozostały kredyt do spłaty
-    current_rent = RENTING_COST  # aktualny czynsz
+    # Stan do zmiennych lokalnych (szybszy dostęp w pętli)
+    investment = state.investment  # kapitał na lokacie
+    property_value = state.property_value  # wartość posiadanej nieruchomości
+    remaining_mortgage = state.remaining_mortgage  # pozostały kredyt do spłaty
+    current_rent = state.current_rent  # aktualny czynsz
     
     # Zmienne do śledzenia sum
-    total_paid_rent = 0.0 # łączna suma zapłaconego czynszu
-    total_paid_mortgage = 0.0 # łączna suma spłaconych rat kredytu
-    total_paid_owning_costs = 0.0 # łączna suma kosztów posiadania nieruchomości
-
-    # Informacje o kredycie (będą ustawione w momencie zakupu)
-    annual_mortgage_payment = 0.0 # roczna rata kredytu
-    monthly_mortgage_payment = 0.0 # miesięczna rata kredytu
-    mortgage_years_remaining = 0 # pozostałe lata kredytu
-    loan_amount = 0.0 # początkowa kwota kredytu
-    
-    # Symulacja rok po roku (od roku 0 do roku N_YEARS włącznie)
-    for year in range(N_YEARS + 1):
+    total_paid_rent = state.total_paid_rent # łączna suma zapłaconego czynszu
+    total_paid_mortgage = state.total_paid_mortgage # łączna suma spłaconych rat kredytu
+    total_paid_owning_costs = state.total_paid_owning_costs # łączna suma kosztów posiadania nieruchomości
+
+    # Informacje o kredycie (ustawiane w momencie zakupu)
+    mortgage_schedule = state.mortgage_schedule # harmonogram spłaty kredytu (ze wspólnej pamięci podręcznej)
+    monthly_mortgage_payment = state.monthly_mortgage_payment # miesięczna rata kredytu
+    mortgage_years_remaining = state.mortgage_years_remaining # pozostałe lata kredytu
+    loan_amount = state.loan_amount # początkowa kwota kredytu
+
+    # Pomiary faz pętli (bloki `if profiler` istnieją tylko w wersji profilowanej, patrz profiling.py)
+    profiler = profiling.current()
+    
+    # Symulacja rok po roku
+    for year in range(state.year, end_year):
+        if profiler is not None:
+            phase_start = profiler.now()
         purchased_this_year = False  # Flaga: czy kupiliśmy w tym roku
         
         # Sprawdzamy czy to rok zakupu (i czy jeszcze nie kupiliśmy)
         if year == purchase_year and property_value == 0:
             # ZAKUP NIERUCHOMOŚCI
             # Cena nieruchomości rośnie wraz z rynkiem - w roku Y kosztuje więcej, im później kupujemy tym drosza
-            current_property_price = PROPERTY_PRICE * (1 + REAL_ESTATE_PRICE_CHANGE) ** year
+            current_property_price = params.property_price * params.price_growth ** year
             
             # Jeśli mamy więcej kapitału niż cena nieruchomości, płacimy tylko cenę, reszta zostaje na lokacie
             down_payment = min(investment, current_property_price)  # wkład własny = min(kapitał, cena)
@@ -127,22 +245,27 @@ def simulate_purchase_year(purchase_year: int) -> SimulationResult:
             
             # Ustawiamy parametry kredytu
             remaining_mortgage = loan_amount # pozostały kredyt
-            mortgage_years_remaining = MORTGAGE_TERM_YEARS # pozostałe lata kredytu
-            annual_mortgage_payment = annual_payment(loan_amount, LENDING_RATE, MORTGAGE_TERM_YEARS) # roczna rata kredytu
+            mortgage_years_remaining = params.mortgage_term_years # pozostałe lata kredytu
+            mortgage_schedule = amortization_schedule(loan_amount, params.lending_rate, params.mortgage_term_years) # podział rat na odsetki i kapitał
+            annual_mortgage_payment = mortgage_schedule.payment # roczna rata kredytu
             monthly_mortgage_payment = annual_mortgage_payment / 12.0 # miesięczna rata kredytu, uwzględnia ZARÓWNO odsetki JAK I kapitał
             
             # Kupujemy nieruchomość
             property_value = current_property_price # cena nieruchomości w roku zakupu
             investment = investment - down_payment  # nadwyżka kapitału zostaje na lokacie (może być 0), przypadek brzegowy gdy kupujemy od razu bez kredytu
             purchased_this_year = True  # Oznaczamy że kupiliśmy w tym roku
+            if profiler is not None:
+                phase_start = profiler.lap('simulate_purchase_year: zakup', phase_start)
         
         # Aprecjacja/wzrost wartości nieruchomości i czynszu na początku roku
         # NIE aplikujemy aprecjacji w roku zakupu (już uwzględniona w cenie rynkowej)
         if year > 0:
             # jeśli posiadamy nieruchomość (została nabyta) i NIE kupiliśmy jej w tym roku
             if property_value > 0 and not purchased_this_year:
-                property_value *= (1 + REAL_ESTATE_PRICE_CHANGE) # Nieruchomość rośnie 4% rocznie
-            current_rent *= (1 + REAL_ESTATE_PRICE_CHANGE) # Czynsz rośnie 4% rocznie
+                property_value *= params.price_growth # Nieruchomość rośnie 4% rocznie
+            current_rent *= params.price_growth # Czynsz rośnie 4% rocznie
+        if profiler is not None:
+            phase_start = profiler.lap('simulate_purchase_year: aprecjacja', phase_start)
         
         # Obliczanie wydatków w tym roku
         yearly_expenses = 0.0
@@ -150,19 +273,17 @@ def simulate_purchase_year(purchase_year: int) -> SimulationResult:
         # Jeśli posiadamy nieruchomość, płacimy koszty posiadania i ratę kredytu
         if property_value > 0:
             # WŁAŚCICIEL - płacimy kredyt i koszty posiadania
-            owning_cost_this_year = property_value * OWNING_COST # Koszt utrzymania nieruchomości
+            owning_cost_this_year = property_value * params.owning_cost # Koszt utrzymania nieruchomości
             
             # Spłata kredytu
             if remaining_mortgage > 0 and mortgage_years_remaining > 0:
-                # Odsetki za ten rok
-                yearly_interest = remaining_mortgage * LENDING_RATE 
+                # Który to rok spłaty kredytu (0 = pierwsza rata)
+                mortgage_period = params.mortgage_term_years - mortgage_years_remaining
 
                 # Rzeczywista płatność do banku w tym roku (nie więcej niż dług/kapitał + odsetki)
-                actual_payment = min(annual_mortgage_payment, remaining_mortgage + yearly_interest)
-                
-                # Kapitał spłacony w tym roku
-                principal_paid = actual_payment - yearly_interest
-                remaining_mortgage = max(0.0, remaining_mortgage - principal_paid) # aktualizacja pozostałego kredytu
+                # i saldo po jej zapłacie - odczytane z harmonogramu spłaty
+                actual_payment = mortgage_schedule.payments[mortgage_period]
+                remaining_mortgage = mortgage_schedule.balance[mortgage_period] # aktualizacja pozostałego kredytu
                 # Zmniejszamy liczbę pozostałych lat kredytu
                 mortgage_years_remaining -= 1
                 
@@ -177,43 +298,258 @@ def simulate_purchase_year(purchase_year: int) -> SimulationResult:
             # NAJEMCA - płacimy czynsz
             yearly_expenses = current_rent # Roczny czynsz najmu
             total_paid_rent += current_rent # łączna suma zapłaconego czynszu
+        if profiler is not None:
+            phase_start = profiler.lap('simulate_purchase_year: kredyt i wydatki', phase_start)
         
         # Kapitalizacja lokaty
-        investment *= (1 + DEPOSIT_INTEREST_RATE) # Lokata rośnie 8% rocznie
+        investment *= params.deposit_growth # Lokata rośnie 8% rocznie
 
         # ile na plusie rocznie, Dodajemy oszczędności minus wydatki
-        yearly_surplus = SAVINGS - yearly_expenses # Oszczędności roczne (dochód) - wydatki
+        yearly_surplus = params.savings - yearly_expenses # Oszczędności roczne (dochód) - wydatki
         investment += yearly_surplus # aktualizacja kapitału na lokacie
+        if profiler is not None:
+            profiler.lap('simulate_purchase_year: lokata', phase_start)
+    
+    # Zmienne lokalne z powrotem do stanu
+    state.year = max(state.year, end_year)
+    state.investment = investment
+    state.property_value = property_value
+    state.remaining_mortgage = remaining_mortgage
+    state.current_rent = current_rent
+    state.total_paid_rent = total_paid_rent
+    state.total_paid_mortgage = total_paid_mortgage
+    state.total_paid_owning_costs = total_paid_owning_costs
+    state.mortgage_schedule = mortgage_schedule
+    state.mortgage_years_remaining = mortgage_years_remaining
+    state.monthly_mortgage_payment = monthly_mortgage_payment
+    state.loan_amount = loan_amount
+    return state
+
+
+@profiling.instrumented
+def simulate_purchase_year(purchase_year: int, params: Optional[SimulationParams] = None) -> SimulationResult:
+    """
+    Symuluje scenariusz zakupu nieruchomości w danym roku.
+    
+    Args:
+        purchase_year: rok zakupu 
+                      0 = od razu (na początku)
+                      1 do n_years = zakup w tym roku
+                      n_years+1 = nigdy nie kupujemy
+        params: parametry symulacji (domyślnie SimulationParams())
+    
+    Returns:
+        SimulationResult z wynikami symulacji
+    """
+    if params is None:
+        params = SimulationParams()
+    
+    # Symulacja rok po roku (od roku 0 do roku n_years włącznie)
+    state = advance(SimulationState.initial(params), params, purchase_year, params.n_years + 1)
     
     # Końcowy majątek = wartość nieruchomości + kapitał - pozostały kredyt
-    net_worth = property_value + investment - remaining_mortgage
+    return state.to_result(purchase_year)
+
+
+def growth_sum(rate: float, periods: int) -> float:
+    """
+    Suma szeregu geometrycznego: 1 + (1+r) + (1+r)^2 + ... + (1+r)^(n-1).
+    
+    Liczona przez expm1/log1p, żeby nie tracić dokładności dla stóp bliskich zeru.
+    
+    Args:
+        rate: stopa wzrostu na okres
+        periods: liczba wyrazów szeregu
+    
+    Returns:
+        suma szeregu (0 dla periods <= 0)
+    """
+    if periods <= 0:
+        return 0.0
+    if rate == 0:
+        return float(periods)
+    return math.expm1(periods * math.log1p(rate)) / rate
+
+
+def cross_growth_sum(flow_rate: float, compound_rate: float, periods: int) -> float:
+    """
+    Wartość przyszła strumienia rosnącego o flow_rate, kapitalizowanego o compound_rate.
+    
+    Suma po y = 0..n-1 wyrazów (1+flow_rate)^y * (1+compound_rate)^(n-1-y), czyli
+    ile będzie wart na koniec okresu strumień płatności 1, (1+g), (1+g)^2, ...
+    wpłacanych na lokatę na koniec kolejnych okresów.
+    
+    Args:
+        flow_rate: stopa wzrostu płatności (np. wzrost czynszu)
+        compound_rate: stopa kapitalizacji (np. oprocentowanie lokaty)
+        periods: liczba płatności
+    
+    Returns:
+        wartość przyszła strumienia na koniec ostatniego okresu
+    """
+    if periods <= 0:
+        return 0.0
+    ratio_rate = (flow_rate - compound_rate) / (1 + compound_rate)
+    return (1 + compound_rate) ** (periods - 1) * growth_sum(ratio_rate, periods)
+
+
+def growth_sum_batch(np, rate, periods):
+    """Wektorowa wersja growth_sum (numpy przekazywany jako argument; rate i periods mogą być tablicami)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = np.expm1(periods * np.log1p(rate)) / rate
+    return np.where(periods <= 0, 0.0, np.where(rate == 0, periods, value))
+
+
+def cross_growth_sum_batch(np, flow_rate, compound_rate, periods):
+    """Wektorowa wersja cross_growth_sum"""
+    ratio_rate = (flow_rate - compound_rate) / (1 + compound_rate)
+    return (1 + compound_rate) ** (periods - 1.0) * growth_sum_batch(np, ratio_rate, periods)
+
+
+def simulate_purchase_year_closed_form(purchase_year: int, params: Optional[SimulationParams] = None) -> SimulationResult:
+    """
+    Analityczna (O(1)) wersja simulate_purchase_year.
+    
+    Wszystkie wielkości z pętli rok po roku to szeregi geometryczne: czynsz
+    i wartość nieruchomości rosną o (1 + real_estate_price_change), lokata
+    kapitalizuje się o deposit_interest_rate, a saldo kredytu annuitetowego
+    ma znaną postać zamkniętą. Zamiast iterować po latach liczymy wynik
+    bezpośrednio ze wzorów, z tymi samymi przypadkami brzegowymi co pętla:
+    - zakup za gotówkę, gdy kapitał przekracza cenę (kredyt = 0),
+    - ostatnia rata ograniczona przez min(rata, dług + odsetki),
+    - kredyt spłacony przed końcem okresu symulacji.
+    
+    Wynik zgadza się z simulate_purchase_year z dokładnością do błędów
+    zaokrągleń arytmetyki zmiennoprzecinkowej.
+    
+    Args:
+        purchase_year: rok zakupu (0 = od razu, n_years+1 = nigdy)
+        params: parametry symulacji (domyślnie SimulationParams())
+    
+    Returns:
+        SimulationResult z wynikami symulacji
+    """
+    if params is None:
+        params = SimulationParams()
+    g = params.real_estate_price_change
+    d = params.deposit_interest_rate
+    buys = purchase_year <= params.n_years
+    if buys and params.property_price * (1 + g) ** purchase_year <= 0:
+        # Nieruchomość o zerowej cenie - pętla traktuje ją jak brak zakupu, nie ma sensu tego powielać
+        return simulate_purchase_year(purchase_year, params)
+    
+    # FAZA WYNAJMU: lata 0 .. rent_years-1
+    rent_years = purchase_year if buys else params.n_years + 1
+    investment = (params.initial_capital * (1 + d) ** rent_years
+                  + params.savings * growth_sum(d, rent_years)
+                  - params.renting_cost * cross_growth_sum(g, d, rent_years))
+    total_paid_rent = params.renting_cost * growth_sum(g, rent_years)
+    
+    if not buys:
+        return SimulationResult(
+            purchase_year=purchase_year,
+            net_worth=investment,
+            property_value=0.0,
+            investment=investment,
+            remaining_mortgage=0.0,
+            total_paid_rent=total_paid_rent,
+            total_paid_mortgage=0.0,
+            total_paid_owning_costs=0.0,
+            monthly_mortgage_payment=0.0,
+            loan_amount=0.0
+        )
+    return _buy_closed_form(purchase_year, params, investment, total_paid_rent)
+
 
-    # Zwracamy wyniki symulacji
+def finish_closed_form(state: SimulationState, params: SimulationParams, purchase_year: int) -> SimulationResult:
+    """
+    Wynik scenariusza odgałęzionego od stanu w roku zakupu - faza posiadania ze wzorów zamkniętych, O(1).
+    
+    Args:
+        state: stan na początku roku purchase_year (dotąd tylko wynajem), np. fork()
+               wspólnej fazy wynajmu
+        params: parametry symulacji od roku zakupu
+        purchase_year: rok zakupu (równy state.year; n_years+1 = nigdy - wynik to sam stan)
+    
+    Returns:
+        SimulationResult (zgodny z advance() do błędów zaokrągleń)
+    """
+    if state.year != purchase_year or state.property_value != 0:
+        raise ValueError("finish_closed_form() wymaga stanu z początku roku zakupu, przed zakupem")
+    if purchase_year > params.n_years:
+        return state.to_result(purchase_year)
+    if params.property_price * (1 + params.real_estate_price_change) ** purchase_year <= 0:
+        return advance(state.fork(), params, purchase_year, params.n_years + 1).to_result(purchase_year)
+    return _buy_closed_form(purchase_year, params, state.investment, state.total_paid_rent)
+
+
+def _buy_closed_form(purchase_year: int, params: SimulationParams, investment: float,
+                     total_paid_rent: float) -> SimulationResult:
+    """Zakup w roku purchase_year i faza posiadania ze wzorów zamkniętych (kapitał i czynsz z fazy wynajmu)."""
+    g = params.real_estate_price_change
+    d = params.deposit_interest_rate
+    current_property_price = params.property_price * (1 + g) ** purchase_year
+    
+    # ZAKUP NIERUCHOMOŚCI (te same reguły co w pętli)
+    down_payment = min(investment, current_property_price)
+    loan_amount = max(0.0, current_property_price - down_payment)
+    investment = investment - down_payment
+    annual_mortgage_payment = annual_payment(loan_amount, params.lending_rate, params.mortgage_term_years)
+    
+    # FAZA POSIADANIA: lata purchase_year .. n_years
+    owning_years = params.n_years - purchase_year + 1
+    payments_count = min(params.mortgage_term_years, owning_years) if loan_amount > 0 else 0
+    
+    remaining_mortgage = 0.0
+    total_paid_mortgage = 0.0
+    payments_future_value = 0.0  # wartość wszystkich rat na koniec okresu (gdyby zostały na lokacie)
+    if payments_count > 0:
+        # Saldo przed ostatnią ratą w horyzoncie: B_j = K(1+r)^j - R * [(1+r)^j - 1] / r
+        full_payments = payments_count - 1
+        balance = (loan_amount * (1 + params.lending_rate) ** full_payments
+                   - annual_mortgage_payment * growth_sum(params.lending_rate, full_payments))
+        # Ostatnia rata - jak w pętli, nie więcej niż dług + odsetki
+        yearly_interest = balance * params.lending_rate
+        last_payment = min(annual_mortgage_payment, balance + yearly_interest)
+        remaining_mortgage = max(0.0, balance - (last_payment - yearly_interest))
+        total_paid_mortgage = annual_mortgage_payment * full_payments + last_payment
+        payments_future_value = (1 + d) ** (owning_years - payments_count) * (
+            annual_mortgage_payment * growth_sum(d, full_payments) * (1 + d) + last_payment)
+    
+    investment = (investment * (1 + d) ** owning_years
+                  + params.savings * growth_sum(d, owning_years)
+                  - current_property_price * params.owning_cost * cross_growth_sum(g, d, owning_years)
+                  - payments_future_value)
+    property_value = current_property_price * (1 + g) ** (owning_years - 1)
+    
     return SimulationResult(
         purchase_year=purchase_year,
-        net_worth=net_worth,
+        net_worth=property_value + investment - remaining_mortgage,
         property_value=property_value,
         investment=investment,
         remaining_mortgage=remaining_mortgage,
         total_paid_rent=total_paid_rent,
         total_paid_mortgage=total_paid_mortgage,
-        total_paid_owning_costs=total_paid_owning_costs,
-        monthly_mortgage_payment=monthly_mortgage_payment,
+        total_paid_owning_costs=current_property_price * params.owning_cost * growth_sum(g, owning_years),
+        monthly_mortgage_payment=annual_mortgage_payment / 12.0,
         loan_amount=loan_amount
     )
 
 
-def get_scenario_name(purchase_year: int) -> str:
+def get_scenario_name(purchase_year: int, params: Optional[SimulationParams] = None) -> str:
     """
     Zwraca nazwę scenariusza w zależności od roku zakupu.
     
     Args:
-        purchase_year: rok zakupu (0 = od razu, N_YEARS+1 = nigdy)
+        purchase_year: rok zakupu (0 = od razu, n_years+1 = nigdy)
+        params: parametry symulacji (domyślnie SimulationParams())
     
     Returns:
         nazwa scenariusza
     """
-    if purchase_year > N_YEARS:
+    if params is None:
+        params = SimulationParams()
+    if purchase_year > params.n_years:
         return "TYLKO WYNAJEM (nigdy nie kupujemy)"
     elif purchase_year == 0:
         return "Zakup mieszkania OD RAZU (rok 0)"
@@ -221,106 +557,254 @@ def get_scenario_name(purchase_year: int) -> str:
         return f"Zakup mieszkania w roku {purchase_year}"
 
 
-def print_simulation_header():
-    """Wyświetla nagłówek i parametry symulacji"""
-    print("=" * 80)
-    print("SYMULACJA ZAKUPU VS WYNAJMU NIERUCHOMOŚCI")
-    print("=" * 80)
-    print(f"\nParametry symulacji:")
-    print(f"  Okres symulacji: {N_YEARS} lat")
-    print(f"  Kapitał początkowy: {INITIAL_CAPITAL:,.0f} zł")
-    print(f"  Roczne oszczędności: {SAVINGS:,.0f} zł")
-    print(f"  Oprocentowanie lokaty: {DEPOSIT_INTEREST_RATE:.1%}")
-    print(f"  Cena nieruchomości: {PROPERTY_PRICE:,.0f} zł")
-    print(f"  Oprocentowanie kredytu: {LENDING_RATE:.1%}")
-    print(f"  Koszt utrzymania posiadanej nieruchomości: {OWNING_COST:.1%} wartości rocznie")
-    print(f"  Roczny czynsz wynajmu: {RENTING_COST:,.0f} zł")
-    print(f"  Wzrost cen/czynszu: {REAL_ESTATE_PRICE_CHANGE:.1%} rocznie")
-    print()
-    print(f"  Okres kredytu: {MORTGAGE_TERM_YEARS} lat")
-    print("\n" + "=" * 80)
-
-
-def print_scenario_details(result: SimulationResult):
+@profiling.instrumented
+def format_simulation_header(params: SimulationParams) -> str:
+    """Nagłówek i parametry symulacji (tekst raportu)"""
+    line = "=" * 80
+    return (f"{line}\nSYMULACJA ZAKUPU VS WYNAJMU NIERUCHOMOŚCI\n{line}\n"
+            f"\nParametry symulacji:\n"
+            f"  Okres symulacji: {params.n_years} lat\n"
+            f"  Kapitał początkowy: {params.initial_capital:,.0f} zł\n"
+            f"  Roczne oszczędności: {params.savings:,.0f} zł\n"
+            f"  Oprocentowanie lokaty: {params.deposit_interest_rate:.1%}\n"
+            f"  Cena nieruchomości: {params.property_price:,.0f} zł\n"
+            f"  Oprocentowanie kredytu: {params.lending_rate:.1%}\n"
+            f"  Koszt utrzymania posiadanej nieruchomości: {params.owning_cost:.1%} wartości rocznie\n"
+            f"  Roczny czynsz wynajmu: {params.renting_cost:,.0f} zł\n"
+            f"  Wzrost cen/czynszu: {params.real_estate_price_change:.1%} rocznie\n"
+            f"\n"
+            f"  Okres kredytu: {params.mortgage_term_years} lat\n"
+            f"\n{line}\n")
+
+
+def format_results_title(params: SimulationParams) -> str:
+    """Tytuł listy scenariuszy (tekst raportu)"""
+    return f"\nWYNIKI SYMULACJI dla okresu {params.n_years} lat:\n{'-' * 80}\n"
+
+
+@profiling.instrumented
+def format_scenario_details(result: SimulationResult, params: SimulationParams) -> str:
     """
-    Wyświetla szczegóły wyników symulacji dla danego scenariusza.
+    Szczegóły wyników symulacji dla danego scenariusza (tekst raportu).
     
     Args:
-        result: wynik symulacji do wyświetlenia
-    """
-    scenario_name = get_scenario_name(result.purchase_year)
-    
-    print(f"\n{scenario_name}:")
+        result: wynik symulacji (SimulationResult albo wiersz ResultTable)
+        params: parametry symulacji
     
-    print(f"  Majątek końcowy: {result.net_worth:,.2f} zł")
-    print(f"    - Wartość nieruchomości: {result.property_value:,.2f} zł")
-    print(f"    - Kapitał na lokacie: {result.investment:,.2f} zł")
-    print(f"    - Pozostały kredyt: {result.remaining_mortgage:,.2f} zł")
+    Returns:
+        tekst scenariusza (kilka linii zakończonych znakiem nowej linii)
+    """
+    text = (f"\n{get_scenario_name(result.purchase_year, params)}:\n"
+            f"  Majątek końcowy: {result.net_worth:,.2f} zł\n"
+            f"    - Wartość nieruchomości: {result.property_value:,.2f} zł\n"
+            f"    - Kapitał na lokacie: {result.investment:,.2f} zł\n"
+            f"    - Pozostały kredyt: {result.remaining_mortgage:,.2f} zł\n")
     if result.total_paid_rent > 0:
-        print(f"  Suma zapłaconego czynszu za wynajem: {result.total_paid_rent:,.2f} zł")
+        text += f"  Suma zapłaconego czynszu za wynajem: {result.total_paid_rent:,.2f} zł\n"
     # Informacja o kredycie (jeśli kupiono)
-    if result.purchase_year <= N_YEARS and result.monthly_mortgage_payment > 0:
-        print(f"  Miesięczna rata kredytu: {result.monthly_mortgage_payment:,.2f} zł")
-        print(f"  Kwota kredytu: {result.loan_amount:,.2f} zł")
+    if result.purchase_year <= params.n_years and result.monthly_mortgage_payment > 0:
+        text += (f"  Miesięczna rata kredytu: {result.monthly_mortgage_payment:,.2f} zł\n"
+                 f"  Kwota kredytu: {result.loan_amount:,.2f} zł\n")
     if result.total_paid_mortgage > 0:
-        print(f"  Suma spłaconych rat kredytu: {result.total_paid_mortgage:,.2f} zł")
+        text += f"  Suma spłaconych rat kredytu: {result.total_paid_mortgage:,.2f} zł\n"
     if result.total_paid_owning_costs > 0:
-        print(f"  Suma kosztów utrzymania posiadanej nieruchomości: {result.total_paid_owning_costs:,.2f} zł")
+        text += f"  Suma kosztów utrzymania posiadanej nieruchomości: {result.total_paid_owning_costs:,.2f} zł\n"
+    return text
+
+
+def summarize(best_result: SimulationResult, params: SimulationParams) -> dict:
+    """Podsumowanie raportu (najlepsza strategia) jako słownik - wspólne dla wszystkich formatów"""
+    if best_result.purchase_year > params.n_years:
+        strategy = "TYLKO WYNAJEM"
+    elif best_result.purchase_year == 0:
+        strategy = "Zakup OD RAZU (rok 0)"
+    else:
+        strategy = f"Zakup mieszkania w roku {best_result.purchase_year}"
+    return {'best_purchase_year': best_result.purchase_year, 'best_strategy': strategy,
+            'max_net_worth': best_result.net_worth}
+
+
+@profiling.instrumented
+def format_summary(summary: dict, params: SimulationParams) -> str:
+    """
+    Podsumowanie z najlepszą strategią (tekst raportu).
+    
+    Args:
+        summary: wynik summarize()
+        params: parametry symulacji
+    """
+    line = "=" * 80
+    return (f"\n{line}\nPODSUMOWANIE:\n{line}\n"
+            f"Najlepsza strategia: {summary['best_strategy']}\n"
+            f"Maksymalny majątek końcowy: {summary['max_net_worth']:,.2f} zł\n\n")
+
+
+def print_simulation_header(params: Optional[SimulationParams] = None):
+    """Wyświetla nagłówek i parametry symulacji (domyślnie SimulationParams())"""
+    if params is None:
+        params = SimulationParams()
+    print(format_simulation_header(params), end='')
+
+
+def print_scenario_details(result: SimulationResult, params: Optional[SimulationParams] = None):
+    """
+    Wyświetla szczegóły wyników symulacji dla danego scenariusza.
+    
+    Args:
+        result: wynik symulacji do wyświetlenia
+        params: parametry symulacji (domyślnie SimulationParams())
+    """
+    if params is None:
+        params = SimulationParams()
+    print(format_scenario_details(result, params), end='')
 
 
-def print_summary(best_result: SimulationResult):
+def print_summary(best_result: SimulationResult, params: Optional[SimulationParams] = None):
     """
     Wyświetla podsumowanie z najlepszą strategią.
     
     Args:
         best_result: wynik symulacji z najwyższym majątkiem końcowym
+        params: parametry symulacji (domyślnie SimulationParams())
+    """
+    if params is None:
+        params = SimulationParams()
+    print(format_summary(summarize(best_result, params), params), end='')
+
+
+def make_reporter(output_format: str = 'text', quiet: bool = False, stream=None) -> reporters.Reporter:
     """
-    print("\n" + "=" * 80)
-    print("PODSUMOWANIE:")
-    print("=" * 80)
+    Reporter wyników run_all_scenarios.
     
-    if best_result.purchase_year > N_YEARS:
-        print(f"Najlepsza strategia: TYLKO WYNAJEM")
-    elif best_result.purchase_year == 0:
-        print(f"Najlepsza strategia: Zakup OD RAZU (rok 0)")
-    else:
-        print(f"Najlepsza strategia: Zakup mieszkania w roku {best_result.purchase_year}")
+    Args:
+        output_format: 'text' (raport po polsku), 'jsonl', 'csv' albo 'binary'
+        quiet: tylko parametry i podsumowanie - scenariusze nie są w ogóle formatowane
+        stream: strumień wyjścia (domyślnie sys.stdout)
+    """
+    text_format = reporters.TextFormat(format_simulation_header, format_scenario_details, format_summary,
+                                       format_results_title)
+    return reporters.create_reporter(output_format, text_format, quiet, stream)
+
+
+def branch_purchase_years(params: SimulationParams, closed_form: bool = False) -> Iterator[SimulationResult]:
+    """
+    Wszystkie lata zakupu odgałęzione od jednej wspólnej fazy wynajmu.
+    
+    Scenariusz zakupu w roku k powtarza te same lata wynajmu 0..k-1 co każdy
+    późniejszy scenariusz. Tutaj fazę wynajmu liczymy raz, rok po roku,
+    a w każdym roku k odgałęziamy kopię stanu i liczymy tylko fazę posiadania:
+    - closed_form=False - pętlą (advance), wyniki identyczne jak
+      simulate_purchase_year; (N+1)(N+2)/2 + N+1 kroków rocznych zamiast (N+1)(N+2),
+    - closed_form=True - wzorami zamkniętymi (finish_closed_form), O(1) na
+      scenariusz, więc łącznie liniowo: N+1 kroków wynajmu.
     
-    print(f"Maksymalny majątek końcowy: {best_result.net_worth:,.2f} zł")
+    Args:
+        params: parametry symulacji
+        closed_form: faza posiadania ze wzorów zamkniętych zamiast pętli
     
-    print()
+    Returns:
+        iterator SimulationResult dla lat zakupu 0..n_years+1 (ostatni = tylko wynajem)
+    """
+    never = params.n_years + 1
+    state = SimulationState.initial(params)
+    for year in range(never):
+        if closed_form:
+            yield finish_closed_form(state, params, year)
+        else:
+            yield advance(state.fork(), params, year, never).to_result(year)
+        advance(state, params, never, year + 1)  # wspólna faza wynajmu - jeden rok dalej
+    yield state.to_result(never)
 
 
-def run_all_scenarios():
-    """Uruchamia symulacje dla wszystkich możliwych lat zakupu"""
-    # Nagłówek
-    print_simulation_header()
+def simulate_all_purchase_years(params: SimulationParams, analytical: bool = False,
+                                cache: Optional[ResultCache] = None) -> ResultTable:
+    """
+    Symuluje wszystkie lata zakupu (0..n_years) oraz tylko wynajem.
+
+    Args:
+        params: parametry symulacji
+        analytical: True = wzory zamknięte zamiast pętli rok po roku
+        cache: trwała pamięć podręczna wyników (None = zawsze liczymy)
+
+    Returns:
+        ResultTable - wiersz na każdy rok zakupu
+    """
+    if cache is not None:
+        columns = cache.get(MODEL_NAME, MODEL_VERSION, params, 'simulate_all_purchase_years', analytical)
+        if columns is not None:
+            return ResultTable.from_columns(SimulationResult, columns)
+
+    # Wyniki kolumnowo (jedna tablica na pole) - wiersze to widoki z atrybutami jak SimulationResult
+    results = ResultTable(SimulationResult)
+
+    # 0 do n_years: zakup w tych latach (n_years+1 opcji)
+    # n_years+1: nigdy nie kupujemy (tylko wynajem)
+    if analytical:
+        for year in params.purchase_years:
+            results.append(simulate_purchase_year_closed_form(year, params))
+    else:
+        # pętla rok po roku ze wspólną fazą wynajmu (scenariusze odgałęziane w roku zakupu)
+        for result in branch_purchase_years(params):
+            results.append(result)
+
+    if cache is not None:
+        cache.put(MODEL_NAME, MODEL_VERSION, params, 'simulate_all_purchase_years', analytical,
+                  payload=results.to_columns())
+    return results
+
+
+@profiling.instrumented
+def run_all_scenarios(params: Optional[SimulationParams] = None, analytical: bool = False,
+                      cache: Optional[ResultCache] = None, reporter: Optional[reporters.Reporter] = None):
+    """
+    Uruchamia symulacje dla wszystkich możliwych lat zakupu
     
-    results: List[SimulationResult] = []
+    Args:
+        params: parametry symulacji (domyślnie SimulationParams())
+        analytical: True = wzory zamknięte (simulate_purchase_year_closed_form)
+                    zamiast pętli rok po roku
+        cache: trwała pamięć podręczna wyników (np. ResultCache()) - te same
+               parametry nie są liczone ponownie
+        reporter: format raportu (make_reporter(); domyślnie tekst na stdout),
+                  zamykany po podsumowaniu
     
-    # Symulujemy wszystkie możliwe lata zakupu
-    # 0 do N_YEARS: zakup w tych latach (N_YEARS+1 opcji)
-    # N_YEARS+1: nigdy nie kupujemy (tylko wynajem)
-    for year in range(N_YEARS + 2):
-        result = simulate_purchase_year(year)
-        results.append(result)
+    Returns:
+        ResultTable - wiersz na każdy rok zakupu (widoki z atrybutami jak SimulationResult;
+        zamiast dataclasses.asdict(wiersz) - wiersz.as_dict(), SimulationResult - wiersz.to_record())
+    """
+    if params is None:
+        params = SimulationParams()
+    if reporter is None:
+        reporter = make_reporter()
     
-    # Wyświetlamy wyniki
-    print(f"\nWYNIKI SYMULACJI dla okresu {N_YEARS} lat:") 
-    print("-" * 80)
+    # Nagłówek
+    reporter.begin(params)
+    
+    # Symulujemy wszystkie możliwe lata zakupu
+    results = simulate_all_purchase_years(params, analytical, cache)
     
-    for r in results:
-        # Szczegóły każdego scenariusza
-        print_scenario_details(r)
+    # Szczegóły każdego scenariusza (z quiet=True reporter ich nie formatuje)
+    reporter.scenarios(results)
     
-    # Znajdź optymalny rok zakupu
-    best_result = max(results, key=lambda r: r.net_worth)
+    # Znajdź optymalny rok zakupu (pierwszy z największym majątkiem, jak max() po liście)
+    best_result = results.best('net_worth')
     
     # Podsumowanie
-    print_summary(best_result)
+    reporter.end(summarize(best_result, params))
+    reporter.close()
     
     return results
 
 
 if __name__ == '__main__':
-    run_all_scenarios()
\ No newline at end of file
+    import argparse
+    import contextlib
+
+    parser = argparse.ArgumentParser(description="Symulacja zakupu vs wynajmu dla wszystkich lat zakupu")
+    parser.add_argument('--analytical', action='store_true', help="wzory zamknięte zamiast pętli rok po roku")
+    reporters.add_arguments(parser)
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        stream = stack.enter_context(open(args.output, 'wb')) if args.output else None
+        run_all_scenarios(analytical=args.analytical, reporter=make_reporter(args.format, args.quiet, stream))
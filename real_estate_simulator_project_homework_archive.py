@@ -2,11 +2,20 @@
 """
 Real estate rent vs buy simulator
 
-You can edit the global parameters at the top of the file.
+The global parameters at the top of the file are the defaults of SimulationParams;
+pass a SimulationParams object to run_scenarios to simulate other values.
 """
 
-from dataclasses import dataclass
-from typing import List
+import inspect
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from functools import cached_property
+from typing import List, Optional
+
+import profiling
+import reporters
+from amortization import amortization_schedule
+from result_cache import ResultCache, source_fingerprint
 
 # Global simulation parameters
 PRICE = 500_000.0            # price of property - cena nieruchomości
@@ -22,20 +31,106 @@ INVESTMENT_ANNUAL_RETURN = 0.04  # 4% annual return on investments - roczny zwro
 ADMIN_MONTHLY_BUY = 1000.0   # monthly admin/condo fees for owner - miesięczne koszty administracyjne dla właściciela
 MONTHLY_SALARY = 10_000.0    # monthly salary - miesięczna pensja netto
 LIVING_COST = 4_000.0        # monthly living costs (food, utilities, etc.) - miesięczne koszty życia
-
-# Calculated constants (derived from parameters above)
-"""mortgage amount - kwota główna pożyczki, pierwotna suma pieniędzy, którą pożyczasz od banku — bez odsetek. 
-Od tej kwoty naliczane są odsetki w trakcie spłaty kredytu.
-"""
-BUYER_PRINCIPAL = max(0.0, PRICE - DOWN_PAYMENT)  
+BREAKEVEN_SEARCH_YEARS = 30  # how far to look for breakeven - maksymalny horyzont szukania progu rentowności
+
+# Model code version for the persistent result cache (any source change invalidates stored results)
+MODEL_NAME = 'archive'
+MODEL_VERSION = source_fingerprint(__file__, inspect.getfile(amortization_schedule))
+
+@dataclass(frozen=True)
+class SimulationParams:
+    """Immutable, hashable set of simulation inputs - defaults are the global parameters above.
+
+    Derived values (principal, monthly payment, monthly return) are computed once per instance,
+    so many households can be simulated concurrently without touching module globals."""
+    price: float = PRICE
+    initial_capital: float = INITIAL_CAPITAL
+    down_payment: float = DOWN_PAYMENT
+    mortgage_rate: float = MORTGAGE_RATE
+    mortgage_term_years: int = MORTGAGE_TERM_YEARS
+    rent_monthly: float = RENT_MONTHLY
+    rent_annual_increase: float = RENT_ANNUAL_INCREASE
+    property_annual_appreciation: float = PROPERTY_ANNUAL_APPRECIATION
+    maintenance_annual_pct: float = MAINTENANCE_ANNUAL_PCT
+    investment_annual_return: float = INVESTMENT_ANNUAL_RETURN
+    admin_monthly_buy: float = ADMIN_MONTHLY_BUY
+    monthly_salary: float = MONTHLY_SALARY
+    living_cost: float = LIVING_COST
+
+    @cached_property
+    def buyer_principal(self) -> float:
+        """mortgage amount - kwota główna pożyczki, pierwotna suma pieniędzy, którą pożyczasz od banku — bez odsetek. 
+        Od tej kwoty naliczane są odsetki w trakcie spłaty kredytu.
+        """
+        return max(0.0, self.price - self.down_payment)
+
+    @cached_property
+    def monthly_mortgage_payment(self) -> float:
+        """Fixed monthly mortgage payment - miesięczna rata kredytu"""
+        return monthly_mortgage_payment(self.buyer_principal, self.mortgage_rate, self.mortgage_term_years)
+
+    @cached_property
+    def monthly_return(self) -> float:
+        """miesięczna stopa zwrotu przeliczona z rocznej (z uwzględnieniem kapitalizacji)"""
+        return (1 + self.investment_annual_return) ** (1/12) - 1
+
+class _Details(Mapping):
+    """
+    Read-only dict access (details["total_paid"], dict(details), **details) to a slotted record.
+
+    Equality is Mapping equality, so details still compare equal to plain dicts
+    (the subclasses use @dataclass(eq=False) to keep it).
+    """
+    __slots__ = ()
+
+    def as_dict(self) -> dict:
+        """Plain dict copy, e.g. for json.dumps - zwykły słownik"""
+        return dict(self)
+
+    def __getitem__(self, key: str) -> float:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+@dataclass(eq=False)
+class BuyerDetails(_Details):
+    """Buyer state - stan kupującego (__slots__ instead of a dict per result)"""
+    __slots__ = ('property_value', 'remaining_mortgage', 'buyer_investment',
+                 'total_paid_interest', 'total_paid_principal', 'total_paid')
+    property_value: float # wartość nieruchomości dla bieżącego roku
+    remaining_mortgage: float # pozostała kwota kredytu do spłaty
+    buyer_investment: float # inwestycje kupującego
+    total_paid_interest: float # suma spłaconych odsetek
+    total_paid_principal: float # suma spłaconego kapitału
+    total_paid: float # suma całkowitych miesięcznych kosztów kupującego (rata + utrzymanie nieruchomości + opłaty administracyjne)
+
+@dataclass(eq=False)
+class RenterDetails(_Details):
+    """Renter state - stan najemcy"""
+    __slots__ = ('renter_investment', 'total_paid_rent')
+    renter_investment: float # inwestycje wynajmującego
+    total_paid_rent: float # suma całkowitych miesięcznych kosztów wynajmującego (czynsz)
 
 @dataclass
 class SimulationResult:
+    __slots__ = ('years', 'buyer_net_worth', 'renter_net_worth', 'buyer_details', 'renter_details')
     years: int
     buyer_net_worth: float
     renter_net_worth: float
-    buyer_details: dict
-    renter_details: dict
+    buyer_details: BuyerDetails
+    renter_details: RenterDetails
+
+@dataclass
+class SimulationRun:
+    """Result of one month-by-month pass: a snapshot at every year boundary."""
+    snapshots: List[SimulationResult]  # snapshots[h] = state after h years (same as simulate(years=h))
+    breakeven_month: Optional[int]  # first month from which buyer net worth stays > renter net worth until the end of the breakeven window - od tego miesiąca kupujący wygrywa już do końca okna
 
 def monthly_mortgage_payment(principal: float, annual_rate: float, years: int) -> float:
     """Calculate fixed monthly mortgage payment using annuity formula.
@@ -56,41 +151,74 @@ def is_new_year(month: int) -> bool:
     return (month - 1) % 12 == 0 and month != 1
 
 
-# Calculate the monthly mortgage payment once at module initialization
-MONTHLY_MORTGAGE_PAYMENT = monthly_mortgage_payment(BUYER_PRINCIPAL, MORTGAGE_RATE, MORTGAGE_TERM_YEARS)
+def simulate(years: int, params: Optional[SimulationParams] = None) -> SimulationResult:
+    """Run month-by-month simulation for buyer and renter (default: global parameters)."""
+    return simulate_horizons(years, params).snapshots[years]
 
-def simulate(years: int) -> SimulationResult:
-    """Run month-by-month simulation for buyer and renter using global parameters."""
+@profiling.instrumented
+def simulate_horizons(years: int, params: Optional[SimulationParams] = None) -> SimulationRun:
+    """Run the month-by-month simulation once up to `years` and record the state at each year boundary.
+
+    Every shorter horizon is a prefix of the longest one, so one pass gives the results of
+    simulate(years=h) for all h <= years, plus the breakeven at month resolution: the first month
+    from which the buyer stays ahead until the end of the breakeven window - the first
+    BREAKEVEN_SEARCH_YEARS years, or all `years` if shorter (a short lead that is lost again, e.g.
+    right after the start-of-year appreciation step, does not count). The window does not grow with
+    `years`, so every pass of at least BREAKEVEN_SEARCH_YEARS years gives the same breakeven month."""
+    if params is None:
+        params = SimulationParams()
     months = years * 12
+    breakeven_window = min(months, BREAKEVEN_SEARCH_YEARS * 12) # okno szukania progu rentowności (w miesiącach)
     
     # setup kupującego
-    buyer_investment = max(0.0, INITIAL_CAPITAL - DOWN_PAYMENT) # ile pieniędzy kupujący inwestuje po wpłaceniu wkładu własnego
-    remaining_mortgage = BUYER_PRINCIPAL # pozostała kwota kredytu
-    property_value = PRICE # wartość nieruchomości
-    current_monthly_payment = MONTHLY_MORTGAGE_PAYMENT  # miesięczna rata kredytu - wartość stała
+    buyer_investment = max(0.0, params.initial_capital - params.down_payment) # ile pieniędzy kupujący inwestuje po wpłaceniu wkładu własnego
+    remaining_mortgage = params.buyer_principal # pozostała kwota kredytu
+    property_value = params.price # wartość nieruchomości
+    # harmonogram spłaty kredytu (raty miesięczne) ze wspólnej pamięci podręcznej - saldo poniżej 1e-8 uznajemy za spłacone
+    mortgage_schedule = amortization_schedule(params.buyer_principal, params.mortgage_rate, params.mortgage_term_years,
+                                              periods_per_year=12, settle_below=1e-8)
 
     # setup najemcy
-    renter_investment = INITIAL_CAPITAL # ile pieniędzy najemca inwestuje
-    current_rent = RENT_MONTHLY # miesięczny wynajem
+    renter_investment = params.initial_capital # ile pieniędzy najemca inwestuje
+    current_rent = params.rent_monthly # miesięczny wynajem
 
-    monthly_return = (1 + INVESTMENT_ANNUAL_RETURN) ** (1/12) - 1 # miesięczna stopa zwrotu przeliczona z rocznej (z uwzględnieniem kapitalizacji)
+    monthly_return = params.monthly_return # miesięczna stopa zwrotu przeliczona z rocznej (z uwzględnieniem kapitalizacji)
 
     buyer_paid_interest = 0.0 # suma płaconych odsetek
     buyer_paid_principal = 0.0 # suma płaconych kapitałów
     renter_total_paid_rent = 0.0 # suma płaconych wynajmów
     buyer_total_paid = 0.0 # suma płaconych rat kredytu
 
+    def snapshot(elapsed_years: int) -> SimulationResult:
+        """State after `elapsed_years` years - the same result as simulate(years=elapsed_years)."""
+        buyer_net_worth = property_value - remaining_mortgage + buyer_investment # majątek netto kupującego: wartość nieruchomości - pozostały kredyt + inwestycje
+        renter_net_worth = renter_investment # majątek netto wynajmującego: inwestycje
+
+        buyer_details = BuyerDetails(property_value, remaining_mortgage, buyer_investment,
+                                     buyer_paid_interest, buyer_paid_principal, buyer_total_paid)
+        renter_details = RenterDetails(renter_investment, renter_total_paid_rent)
+        return SimulationResult(elapsed_years, buyer_net_worth, renter_net_worth, buyer_details, renter_details)
+
+    snapshots = [snapshot(0)] # stan początkowy (0 lat)
+    breakeven_month = None # pierwszy miesiąc, od którego majątek kupującego przewyższa majątek najemcy do końca okna
+
+    # Per-phase timing (the `if profiler` blocks only exist in the profiled version, see profiling.py)
+    profiler = profiling.current()
+
     for month in range(1, months + 1):
+        if profiler is not None:
+            phase_start = profiler.now()
         # Apply yearly changes at the start of each year (month 1,13,25,...)
         if is_new_year(month):
-            property_value *= (1 + PROPERTY_ANNUAL_APPRECIATION) # roczna aprecjacja nieruchomości
-            current_rent *= (1 + RENT_ANNUAL_INCREASE) # roczny wzrost wynajmu
+            property_value *= (1 + params.property_annual_appreciation) # roczna aprecjacja nieruchomości
+            current_rent *= (1 + params.rent_annual_increase) # roczny wzrost wynajmu
+            if profiler is not None:
+                phase_start = profiler.lap('simulate_horizons: appreciation', phase_start)
 
         # BUYER monthly maintenance = annual maintenance pct of current property value / 12
-        monthly_maintenance = property_value * MAINTENANCE_ANNUAL_PCT / 12.0 # miesięczny koszt utrzymania nieruchomości
+        monthly_maintenance = property_value * params.maintenance_annual_pct / 12.0 # miesięczny koszt utrzymania nieruchomości
 
-        # Mortgage interest for this month
-        monthly_interest = remaining_mortgage * (MORTGAGE_RATE / 12.0) # odsetkowa część miesięcznej raty kredytu
+        monthly_interest = 0.0 # odsetkowa część miesięcznej raty kredytu
         principal_component = 0.0 # część miesięcznej raty przeznaczona na spłatę kapitału
         payment = 0.0 # miesięczna rata kredytu
 
@@ -98,22 +226,27 @@ def simulate(years: int) -> SimulationResult:
         a w kolejnych latach płaci się coraz mniej odsetek i coraz więcej kapitału.
         """
         if remaining_mortgage > 0:
-            payment = min(current_monthly_payment, remaining_mortgage + monthly_interest) # rzeczywista miesięczna płatność (nie większa niż pozostały dług + odsetki)
-            principal_component = payment - monthly_interest # część miesięcznej raty przeznaczona na spłatę kapitału
-            remaining_mortgage = max(0.0, remaining_mortgage - principal_component) # aktualizacja pozostałego kapitału kredytu po spłacie
+            # Mortgage split for this month from the amortization schedule (payments run every month from month 1)
+            mortgage_period = month - 1
+            monthly_interest = mortgage_schedule.interest[mortgage_period] # odsetki za ten miesiąc
+            payment = mortgage_schedule.payments[mortgage_period] # rzeczywista miesięczna płatność (nie większa niż pozostały dług + odsetki)
+            principal_component = mortgage_schedule.principal[mortgage_period] # część miesięcznej raty przeznaczona na spłatę kapitału
+            remaining_mortgage = mortgage_schedule.balance[mortgage_period] # aktualizacja pozostałego kapitału kredytu po spłacie (0 gdy spłacony)
             buyer_paid_interest += monthly_interest  # dodanie miesięcznych odsetek do całkowitej kwoty zapłaconych odsetek przez kupującego - suma spłaconych odsetek
             buyer_paid_principal += principal_component # dodanie spłaconego kapitału do całkowitej kwoty spłaconego kapitału przez kupującego - suma spłaconego kapitału
-            buyer_total_paid += payment + monthly_maintenance + ADMIN_MONTHLY_BUY # suma całkowitych miesięcznych kosztów kupującego (rata + utrzymanie nieruchomości + opłaty administracyjne)
+            buyer_total_paid += payment + monthly_maintenance + params.admin_monthly_buy # suma całkowitych miesięcznych kosztów kupującego (rata + utrzymanie nieruchomości + opłaty administracyjne)
+        if profiler is not None:
+            phase_start = profiler.lap('simulate_horizons: mortgage split', phase_start)
 
         # RENTER monthly outflow = current_rent
         renter_total_paid_rent += current_rent # dodanie miesięcznego czynszu do całkowitych kosztów poniesionych przez wynajmującego
 
         # Calculate monthly surplus (what's left after all expenses)
         # RENTER: salary - living costs - rent
-        monthly_surplus_renter = MONTHLY_SALARY - LIVING_COST - current_rent  # kwota, która zostaje wynajmującemu po pokryciu kosztów życia i czynszu
+        monthly_surplus_renter = params.monthly_salary - params.living_cost - current_rent  # kwota, która zostaje wynajmującemu po pokryciu kosztów życia i czynszu
         
         # BUYER: salary - living costs - mortgage payment - maintenance - admin fees
-        monthly_surplus_buyer = MONTHLY_SALARY - LIVING_COST - payment - monthly_maintenance - ADMIN_MONTHLY_BUY # kwota, która zostaje kupującemu po pokryciu kosztów życia, rata kredytu, utrzymania nieruchomości i opłat administracyjnych
+        monthly_surplus_buyer = params.monthly_salary - params.living_cost - payment - monthly_maintenance - params.admin_monthly_buy # kwota, która zostaje kupującemu po pokryciu kosztów życia, rata kredytu, utrzymania nieruchomości i opłat administracyjnych
 
         # Update investments by compounding monthly
         buyer_investment *= (1 + monthly_return) # aktualizacja inwestycji kupującego z uwzględnieniem kapitalizacji
@@ -122,35 +255,105 @@ def simulate(years: int) -> SimulationResult:
         # Add monthly surplus to investments (or subtract if negative - going into debt)
         renter_investment += monthly_surplus_renter # dodanie miesięcznego nadwyżki do inwestycji wynajmującego
         buyer_investment += monthly_surplus_buyer # dodanie miesięcznego nadwyżki do inwestycji kupującego
-
-        # If mortgage paid off, set monthly payment to zero for remaining months
-        if remaining_mortgage <= 1e-8:
-            remaining_mortgage = 0.0 # jeśli kredyt jest spłacany, pozostała kwota kredytu jest ustawiona na 0
-            current_monthly_payment = 0.0 # miesięczna rata kredytu jest ustawiona na 0
+        if profiler is not None:
+            phase_start = profiler.lap('simulate_horizons: cash flow and compounding', phase_start)
+
+        # Breakeven at month resolution - próg rentowności z dokładnością do miesiąca (trwała przewaga
+        # w stałym oknie: kandydat jest kasowany, gdy kupujący znów przestaje wygrywać)
+        if month <= breakeven_window:
+            if property_value - remaining_mortgage + buyer_investment > renter_investment:
+                if breakeven_month is None:
+                    breakeven_month = month
+            else:
+                breakeven_month = None
+
+        # Year boundary - zapisujemy stan po pełnym roku
+        if month % 12 == 0:
+            snapshots.append(snapshot(month // 12))
+        if profiler is not None:
+            profiler.lap('simulate_horizons: breakeven and snapshots', phase_start)
 
     # Final property appreciation: apply at the end of last year if needed
     # (property_value already updated at start of each year; for simplicity we'll apply appreciation if simulation ended mid-year not needed)
 
-    buyer_net_worth = property_value - remaining_mortgage + buyer_investment # majątek netto kupującego: wartość nieruchomości - pozostały kredyt + inwestycje
-    renter_net_worth = renter_investment # majątek netto wynajmującego: inwestycje
-
-    buyer_details = {
-        "property_value": property_value, # wartość nieruchomości dla bieżącego roku
-        "remaining_mortgage": remaining_mortgage, # pozostała kwota kredytu do spłaty
-        "buyer_investment": buyer_investment, # inwestycje kupującego
-        "total_paid_interest": buyer_paid_interest, # suma spłaconych odsetek
-        "total_paid_principal": buyer_paid_principal, # suma spłaconego kapitału
-        "total_paid": buyer_total_paid, # suma całkowitych miesięcznych kosztów kupującego (rata + utrzymanie nieruchomości + opłaty administracyjne)
-    }
-    renter_details = {
-        "renter_investment": renter_investment, # inwestycje wynajmującego
-        "total_paid_rent": renter_total_paid_rent, # suma całkowitych miesięcznych kosztów wynajmującego (czynsz)
-    }
-
-    return SimulationResult(years, buyer_net_worth, renter_net_worth, buyer_details, renter_details)
-
-def run_scenarios(start_year: int, end_year: int = None):
-    """Run simulations for different time horizons using global parameters."""
+    return SimulationRun(snapshots, breakeven_month)
+
+def cached_horizons(years: int, params: Optional[SimulationParams] = None,
+                    cache: Optional[ResultCache] = None) -> SimulationRun:
+    """simulate_horizons(years, params), read from / stored in the persistent result cache when one is given."""
+    if params is None:
+        params = SimulationParams()
+    if cache is not None:
+        payload = cache.get(MODEL_NAME, MODEL_VERSION, params, 'simulate_horizons', years)
+        if payload is not None:
+            snapshots = [SimulationResult(y, buyer, renter, BuyerDetails(*buyer_details), RenterDetails(*renter_details))
+                         for y, buyer, renter, buyer_details, renter_details in payload['snapshots']]
+            return SimulationRun(snapshots, payload['breakeven_month'])
+
+    run = simulate_horizons(years, params)
+
+    if cache is not None:
+        payload = {
+            'snapshots': [[r.years, r.buyer_net_worth, r.renter_net_worth,
+                           list(r.buyer_details.values()), list(r.renter_details.values())] for r in run.snapshots],
+            'breakeven_month': run.breakeven_month,
+        }
+        cache.put(MODEL_NAME, MODEL_VERSION, params, 'simulate_horizons', years, payload=payload)
+    return run
+
+def format_run_header(params: SimulationParams) -> str:
+    """Report header with the parameters used - nagłówek raportu z użytymi parametrami"""
+    lines = [f"  {f.name}: {getattr(params, f.name):,}" for f in fields(params)]
+    return "Running simulations with parameters:\n" + "\n".join(lines) + "\n\n"
+
+@profiling.instrumented
+def format_horizon(r: SimulationResult, params: SimulationParams) -> str:
+    """Report text for one horizon - buyer vs renter net worth after r.years years."""
+    diff = r.buyer_net_worth - r.renter_net_worth
+    if diff > 0:
+        verdict = f"Różnica na korzyść kupującego: {diff:,.2f} zł"
+    else:
+        verdict = f"Różnica na korzyść najemcy: {-diff:,.2f} zł"
+    return (f"--- After {r.years} years ---\n"
+            f"Wartość netto kupującego (Wartość nieruchomości - Pozostały kredyt + Inwestycje): {r.buyer_net_worth:,.2f} zł\n"
+            f"Wartość netto najemcy(tylko Inwestycje): {r.renter_net_worth:,.2f} zł\n"
+            f"{verdict}\n\n")
+
+def format_breakeven(summary: dict, params: SimulationParams) -> str:
+    """Report text for the breakeven summary (summary from run_scenarios)."""
+    if summary['breakeven_years']:
+        text = f"Próg rentowności (Breakeven): Zakup staje się bardziej opłacalny po {summary['breakeven_years']} latach.\n"
+    else:
+        text = f"Próg Rentowności (Breakeven): Zakup nie staje się bardziej opłacalny w ciągu {summary['search_years']} lat przy obecnych założeniach.\n"
+    breakeven_month = summary['breakeven_month']
+    if breakeven_month is not None:
+        years_part, months_part = divmod(breakeven_month, 12)
+        text += (f"Trwała przewaga kupującego (do końca {summary['search_years']} lat): od miesiąca {breakeven_month} "
+                 f"({years_part} {_years_word(years_part)} i {months_part} mies.).\n")
+    return text
+
+def _years_word(count: int) -> str:
+    """Polish plural of "rok": 1 rok, 2-4 lata (but 12-14 lat), otherwise lat."""
+    if count == 1:
+        return "rok"
+    if count % 10 in (2, 3, 4) and count % 100 not in (12, 13, 14):
+        return "lata"
+    return "lat"
+
+def make_reporter(output_format: str = 'text', quiet: bool = False, stream=None) -> reporters.Reporter:
+    """Reporter for run_scenarios: 'text' (Polish report), 'jsonl', 'csv' or 'binary'.
+
+    quiet - breakeven summary only, horizons are not formatted at all; stream - default sys.stdout."""
+    text_format = reporters.TextFormat(format_run_header, format_horizon, format_breakeven)
+    return reporters.create_reporter(output_format, text_format, quiet, stream)
+
+@profiling.instrumented
+def run_scenarios(start_year: int, end_year: int = None, params: Optional[SimulationParams] = None,
+                  cache: Optional[ResultCache] = None, reporter: Optional[reporters.Reporter] = None):
+    """Run simulations for different time horizons (default: global parameters).
+
+    cache - optional persistent result cache (e.g. ResultCache()); identical parameters are not recomputed.
+    reporter - output format (make_reporter(); default: text to stdout), closed after the summary."""
 
     if start_year < 1:
         raise ValueError("Start year must be greater than 0")
@@ -161,37 +364,48 @@ def run_scenarios(start_year: int, end_year: int = None):
     if start_year > end_year:
         raise ValueError("Start year must be less than end year")
 
-    print("Running simulations with global parameters (edit top of file to change values)\n")
-    results: List[SimulationResult] = []
-    for h in range(start_year, end_year + 1):
-        res = simulate(years=h)
-        results.append(res)
+    if params is None:
+        params = SimulationParams()
+    if reporter is None:
+        reporter = make_reporter()
 
-    for r in results:
-        print(f"--- After {r.years} years ---")
-        print(f"Wartość netto kupującego (Wartość nieruchomości - Pozostały kredyt + Inwestycje): {r.buyer_net_worth:,.2f} zł")
-        print(f"Wartość netto najemcy(tylko Inwestycje): {r.renter_net_worth:,.2f} zł")
-        
-        diff = r.buyer_net_worth - r.renter_net_worth
-        if diff > 0:
-            print(f"Różnica na korzyść kupującego: {diff:,.2f} zł")
-        else:
-            print(f"Różnica na korzyść najemcy: {-diff:,.2f} zł")
-        print()
-
-    # Find breakeven within 30 years
+    reporter.begin(params)
+    # One pass up to the longest horizon serves both the report and the breakeven search
+    run = cached_horizons(max(end_year, BREAKEVEN_SEARCH_YEARS), params, cache)
+    results: List[SimulationResult] = run.snapshots[start_year:end_year + 1]
+    profiler = profiling.current()
+    if profiler is not None:
+        report_start = profiler.now()
+
+    reporter.scenarios(results)
+    if profiler is not None:
+        profiler.lap('run_scenarios: report', report_start)
+
+    # Find breakeven within BREAKEVEN_SEARCH_YEARS years
     breakeven = None
-    for year in range(1, 31):
-        res = simulate(years=year)
+    for res in run.snapshots[1:BREAKEVEN_SEARCH_YEARS + 1]:
         if res.buyer_net_worth > res.renter_net_worth:
-            breakeven = year
+            breakeven = res.years
             break
 
-    if breakeven:
-        print(f"Próg rentowności (Breakeven): Zakup staje się bardziej opłacalny po {breakeven} latach.")
-    else:
-        print("Próg Rentowności (Breakeven): Zakup nie staje się bardziej opłacalny w ciągu 30 lat przy obecnych założeniach.")
+    # Month breakeven over the fixed BREAKEVEN_SEARCH_YEARS window (independent of end_year)
+    breakeven_month = run.breakeven_month
+
+    reporter.end({'breakeven_years': breakeven, 'breakeven_month': breakeven_month,
+                  'search_years': BREAKEVEN_SEARCH_YEARS})
+    reporter.close()
 
 
 if __name__ == '__main__':
-    run_scenarios(1, 10)
+    import argparse
+    import contextlib
+
+    parser = argparse.ArgumentParser(description="Buyer vs renter net worth for horizons START..END years")
+    parser.add_argument('start_year', nargs='?', type=int, default=1)
+    parser.add_argument('end_year', nargs='?', type=int, default=10)
+    reporters.add_arguments(parser)
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        stream = stack.enter_context(open(args.output, 'wb')) if args.output else None
+        run_scenarios(args.start_year, args.end_year, reporter=make_reporter(args.format, args.quiet, stream))
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Wymienne formaty raportów symulacji, pisane przez jeden bufor wyjścia.
+
+Funkcje raportujące modeli nie wołają już print dla każdej linii - przekazują
+rekordy (wyniki scenariuszy) reporterowi, a reporter sam decyduje, czy
+i jak je sformatować:
+
+- TextReporter     - dotychczasowy czytelny raport po polsku (formatowanie
+                     dostarcza moduł modelu, jeden szablon na scenariusz),
+- JsonLinesReporter - jedna linia JSON na rekord (params, scenario, summary),
+- CsvReporter       - tabela scenariuszy (nagłówek = nazwy pól),
+- BinaryReporter    - zrzut kolumnowy: nagłówek JSON + kolumny float64/int64.
+
+Wszystkie piszą przez ReportWriter, który zbiera tekst w pamięci i oddaje
+go strumieniowi dużymi porcjami (zamiast tysięcy wywołań print). Z quiet=True
+reporter pomija rekordy scenariuszy w ogóle (nawet ich nie formatuje) -
+zostają tylko parametry i podsumowanie.
+
+Zagnieżdżone rekordy (np. buyer_details w modelu archiwalnym) są spłaszczane
+do pól najwyższego poziomu.
+"""
+
+import csv
+import dataclasses
+import io
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from result_table import ResultRow
+
+FORMATS = ('text', 'jsonl', 'csv', 'binary')
+DEFAULT_BUFFER_SIZE = 1 << 16  # znaków tekstu zbieranych przed zapisem do strumienia
+
+BINARY_MAGIC = b'REPORT01'
+# magic, długość nagłówka JSON w bajtach (po nim dopełnienie do 8 bajtów i kolumny)
+_BINARY_HEADER = struct.Struct('<8sQ')
+
+
+class ReportWriter:
+    """Bufor wyjścia raportu: tekst zbierany w liście i zapisywany porcjami."""
+
+    def __init__(self, stream=None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            stream: strumień tekstowy albo binarny (domyślnie bieżący sys.stdout)
+            buffer_size: ile znaków zebrać przed zapisem do strumienia
+        """
+        self.stream = sys.stdout if stream is None else stream
+        self.binary = isinstance(self.stream, (io.RawIOBase, io.BufferedIOBase))
+        self.buffer_size = buffer_size
+        self._chunks: List[str] = []
+        self._size = 0
+
+    def write(self, text: str):
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self._drain()
+
+    def write_bytes(self, data: bytes):
+        """Zapis danych binarnych (strumień binarny albo bufor strumienia tekstowego, np. stdout)."""
+        self._drain()
+        if self.binary:
+            self.stream.write(data)
+            return
+        target = getattr(self.stream, 'buffer', None)
+        if target is None:
+            raise TypeError("format binarny wymaga strumienia binarnego")
+        self.stream.flush()
+        target.write(data)
+
+    def _drain(self):
+        if not self._chunks:
+            return
+        text = ''.join(self._chunks)
+        self._chunks.clear()
+        self._size = 0
+        self.stream.write(text.encode('utf-8') if self.binary else text)
+
+    def flush(self):
+        self._drain()
+        self.stream.flush()
+
+
+def record_values(record) -> Dict[str, object]:
+    """Pola rekordu jako słownik; zagnieżdżone rekordy (dataclass, Mapping) są spłaszczane."""
+    if isinstance(record, ResultRow):
+        return record.as_dict()
+    if isinstance(record, Mapping):
+        return dict(record)
+    values = {}
+    for field in dataclasses.fields(record):
+        value = getattr(record, field.name)
+        if isinstance(value, Mapping) or dataclasses.is_dataclass(value):
+            values.update(record_values(value))
+        else:
+            values[field.name] = value
+    return values
+
+
+class Reporter:
+    """
+    Wspólny interfejs reporterów.
+
+    Kolejność wywołań: begin(params), scenario()/scenarios() dla wyników,
+    end(summary), close(). Z quiet=True rekordy scenariuszy są ignorowane.
+    """
+
+    def __init__(self, writer: Optional[ReportWriter] = None, quiet: bool = False):
+        self.writer = writer if writer is not None else ReportWriter()
+        self.quiet = quiet
+        self.params = None
+
+    def begin(self, params):
+        self.params = params
+
+    def scenario(self, record):
+        if not self.quiet:
+            self._scenario(record)
+
+    def scenarios(self, records: Iterable):
+        if not self.quiet:
+            for record in records:
+                self._scenario(record)
+
+    def _scenario(self, record):
+        pass
+
+    def end(self, summary: dict):
+        pass
+
+    def close(self):
+        self.writer.flush()
+
+    def __enter__(self) -> 'Reporter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@dataclasses.dataclass
+class TextFormat:
+    """Formatowanie raportu tekstowego dostarczane przez moduł modelu (funkcje zwracają tekst)"""
+    header: Callable[[object], str]  # params -> nagłówek
+    scenario: Callable[[object, object], str]  # (wynik, params) -> opis scenariusza
+    summary: Callable[[dict, object], str]  # (podsumowanie, params) -> tekst podsumowania
+    section: Optional[Callable[[object], str]] = None  # params -> tytuł przed pierwszym scenariuszem
+
+
+class TextReporter(Reporter):
+    """Czytelny raport tekstowy (po polsku) - formatowanie z TextFormat modelu."""
+
+    def __init__(self, text_format: TextFormat, writer: Optional[ReportWriter] = None, quiet: bool = False):
+        super().__init__(writer, quiet)
+        self.format = text_format
+        self._section_pending = False
+
+    def begin(self, params):
+        super().begin(params)
+        self.writer.write(self.format.header(params))
+        self._section_pending = self.format.section is not None
+
+    def _scenario(self, record):
+        if self._section_pending:
+            self.writer.write(self.format.section(self.params))
+            self._section_pending = False
+        self.writer.write(self.format.scenario(record, self.params))
+
+    def scenarios(self, records: Iterable):
+        if not self.quiet:
+            # jedno złączenie zamiast zapisu na scenariusz
+            scenario, params = self.format.scenario, self.params
+            text = ''.join([scenario(record, params) for record in records])
+            if text and self._section_pending:
+                self.writer.write(self.format.section(params))
+                self._section_pending = False
+            self.writer.write(text)
+
+    def end(self, summary: dict):
+        self.writer.write(self.format.summary(summary, self.params))
+
+
+def _json_default(value):
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    raise TypeError(f"{type(value).__name__} nie jest serializowalny do JSON")
+
+
+class JsonLinesReporter(Reporter):
+    """JSON Lines: {"type": "params" | "scenario" | "summary", ...pola}"""
+
+    def begin(self, params):
+        super().begin(params)
+        self._encode = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+        self.writer.write(self._encode({'type': 'params', **dataclasses.asdict(params)}) + '\n')
+
+    def _scenario(self, record):
+        self.writer.write(self._encode({'type': 'scenario', **record_values(record)}) + '\n')
+
+    def end(self, summary: dict):
+        self.writer.write(self._encode({'type': 'summary', **summary}) + '\n')
+
+
+class CsvReporter(Reporter):
+    """CSV: tabela scenariuszy; z quiet=True jeden wiersz podsumowania."""
+
+    def begin(self, params):
+        super().begin(params)
+        self._csv = csv.writer(self.writer, lineterminator='\n')
+        self._columns: Optional[Tuple[str, ...]] = None
+
+    def _scenario(self, record):
+        values = record_values(record)
+        if self._columns is None:
+            self._columns = tuple(values)
+            self._csv.writerow(self._columns)
+        self._csv.writerow(values.values())
+
+    def scenarios(self, records: Iterable):
+        if not self.quiet:
+            rows = [record_values(record) for record in records]
+            if rows and self._columns is None:
+                self._columns = tuple(rows[0])
+                self._csv.writerow(self._columns)
+            self._csv.writerows(row.values() for row in rows)
+
+    def end(self, summary: dict):
+        if self.quiet:
+            self._csv.writerow(summary.keys())
+            self._csv.writerow(summary.values())
+
+
+class BinaryReporter(Reporter):
+    """
+    Zrzut kolumnowy (czytany przez read_binary_report):
+
+        magic b'REPORT01', długość nagłówka (uint64), nagłówek JSON
+        {"columns": [[nazwa, 'd'|'q'], ...], "rows": n, "params": {...}, "summary": {...}},
+        dopełnienie do 8 bajtów, potem kolumny po kolei (little-endian float64 / int64).
+
+    Rekordy są zbierane w kolumnach array i zapisywane w close().
+    """
+
+    def begin(self, params):
+        super().begin(params)
+        self._columns: Dict[str, array] = {}
+        self._summary: dict = {}
+
+    def _scenario(self, record):
+        values = record_values(record)
+        if not self._columns:
+            self._columns = {name: array('q' if isinstance(value, int) else 'd') for name, value in values.items()}
+        for name, value in values.items():
+            self._columns[name].append(value)
+
+    def end(self, summary: dict):
+        self._summary = summary
+
+    def close(self):
+        rows = len(next(iter(self._columns.values()))) if self._columns else 0
+        header = json.dumps({'columns': [[name, column.typecode] for name, column in self._columns.items()],
+                             'rows': rows, 'params': dataclasses.asdict(self.params), 'summary': self._summary},
+                            ensure_ascii=False, default=_json_default).encode('utf-8')
+        header += b' ' * (-(_BINARY_HEADER.size + len(header)) % 8)
+        parts = [_BINARY_HEADER.pack(BINARY_MAGIC, len(header)), header]
+        for column in self._columns.values():
+            if sys.byteorder != 'little':
+                column.byteswap()
+            parts.append(column.tobytes())
+        self.writer.write_bytes(b''.join(parts))
+        super().close()
+
+
+def read_binary_report(data: bytes) -> Tuple[dict, Dict[str, array]]:
+    """
+    Odczyt zrzutu BinaryReporter.
+
+    Returns:
+        (nagłówek JSON, kolumny nazwa -> array)
+    """
+    magic, length = _BINARY_HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("to nie jest zrzut BinaryReporter")
+    header = json.loads(data[_BINARY_HEADER.size:_BINARY_HEADER.size + length])
+    offset = _BINARY_HEADER.size + length
+    columns = {}
+    for name, typecode in header['columns']:
+        column = array(typecode)
+        column.frombytes(data[offset:offset + 8 * header['rows']])
+        if sys.byteorder != 'little':
+            column.byteswap()
+        columns[name] = column
+        offset += 8 * header['rows']
+    return header, columns
+
+
+def create_reporter(output_format: str = 'text', text_format: Optional[TextFormat] = None,
+                    quiet: bool = False, stream=None) -> Reporter:
+    """
+    Tworzy reporter danego formatu.
+
+    Args:
+        output_format: 'text', 'jsonl', 'csv' albo 'binary'
+        text_format: formatowanie raportu tekstowego (wymagane dla 'text')
+        quiet: tylko parametry i podsumowanie, bez scenariuszy
+        stream: strumień wyjścia (domyślnie sys.stdout)
+    """
+    writer = ReportWriter(stream)
+    if output_format == 'text':
+        if text_format is None:
+            raise ValueError("raport tekstowy wymaga TextFormat modelu")
+        return TextReporter(text_format, writer, quiet)
+    reporter_types = {'jsonl': JsonLinesReporter, 'csv': CsvReporter, 'binary': BinaryReporter}
+    if output_format not in reporter_types:
+        raise ValueError(f"nieznany format raportu {output_format!r} (dostępne: {', '.join(FORMATS)})")
+    return reporter_types[output_format](writer, quiet)
+
+
+def add_arguments(parser):
+    """Wspólne opcje raportu dla CLI modeli: --format, --quiet, --output."""
+    parser.add_argument('--format', choices=FORMATS, default='text', help="format raportu")
+    parser.add_argument('--quiet', action='store_true', help="tylko podsumowanie, bez scenariuszy")
+    parser.add_argument('--output', help="plik wyjściowy (domyślnie standardowe wyjście)")
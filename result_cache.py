@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Trwała pamięć podręczna wyników symulacji (plik SQLite).
+
+Kluczem wpisu jest skrót SHA-256 z nazwy modelu, wersji kodu modelu, nazwy
+i argumentów wywołania oraz wszystkich pól SimulationParams - te same
+parametry dają ten sam klucz w każdym procesie i po restarcie. Wartość to
+wynik zapisany jako JSON (liczby zmiennoprzecinkowe zapisywane są
+dokładnie, więc odczytany wynik jest identyczny z policzonym).
+
+Wersja modelu to skrót źródeł modułów liczących wynik (source_fingerprint),
+więc każda zmiana kodu symulacji automatycznie unieważnia stare wpisy - mają
+inne klucze, nie są już trafiane i wypadają z pliku jak każdy nieużywany
+wpis. Wpisy innych wersji nie są usuwane od razu (np. dwie gałęzie kodu
+mogą korzystać z jednego pliku).
+
+Rozmiar pliku jest ograniczony (max_bytes): po przekroczeniu usuwane są
+najdawniej używane wpisy (LRU). Łączny rozmiar wpisów jest trzymany
+w jednowierszowej tabeli meta i aktualizowany w tej samej transakcji co
+zapis, więc zapis nie przegląda całej tabeli wyników. Czas użycia jest odświeżany przy odczycie
+najwyżej raz na TOUCH_INTERVAL sekund, pojedynczym zapisem poza odczytem,
+więc trafienia nie czekają na blokadę zapisu. Baza działa w trybie WAL,
+a zapisy są wykonywane w transakcjach BEGIN IMMEDIATE, więc z jednego pliku
+może bezpiecznie korzystać wiele procesów naraz.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'real_estate_simulator', 'results.sqlite')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MiB
+BUSY_TIMEOUT = 30.0  # ile sekund czekać na blokadę zapisu innego procesu
+TOUCH_INTERVAL = 60.0  # co ile sekund najwyżej odświeżać last_used trafionego wpisu (dokładność LRU)
+
+# Statystyki pamięci podręcznej (rozmiary w bajtach danych wyników)
+DiskCacheInfo = namedtuple('DiskCacheInfo', ['hits', 'misses', 'evictions', 'max_bytes', 'current_bytes', 'entries'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE INDEX IF NOT EXISTS results_model ON results (model, model_version);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta VALUES (0, (SELECT COALESCE(SUM(size), 0) FROM results));
+"""
+
+
+def source_fingerprint(*paths: str) -> str:
+    """Wersja kodu: SHA-256 zawartości podanych plików źródłowych (skrócony do 16 znaków)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _canonical_params(params) -> dict:
+    """Pola SimulationParams rzutowane na zadeklarowane typy (int / float) - równe parametry dają ten sam klucz."""
+    values = {}
+    for field in dataclasses.fields(params):
+        value = getattr(params, field.name)
+        if field.type in (int, 'int'):
+            value = int(value)
+        elif field.type in (float, 'float'):
+            value = float(value)
+        values[field.name] = value
+    return values
+
+
+def cache_key(model: str, model_version: str, params, call: str, *args) -> str:
+    """
+    Stabilny klucz wpisu.
+
+    Args:
+        model: nazwa modelu ('main' / 'archive')
+        model_version: wersja kodu modelu (source_fingerprint)
+        params: SimulationParams (dataclass - brane są wszystkie pola, rzutowane na zadeklarowane typy)
+        call: nazwa buforowanego wywołania
+        args: pozostałe argumenty wywołania (liczby, teksty, wartości logiczne)
+
+    Returns:
+        skrót SHA-256 (hex) kanonicznego JSON-a z powyższych danych
+    """
+    document = {
+        'model': model,
+        'version': model_version,
+        'call': call,
+        'args': list(args),
+        'params': _canonical_params(params),
+    }
+    return hashlib.sha256(json.dumps(document, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Pamięć podręczna wyników w pliku SQLite z limitem rozmiaru (LRU).
+
+    Każdy proces (i wątek) otwiera własne połączenie przy pierwszym użyciu,
+    więc obiekt można przekazać do procesów roboczych.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)  # IF NOT EXISTS - bezpieczne przy wielu procesach
+
+    def __getstate__(self):
+        # do innego procesu przekazujemy tylko konfigurację - połączenie otworzy się tam od nowa
+        return {'path': self.path, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['max_bytes'])
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _write(self):
+        """Transakcja zapisu (BEGIN IMMEDIATE - od razu blokada zapisu, bez zakleszczeń przy podnoszeniu)."""
+        return _ImmediateTransaction(self._connection())
+
+    def get(self, model: str, model_version: str, params, call: str, *args) -> Optional[Any]:
+        """
+        Odczytuje wynik.
+
+        Args:
+            jak cache_key
+
+        Returns:
+            zapisany wynik (odczytany z JSON) albo None, jeśli go nie ma
+        """
+        key = cache_key(model, model_version, params, call, *args)
+        connection = self._connection()
+        row = connection.execute('SELECT payload, last_used FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        now = time.time()
+        if now - row[1] > TOUCH_INTERVAL:
+            self._touch(connection, key, now)
+        return json.loads(row[0])
+
+    @staticmethod
+    def _touch(connection: sqlite3.Connection, key: str, now: float):
+        """Odświeża last_used (pojedyncza instrukcja w trybie autocommit; przy zajętej bazie pomijane)."""
+        connection.execute('PRAGMA busy_timeout = 0')  # nie czekamy na zapisy innych procesów
+        try:
+            connection.execute('UPDATE results SET last_used = ? WHERE key = ? AND last_used < ?',
+                               (now, key, now - TOUCH_INTERVAL))
+        except sqlite3.OperationalError:
+            pass  # tylko dokładność LRU - wynik został już odczytany
+        finally:
+            connection.execute(f'PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}')
+
+    def put(self, model: str, model_version: str, params, call: str, *args, payload: Any):
+        """Zapisuje wynik (payload - dane serializowalne do JSON) i usuwa najstarsze wpisy ponad limit."""
+        key = cache_key(model, model_version, params, call, *args)
+        text = json.dumps(payload)
+        size = len(text.encode('utf-8'))
+        with self._write() as connection:
+            replaced = connection.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+            connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                               (key, model, model_version, text, size, time.time()))
+            total = connection.execute('SELECT total_bytes FROM meta WHERE id = 0').fetchone()[0]
+            total += size - (replaced[0] if replaced else 0)
+            while total > self.max_bytes:
+                oldest = connection.execute(
+                    'SELECT key, size FROM results ORDER BY last_used LIMIT 1').fetchone()
+                if oldest is None or oldest[0] == key:
+                    break  # nie usuwamy właśnie zapisanego wyniku, nawet jeśli sam przekracza limit
+                connection.execute('DELETE FROM results WHERE key = ?', (oldest[0],))
+                total -= oldest[1]
+                self._evictions += 1
+            connection.execute('UPDATE meta SET total_bytes = ? WHERE id = 0', (total,))
+
+    def cache_info(self) -> DiskCacheInfo:
+        """Statystyki: trafienia i chybienia tego obiektu, usunięte wpisy, rozmiar maksymalny i bieżący, liczba wpisów"""
+        size, entries = self._connection().execute(
+            'SELECT (SELECT total_bytes FROM meta WHERE id = 0), COUNT(*) FROM results').fetchone()
+        return DiskCacheInfo(self._hits, self._misses, self._evictions, self.max_bytes, size, entries)
+
+    def cache_clear(self):
+        """Usuwa wszystkie wpisy i zeruje liczniki"""
+        with self._write() as connection:
+            connection.execute('DELETE FROM results')
+            connection.execute('UPDATE meta SET total_bytes = 0 WHERE id = 0')
+        self._hits = self._misses = self._evictions = 0
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local.connection = None
+
+
+class _ImmediateTransaction:
+    """Kontekst: BEGIN IMMEDIATE ... COMMIT (albo ROLLBACK przy wyjątku)."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Kolumnowe przechowywanie wyników symulacji (struct-of-arrays).
+
+Zamiast listy obiektów (po jednym dataclassie na scenariusz) każde pole
+wyniku jest trzymane w jednej zwartej tablicy array ('d' dla liczb
+zmiennoprzecinkowych, 'q' dla całkowitych) - 8 bajtów na wartość zamiast
+pełnego obiektu Pythona z atrybutami.
+
+Wiersz tabeli (ResultRow) to tylko widok: odwołanie do tabeli i numer
+wiersza, wartości są czytane z kolumn przy dostępie do atrybutu. Dzięki temu
+wiersz zachowuje się jak SimulationResult (np. w print_scenario_details),
+ale niczego nie kopiuje. Wiersz nie jest dataclassą (dataclasses.asdict
+go nie obsługuje) - zamiast tego as_dict() albo to_record(); copy.copy,
+copy.deepcopy i pickle dają odłączony obiekt rekordu (to_record()).
+Wyszukiwanie maksimum i filtrowanie działa na
+kolumnach, bez tworzenia obiektów dla wierszy.
+"""
+
+import dataclasses
+import operator
+from array import array
+from typing import Dict, Iterable, Iterator, Sequence, Tuple, Union
+
+# Operatory porównania dla where()/filter()
+_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def record_columns(record_type) -> Tuple[Tuple[str, str], ...]:
+    """Kolumny (nazwa, typ array) dla dataclassy wyniku: int -> 'q', pozostałe -> 'd'."""
+    return tuple((f.name, 'q' if f.type in (int, 'int') else 'd') for f in dataclasses.fields(record_type))
+
+
+def _detached_record(record_type, values: Dict[str, float]):
+    """Obiekt rekordu z wartości wiersza (słownik, jeśli tabela nie ma typu rekordu)."""
+    return values if record_type is None else record_type(**values)
+
+
+class ResultRow:
+    """Widok jednego wiersza tabeli - atrybuty czytane wprost z kolumn (bez kopiowania)."""
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'ResultTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            # nieustawione sloty (np. obiekt tworzony przez copy/pickle) i atrybuty specjalne - nie są kolumnami
+            raise AttributeError(name)
+        try:
+            column = self._table._columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return column[self._index]
+
+    @property
+    def index(self) -> int:
+        """Numer wiersza w tabeli"""
+        return self._index
+
+    def as_dict(self) -> Dict[str, float]:
+        """Wartości wiersza jako słownik kolumna -> wartość"""
+        return {name: column[self._index] for name, column in self._table._columns.items()}
+
+    def to_record(self):
+        """Tworzy obiekt typu rekordu tabeli (np. SimulationResult) z wartości wiersza"""
+        return _detached_record(self._table.record_type, self.as_dict())
+
+    def __copy__(self):
+        """Kopia odłączona od tabeli - obiekt rekordu (to_record())"""
+        return self.to_record()
+
+    def __deepcopy__(self, memo):
+        return self.to_record()
+
+    def __reduce__(self):
+        return _detached_record, (self._table.record_type, self.as_dict())
+
+    def __eq__(self, other) -> bool:
+        """Równość wartości: z innym wierszem albo z obiektem typu rekordu tabeli (jak dataclassa)"""
+        if isinstance(other, ResultRow):
+            return self.as_dict() == other.as_dict()
+        record_type = self._table.record_type
+        if record_type is not None and isinstance(other, record_type):
+            return self.to_record() == other
+        return NotImplemented
+
+    # wiersz jest widokiem zmiennej tabeli - jak dataclassa z eq, nie jest haszowalny
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"ResultRow({self._index}: {values})"
+
+
+class ResultTable:
+    """
+    Tabela wyników: jedna tablica array na kolumnę.
+
+    Zachowuje się jak sekwencja widoków wierszy (len, indeksowanie, wycinki,
+    iteracja), więc może zastąpić listę wyników tam, gdzie czyta się tylko
+    atrybuty.
+    """
+    __slots__ = ('record_type', '_columns')
+
+    def __init__(self, record_type=None, columns: Sequence[Tuple[str, str]] = None):
+        """
+        Args:
+            record_type: dataclassa wyniku (kolumny = jej pola, to_record() tworzy jej obiekty)
+            columns: jawna lista kolumn (nazwa, typ array) - zamiast record_type
+        """
+        if columns is None:
+            columns = record_columns(record_type)
+        self.record_type = record_type
+        self._columns: Dict[str, array] = {name: array(typecode) for name, typecode in columns}
+
+    @classmethod
+    def from_records(cls, records: Iterable, record_type=None) -> 'ResultTable':
+        """Tabela z listy obiektów wyników (typ z pierwszego obiektu, jeśli nie podano)."""
+        records = iter(records)
+        first = next(records, None)
+        table = cls(record_type or type(first))
+        if first is not None:
+            table.append(first)
+            for record in records:
+                table.append(record)
+        return table
+
+    @classmethod
+    def from_columns(cls, record_type, values: Dict[str, Sequence]) -> 'ResultTable':
+        """Tabela z wartości kolumn (np. odczytanych z to_columns())."""
+        table = cls(record_type)
+        for name, column in table._columns.items():
+            column.extend(values[name])
+        return table
+
+    def to_columns(self) -> Dict[str, list]:
+        """Kolumny jako listy (np. do zapisu w JSON)."""
+        return {name: column.tolist() for name, column in self._columns.items()}
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(self._columns)
+
+    def append(self, record):
+        """Dopisuje wiersz z obiektu (wartości czytane z atrybutów o nazwach kolumn)."""
+        for name, column in self._columns.items():
+            column.append(getattr(record, name))
+
+    def append_values(self, **values):
+        """Dopisuje wiersz z wartości podanych jako argumenty nazwane (wszystkie kolumny)."""
+        for name, column in self._columns.items():
+            column.append(values[name])
+
+    def __len__(self) -> int:
+        for column in self._columns.values():
+            return len(column)
+        return 0
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ResultRow, 'ResultTable']:
+        """Wiersz o danym numerze albo - dla wycinka - nowa tabela z kopią wybranych wierszy."""
+        if isinstance(index, slice):
+            table = ResultTable(self.record_type, [(name, column.typecode) for name, column in self._columns.items()])
+            for name, column in self._columns.items():
+                table._columns[name] = column[index]
+            return table
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("indeks wiersza poza tabelą")
+        return ResultRow(self, index)
+
+    def __iter__(self) -> Iterator[ResultRow]:
+        for index in range(len(self)):
+            yield ResultRow(self, index)
+
+    def column(self, name: str) -> memoryview:
+        """
+        Kolumna jako widok tylko do odczytu (bez kopiowania).
+
+        Dopóki widok istnieje, do tabeli nie można dopisywać wierszy (array
+        nie może zmienić rozmiaru przy wyeksportowanym buforze) - zwolnij go
+        przez `del` albo `with table.column(...) as values:`.
+        """
+        return memoryview(self._columns[name]).toreadonly()
+
+    def argmax(self, name: str = 'net_worth') -> int:
+        """Numer pierwszego wiersza z największą wartością kolumny (jak max() na liście wyników)."""
+        column = self._columns[name]
+        if not column:
+            raise ValueError("argmax() na pustej tabeli")
+        return column.index(max(column))
+
+    def best(self, name: str = 'net_worth') -> ResultRow:
+        """Wiersz z największą wartością kolumny"""
+        return ResultRow(self, self.argmax(name))
+
+    def where(self, name: str, op: str, value) -> array:
+        """
+        Numery wierszy spełniających warunek `kolumna op wartość`.
+
+        Args:
+            name: nazwa kolumny
+            op: jeden z '<', '<=', '>', '>=', '==', '!='
+            value: wartość do porównania
+
+        Returns:
+            array('q') z numerami wierszy (rosnąco)
+        """
+        compare = _OPERATORS[op]
+        return array('q', [index for index, item in enumerate(self._columns[name]) if compare(item, value)])
+
+    def take(self, indices: Iterable[int]) -> 'ResultTable':
+        """Nowa tabela z wybranymi wierszami (kopiuje tylko wartości kolumn)."""
+        indices = indices if isinstance(indices, (array, list, tuple)) else list(indices)
+        table = ResultTable(self.record_type, [(name, column.typecode) for name, column in self._columns.items()])
+        for name, column in self._columns.items():
+            target = table._columns[name]
+            target.extend([column[i] for i in indices])
+        return table
+
+    def filter(self, name: str, op: str, value) -> 'ResultTable':
+        """Tabela z wierszami spełniającymi warunek (jak where() + take())."""
+        return self.take(self.where(name, op, value))
+
+    def __repr__(self) -> str:
+        record = self.record_type.__name__ if self.record_type else 'wyniki'
+        return f"ResultTable({record}, {len(self)} wierszy, kolumny: {', '.join(self._columns)})"
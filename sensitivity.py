@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Analiza wrażliwości majątku końcowego na parametry symulacji.
+
+Zamiast zmieniać każdy parametr osobno i liczyć symulację od nowa (2 ×
+parametry × scenariusze przebiegów), liczymy pochodne w przód (forward-mode
+automatic differentiation): każdy parametr jest liczbą dualną - wartość
+i wektor pochodnych względem wszystkich analizowanych parametrów. Ta sama
+pętla rok po roku (simulate_purchase_year, razem z annual_payment
+i harmonogramem spłaty) liczy wtedy jednocześnie majątek i jego gradient,
+w jednym przebiegu na scenariusz.
+
+Warunki typu min/max/if działają na wartościach, więc w punktach załamania
+(np. wkład własny = cena) liczona jest pochodna jednostronna - tak jak
+wychodzi z gałęzi wybranej przez symulację.
+
+Wynik można sprawdzić różnicami skończonymi (check_gradients), a dla
+gospodarstwa domowego zbudować ranking "tornado": o ile zmienia się majątek,
+gdy każdy parametr zmieni się o ±10%.
+
+Użycie:
+    python sensitivity.py            # gradient, ranking i sprawdzenie (parametry domyślne i kredyt 0%)
+"""
+
+import dataclasses
+import math
+import operator
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import real_estate_simulator_project_homework as sim
+
+# Parametry liczbowe (ciągłe) SimulationParams, względem których liczymy pochodne
+SENSITIVITY_FIELDS = (
+    'initial_capital',
+    'savings',
+    'deposit_interest_rate',
+    'property_price',
+    'lending_rate',
+    'owning_cost',
+    'renting_cost',
+    'real_estate_price_change',
+)
+DEFAULT_RELATIVE_CHANGE = 0.10  # zmiana parametrów w rankingu tornado (±10%)
+FINITE_DIFFERENCE_STEP = 1e-6  # krok względny różnic skończonych
+
+
+class Dual:
+    """
+    Liczba dualna: wartość + gradient (krotka pochodnych względem analizowanych parametrów).
+
+    Obsługuje działania używane w symulacji (+, -, *, /, potęgi, porównania
+    po wartości), więc można ją przekazać do kodu napisanego dla float.
+    """
+    __slots__ = ('value', 'gradient')
+
+    def __init__(self, value: float, gradient: Tuple[float, ...]):
+        self.value = value
+        self.gradient = gradient
+
+    @staticmethod
+    def _split(other) -> Tuple[float, Optional[Tuple[float, ...]]]:
+        if isinstance(other, Dual):
+            return other.value, other.gradient
+        return other, None
+
+    def __add__(self, other):
+        value, gradient = self._split(other)
+        if gradient is None:
+            return Dual(self.value + value, self.gradient)
+        return Dual(self.value + value, tuple(map(operator.add, self.gradient, gradient)))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        value, gradient = self._split(other)
+        if gradient is None:
+            return Dual(self.value - value, self.gradient)
+        return Dual(self.value - value, tuple(map(operator.sub, self.gradient, gradient)))
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, tuple(-d for d in self.gradient))
+
+    def __mul__(self, other):
+        value, gradient = self._split(other)
+        if gradient is None:
+            return Dual(self.value * value, tuple(d * value for d in self.gradient))
+        a = self.value
+        return Dual(a * value, tuple(da * value + a * db for da, db in zip(self.gradient, gradient)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        value, gradient = self._split(other)
+        if gradient is None:
+            return Dual(self.value / value, tuple(d / value for d in self.gradient))
+        quotient = self.value / value
+        return Dual(quotient, tuple((da - quotient * db) / value for da, db in zip(self.gradient, gradient)))
+
+    def __rtruediv__(self, other):
+        quotient = other / self.value
+        return Dual(quotient, tuple(-quotient * d / self.value for d in self.gradient))
+
+    def __pow__(self, exponent):
+        if isinstance(exponent, Dual):
+            # a^b = exp(b ln a)
+            return (exponent * Dual(math.log(self.value), tuple(d / self.value for d in self.gradient))).exp()
+        power = self.value ** exponent
+        factor = exponent * self.value ** (exponent - 1) if exponent != 0 else 0.0
+        return Dual(power, tuple(factor * d for d in self.gradient))
+
+    def __rpow__(self, base):
+        power = base ** self.value
+        factor = power * math.log(base)
+        return Dual(power, tuple(factor * d for d in self.gradient))
+
+    def annuity_payment(self, principal, periods: int):
+        """
+        Rata annuitetowa przy stopie na okres równej tej liczbie (wywoływana przez amortization.build_schedule).
+
+        Przy stopie 0 zwykły wzór daje P/n bez pochodnej po stopie (porównanie z zerem
+        działa na wartości), więc liczymy granicę z wyrazem pierwszego rzędu:
+        P/n + P*r*(n+1)/(2n) - ta sama wartość, ale z d(rata)/d(stopa).
+        """
+        if self.value == 0:
+            return principal / periods + principal * self * (periods + 1) / (2 * periods)
+        growth = (1 + self) ** periods
+        return principal * (self * growth) / (growth - 1)
+
+    def exp(self) -> 'Dual':
+        value = math.exp(self.value)
+        return Dual(value, tuple(value * d for d in self.gradient))
+
+    def __neg__(self):
+        return Dual(-self.value, tuple(-d for d in self.gradient))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.value < 0 else self
+
+    def __float__(self) -> float:
+        return float(self.value)
+
+    # Porównania po wartości - decyzje w pętli (min/max/if) jak dla zwykłych liczb
+    def __lt__(self, other):
+        return self.value < self._split(other)[0]
+
+    def __le__(self, other):
+        return self.value <= self._split(other)[0]
+
+    def __gt__(self, other):
+        return self.value > self._split(other)[0]
+
+    def __ge__(self, other):
+        return self.value >= self._split(other)[0]
+
+    def __eq__(self, other):
+        return self.value == self._split(other)[0]
+
+    def __ne__(self, other):
+        return self.value != self._split(other)[0]
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value!r}, {self.gradient!r})"
+
+
+def dual_params(params: sim.SimulationParams, fields: Sequence[str] = SENSITIVITY_FIELDS) -> sim.SimulationParams:
+    """Kopia parametrów, w której pola `fields` są liczbami dualnymi z gradientem jednostkowym."""
+    seeded = {}
+    for index, name in enumerate(fields):
+        unit = tuple(1.0 if i == index else 0.0 for i in range(len(fields)))
+        seeded[name] = Dual(float(getattr(params, name)), unit)
+    return dataclasses.replace(params, **seeded)
+
+
+def _gradient_of(value, size: int) -> Tuple[float, ...]:
+    # wynik niezależny od parametrów (np. 0.0 z max(0.0, ...)) ma zerowy gradient
+    return value.gradient if isinstance(value, Dual) else (0.0,) * size
+
+
+@dataclass
+class ScenarioSensitivity:
+    """Majątek końcowy i jego pochodne dla danego roku zakupu"""
+    purchase_year: int  # 0 = od razu, n_years+1 = nigdy
+    net_worth: float  # końcowy majątek
+    gradient: Dict[str, float]  # parametr -> d(majątek)/d(parametr)
+
+
+def net_worth_gradients(params: Optional[sim.SimulationParams] = None,
+                        fields: Sequence[str] = SENSITIVITY_FIELDS) -> List[ScenarioSensitivity]:
+    """
+    Gradient majątku końcowego dla wszystkich lat zakupu - jeden przebieg na scenariusz.
+
+    Args:
+        params: parametry symulacji (domyślnie SimulationParams())
+        fields: parametry, względem których liczymy pochodne
+
+    Returns:
+        lista ScenarioSensitivity dla lat zakupu 0 .. n_years+1
+    """
+    if params is None:
+        params = sim.SimulationParams()
+    seeded = dual_params(params, fields)
+    sensitivities: List[ScenarioSensitivity] = []
+    for purchase_year in params.purchase_years:
+        net_worth = sim.simulate_purchase_year(purchase_year, seeded).net_worth
+        sensitivities.append(ScenarioSensitivity(
+            purchase_year=purchase_year,
+            net_worth=float(net_worth),
+            gradient=dict(zip(fields, _gradient_of(net_worth, len(fields)))),
+        ))
+    return sensitivities
+
+
+def finite_difference_gradients(params: Optional[sim.SimulationParams] = None,
+                                fields: Sequence[str] = SENSITIVITY_FIELDS,
+                                relative_step: float = FINITE_DIFFERENCE_STEP) -> List[Dict[str, float]]:
+    """
+    Gradient z różnic centralnych (2 symulacje na parametr i scenariusz) - do sprawdzenia net_worth_gradients.
+
+    Returns:
+        lista słowników parametr -> pochodna dla lat zakupu 0 .. n_years+1
+    """
+    if params is None:
+        params = sim.SimulationParams()
+    gradients: List[Dict[str, float]] = [{} for _ in params.purchase_years]
+    for name in fields:
+        value = getattr(params, name)
+        step = relative_step * max(abs(value), 1.0)
+        up = dataclasses.replace(params, **{name: value + step})
+        down = dataclasses.replace(params, **{name: value - step})
+        for purchase_year in params.purchase_years:
+            difference = (sim.simulate_purchase_year(purchase_year, up).net_worth
+                          - sim.simulate_purchase_year(purchase_year, down).net_worth)
+            gradients[purchase_year][name] = difference / (2 * step)
+    return gradients
+
+
+def check_gradients(params: Optional[sim.SimulationParams] = None,
+                    fields: Sequence[str] = SENSITIVITY_FIELDS) -> float:
+    """
+    Porównuje gradient dualny z różnicami skończonymi.
+
+    Returns:
+        największy błąd względny (względem max(|pochodna|, 1)) po wszystkich scenariuszach i parametrach
+    """
+    dual = net_worth_gradients(params, fields)
+    numeric = finite_difference_gradients(params, fields)
+    worst = 0.0
+    for scenario, reference in zip(dual, numeric):
+        for name in fields:
+            error = abs(scenario.gradient[name] - reference[name]) / max(abs(reference[name]), 1.0)
+            worst = max(worst, error)
+    return worst
+
+
+@dataclass
+class TornadoBar:
+    """Wpływ jednego parametru na majątek końcowy (liniowo, z gradientu)"""
+    field: str  # nazwa parametru
+    low_value: float  # parametr zmniejszony o relative_change
+    high_value: float  # parametr zwiększony o relative_change
+    low_net_worth: float  # majątek przy low_value
+    high_net_worth: float  # majątek przy high_value
+    elasticity: float  # % zmiany majątku na 1% zmiany parametru
+
+    @property
+    def swing(self) -> float:
+        """Rozpiętość majątku między low_value i high_value"""
+        return abs(self.high_net_worth - self.low_net_worth)
+
+
+def tornado(params: Optional[sim.SimulationParams] = None,
+            purchase_year: Optional[int] = None,
+            relative_change: float = DEFAULT_RELATIVE_CHANGE,
+            fields: Sequence[str] = SENSITIVITY_FIELDS) -> Tuple[ScenarioSensitivity, List[TornadoBar]]:
+    """
+    Ranking parametrów według wpływu na majątek końcowy gospodarstwa domowego.
+
+    Args:
+        params: parametry symulacji (domyślnie SimulationParams())
+        purchase_year: analizowany scenariusz (domyślnie najlepszy rok zakupu)
+        relative_change: względna zmiana każdego parametru (0.1 = ±10%)
+        fields: analizowane parametry
+
+    Returns:
+        (analizowany scenariusz, lista TornadoBar od największego wpływu)
+    """
+    if params is None:
+        params = sim.SimulationParams()
+    sensitivities = net_worth_gradients(params, fields)
+    if purchase_year is None:
+        scenario = max(sensitivities, key=lambda s: s.net_worth)
+    else:
+        scenario = sensitivities[purchase_year]
+
+    bars: List[TornadoBar] = []
+    for name in fields:
+        value = getattr(params, name)
+        derivative = scenario.gradient[name]
+        change = derivative * value * relative_change
+        bars.append(TornadoBar(
+            field=name,
+            low_value=value * (1 - relative_change),
+            high_value=value * (1 + relative_change),
+            low_net_worth=scenario.net_worth - change,
+            high_net_worth=scenario.net_worth + change,
+            elasticity=derivative * value / scenario.net_worth if scenario.net_worth else math.nan,
+        ))
+    bars.sort(key=lambda bar: bar.swing, reverse=True)
+    return scenario, bars
+
+
+def print_tornado(scenario: ScenarioSensitivity, bars: List[TornadoBar], params: sim.SimulationParams,
+                  relative_change: float = DEFAULT_RELATIVE_CHANGE):
+    """Wyświetla ranking tornado dla scenariusza"""
+    print("=" * 80)
+    print(f"WRAŻLIWOŚĆ MAJĄTKU KOŃCOWEGO (parametry ±{relative_change:.0%})")
+    print("=" * 80)
+    print(f"{sim.get_scenario_name(scenario.purchase_year, params)}: majątek końcowy {scenario.net_worth:,.2f} zł\n")
+    widest = bars[0].swing if bars and bars[0].swing else 1.0
+    for bar in bars:
+        length = round(30 * bar.swing / widest)
+        print(f"  {bar.field:<26} {bar.low_net_worth:>16,.0f} zł ↔ {bar.high_net_worth:>16,.0f} zł"
+              f"  elast. {bar.elasticity:>+7.3f}  {'█' * length}")
+
+
+if __name__ == '__main__':
+    params = sim.SimulationParams()
+    scenario, bars = tornado(params)
+    print_tornado(scenario, bars, params)
+    print(f"\nZgodność z różnicami skończonymi: największy błąd względny {check_gradients(params):.2e}")
+    # kredyt bez oprocentowania - rata liczona z granicy wzoru annuity, pochodna po stopie też musi się zgadzać
+    zero_rate = dataclasses.replace(params, lending_rate=0.0)
+    print(f"Zgodność przy oprocentowaniu kredytu 0%: największy błąd względny {check_gradients(zero_rate):.2e}")
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Lokalna usługa HTTP/JSON z symulacjami (asyncio, tylko biblioteka standardowa).
+
+Zamiast uruchamiać skrypt przy każdej interakcji użytkownika, frontend
+wysyła zapytania do jednego długo działającego procesu:
+
+    POST /simulate_purchase_year   {"purchase_year": 3, "params": {...}}
+    POST /run_all_scenarios        {"params": {...}}
+    POST /archive/simulate         {"years": 12, "params": {...}}
+    GET  /metrics                  histogramy opóźnień, głębokość kolejki, paczki
+    GET  /health
+
+`params` to pola SimulationParams danego modelu (brakujące mają wartości
+domyślne). Odpowiedzi odpowiadają wywołaniom funkcji w Pythonie (silnik
+wektorowy może różnić się od pętli na ostatnich cyfrach - zaokrąglenia).
+
+Obsługa zapytania:
+
+- scalanie (coalescing) - identyczne zapytania (ten sam model, parametry
+  i argument) w trakcie liczenia dostają ten sam wynik, liczony raz,
+- mikro-paczki - zapytania zebrane w ciągu batch_delay (albo do max_batch)
+  trafiają do procesu roboczego jako jedna paczka i są liczone jednym
+  wywołaniem silnika wektorowego (batch_simulator, jeśli jest numpy),
+- pula procesów - obliczenia nie blokują pętli zdarzeń; liczba paczek
+  w toku jest ograniczona, a nadmiar czeka w kolejce (przy max_queue
+  zapytań w kolejce usługa odpowiada 503).
+
+Procesy robocze są uruchamiane metodą 'spawn' (nie dziedziczą gniazda
+nasłuchującego). SIGTERM i SIGINT zamykają usługę porządnie: serwer
+przestaje przyjmować połączenia, a pula procesów jest zamykana.
+
+Użycie:
+    python simulation_service.py --port 8000 --workers 4
+    curl -d '{"purchase_year": 2}' localhost:8000/simulate_purchase_year
+    python load_test.py            # test obciążeniowy (uruchamia własną usługę)
+"""
+
+import argparse
+import asyncio
+import bisect
+import dataclasses
+import json
+import math
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import real_estate_simulator_project_homework as sim
+import real_estate_simulator_project_homework_archive as archive
+from streaming_stats import QuantileSketch
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_MAX_BATCH = 256  # najwięcej zapytań w jednej paczce
+DEFAULT_BATCH_DELAY = 0.002  # ile sekund zbierać zapytania do paczki
+DEFAULT_MAX_QUEUE = 10_000  # najwięcej zapytań czekających na liczenie (potem 503)
+BATCHES_PER_WORKER = 2  # ile paczek na proces może być jednocześnie w toku
+MAX_YEARS = 200  # górna granica horyzontu w zapytaniu
+MAX_BODY_BYTES = 64 * 1024
+# kwoty modelu archive, które nie mogą być ujemne
+ARCHIVE_AMOUNT_FIELDS = ('price', 'initial_capital', 'down_payment', 'rent_monthly', 'admin_monthly_buy',
+                         'monthly_salary', 'living_cost')
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+LATENCY_PERCENTILES = (50, 90, 99)
+
+# ścieżka -> rodzaj zadania
+ENDPOINTS = {
+    '/simulate_purchase_year': 'year',
+    '/run_all_scenarios': 'all',
+    '/archive/simulate': 'archive',
+}
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class RequestError(ValueError):
+    """Błędne zapytanie - odpowiedź z podanym kodem HTTP"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Zadania (liczone w procesach roboczych) --------------------------------------
+
+def _parse_params(params_class, values) -> object:
+    if values is None:
+        return params_class()
+    if not isinstance(values, dict):
+        raise RequestError("pole 'params' musi być obiektem JSON")
+    integer_fields = {f.name: f.type in (int, 'int') for f in dataclasses.fields(params_class)}
+    kwargs = {}
+    for name, value in values.items():
+        if name not in integer_fields:
+            raise RequestError(f"nieznany parametr {name!r}")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise RequestError(f"parametr {name!r} musi być skończoną liczbą")
+        if integer_fields[name]:
+            if value != int(value):
+                raise RequestError(f"parametr {name!r} musi być liczbą całkowitą")
+            kwargs[name] = int(value)
+        else:
+            kwargs[name] = float(value)
+    return params_class(**kwargs)
+
+
+def _int_field(body: dict, name: str, low: int, high: int) -> int:
+    value = body.get(name)
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise RequestError(f"pole {name!r} musi być liczbą całkowitą z przedziału {low}..{high}")
+    return value
+
+
+def parse_job(kind: str, body) -> Tuple[str, object, Optional[int]]:
+    """
+    Zamienia treść zapytania na zadanie (rodzaj, parametry, argument).
+
+    Zadanie jest hashowalne (SimulationParams jest frozen) - identyczne
+    zadania są scalane, nawet jeśli zapytania różnią się zapisem JSON
+    (kolejność pól, pominięte wartości domyślne).
+
+    Raises:
+        RequestError: nieprawidłowa treść zapytania
+    """
+    if not isinstance(body, dict):
+        raise RequestError("treść zapytania musi być obiektem JSON")
+    if kind == 'archive':
+        params = _parse_params(archive.SimulationParams, body.get('params'))
+        if params.mortgage_term_years < 1:
+            raise RequestError("mortgage_term_years musi być dodatnie")
+        negative = [name for name in ARCHIVE_AMOUNT_FIELDS if getattr(params, name) < 0]
+        if negative:
+            raise RequestError(f"kwoty nie mogą być ujemne: {', '.join(negative)}")
+        if params.investment_annual_return <= -1:
+            raise RequestError("investment_annual_return musi być większe niż -1")
+        return kind, params, _int_field(body, 'years', 1, MAX_YEARS)
+    params = _parse_params(sim.SimulationParams, body.get('params'))
+    if not 0 <= params.n_years <= MAX_YEARS or params.mortgage_term_years < 1:
+        raise RequestError(f"n_years musi być z przedziału 0..{MAX_YEARS}, a mortgage_term_years dodatnie")
+    if kind == 'year':
+        return kind, params, _int_field(body, 'purchase_year', 0, params.n_years + 1)
+    return kind, params, None
+
+
+def _all_scenarios_payload(results: List[dict]) -> dict:
+    net_worths = [r['net_worth'] for r in results]
+    return {'results': results, 'best_purchase_year': results[net_worths.index(max(net_worths))]['purchase_year']}
+
+
+def _archive_payload(result: archive.SimulationResult) -> dict:
+    return {'years': result.years, 'buyer_net_worth': result.buyer_net_worth,
+            'renter_net_worth': result.renter_net_worth,
+            'buyer_details': result.buyer_details.as_dict(), 'renter_details': result.renter_details.as_dict()}
+
+
+def _evaluate_scalar(job) -> dict:
+    kind, params, argument = job
+    if kind == 'year':
+        return dataclasses.asdict(sim.simulate_purchase_year(argument, params))
+    if kind == 'all':
+        return _all_scenarios_payload([dataclasses.asdict(sim.simulate_purchase_year(year, params))
+                                       for year in params.purchase_years])
+    return _archive_payload(archive.simulate(argument, params))
+
+
+def _evaluate_main_vectorized(batch_simulator, np, jobs: List[tuple], payloads: List[dict], indices: List[int]):
+    """Zadania modelu głównego o wspólnym n_years - jedno wywołanie simulate_batch."""
+    names = [f.name for f in dataclasses.fields(sim.SimulationParams) if f.name != 'n_years']
+    purchase_years: List[int] = []
+    counts: List[int] = []
+    for kind, params, argument in jobs:
+        years = [argument] if kind == 'year' else list(params.purchase_years)
+        purchase_years.extend(years)
+        counts.append(len(years))
+    columns = {name: np.repeat([getattr(params, name) for _, params, _ in jobs], counts) for name in names}
+    result = batch_simulator.simulate_batch(np.array(purchase_years), n_years=jobs[0][1].n_years, **columns)
+    values = {name: getattr(result, name).tolist() for name in batch_simulator.RESULT_FIELDS}
+    row = 0
+    for index, (kind, _, _), count in zip(indices, jobs, counts):
+        rows = [{name: values[name][i] for name in batch_simulator.RESULT_FIELDS} for i in range(row, row + count)]
+        payloads[index] = rows[0] if kind == 'year' else _all_scenarios_payload(rows)
+        row += count
+
+
+def _evaluate_archive_vectorized(batch_simulator, np, jobs: List[tuple], payloads: List[dict], indices: List[int]):
+    """Zadania modelu archive o wspólnym horyzoncie - jedno wywołanie simulate_archive_batch."""
+    years = jobs[0][2]
+    names = [f.name for f in dataclasses.fields(archive.SimulationParams)]
+    columns = {name: np.array([getattr(params, name) for _, params, _ in jobs], dtype=np.float64) for name in names}
+    result = batch_simulator.simulate_archive_batch(years, size=len(jobs), **columns)
+    buyer = result.buyer_net_worth_by_year[:, years - 1].tolist()
+    renter = result.renter_net_worth_by_year[:, years - 1].tolist()
+    buyer_fields = [f.name for f in dataclasses.fields(archive.BuyerDetails)]
+    renter_fields = [f.name for f in dataclasses.fields(archive.RenterDetails)]
+    details = {name: getattr(result, name).tolist() for name in buyer_fields + renter_fields}
+    for i, index in enumerate(indices):
+        payloads[index] = {'years': years, 'buyer_net_worth': buyer[i], 'renter_net_worth': renter[i],
+                           'buyer_details': {name: details[name][i] for name in buyer_fields},
+                           'renter_details': {name: details[name][i] for name in renter_fields}}
+
+
+def _evaluate_or_error(job) -> object:
+    try:
+        return _evaluate_scalar(job)
+    except Exception as error:
+        return error
+
+
+def evaluate_batch(jobs: List[tuple]) -> List[object]:
+    """
+    Liczy paczkę zadań (w procesie roboczym).
+
+    Zadania są grupowane po modelu i horyzoncie, a każda grupa jest liczona
+    jednym wywołaniem silnika wektorowego. Bez numpy - pętla po zadaniach.
+    Jeśli wywołanie dla grupy się nie powiedzie, jej zadania są liczone po
+    jednym - błąd dostaje tylko zadanie, które go spowodowało.
+
+    Args:
+        jobs: zadania z parse_job
+
+    Returns:
+        odpowiedzi JSON w kolejności zadań (wyjątek w miejscu zadania, które się nie powiodło)
+    """
+    try:
+        import numpy as np
+        import batch_simulator
+    except ImportError:  # silnik wsadowy wymaga numpy
+        return [_evaluate_or_error(job) for job in jobs]
+
+    payloads: List[dict] = [None] * len(jobs)
+    groups: Dict[tuple, Tuple[List[tuple], List[int]]] = {}
+    for index, job in enumerate(jobs):
+        kind, params, argument = job
+        key = ('archive', argument) if kind == 'archive' else ('main', params.n_years)
+        group = groups.setdefault(key, ([], []))
+        group[0].append(job)
+        group[1].append(index)
+    for (model, _), (group_jobs, indices) in groups.items():
+        evaluate = _evaluate_archive_vectorized if model == 'archive' else _evaluate_main_vectorized
+        try:
+            evaluate(batch_simulator, np, group_jobs, payloads, indices)
+        except Exception:
+            for job, index in zip(group_jobs, indices):
+                payloads[index] = _evaluate_or_error(job)
+    return payloads
+
+
+# --- Metryki ----------------------------------------------------------------------
+
+class LatencyHistogram:
+    """Histogram opóźnień: stałe koszyki (skumulowane jak w Prometheusie) i szkic percentyli."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # ostatni koszyk: powyżej największej granicy
+        self.count = 0
+        self.sum_ms = 0.0
+        self.sketch = QuantileSketch()
+
+    def observe(self, milliseconds: float):
+        self.counts[bisect.bisect_left(self.buckets_ms, milliseconds)] += 1
+        self.count += 1
+        self.sum_ms += milliseconds
+        self.sketch.add(milliseconds)
+
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets_ms + ('+Inf',), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        percentiles = self.sketch.percentiles(LATENCY_PERCENTILES) if self.count else {}
+        return {'count': self.count, 'sum_ms': self.sum_ms, 'buckets_ms': buckets,
+                **{f'p{p:g}_ms': value for p, value in percentiles.items()}}
+
+
+@dataclasses.dataclass
+class ServiceMetrics:
+    """Liczniki usługi (wszystkie zmieniane w wątku pętli zdarzeń)"""
+    requests: Dict[str, int] = dataclasses.field(default_factory=dict)  # zapytania na ścieżkę
+    responses: Dict[int, int] = dataclasses.field(default_factory=dict)  # odpowiedzi na kod HTTP
+    coalesced: int = 0  # zapytania obsłużone wynikiem innego, identycznego zapytania
+    rejected: int = 0  # odrzucone przy pełnej kolejce (503)
+    batches: int = 0  # policzone paczki
+    batched_jobs: int = 0  # zadania w policzonych paczkach
+    max_batch_size: int = 0
+    queue_depth: int = 0  # zadania czekające na wysłanie do procesu roboczego
+    max_queue_depth: int = 0
+    in_flight: int = 0  # zadania liczone w tej chwili
+    latency: Dict[str, LatencyHistogram] = dataclasses.field(default_factory=dict)
+
+    def observe(self, path: str, status: int, milliseconds: float):
+        self.requests[path] = self.requests.get(path, 0) + 1
+        self.responses[status] = self.responses.get(status, 0) + 1
+        self.latency.setdefault(path, LatencyHistogram()).observe(milliseconds)
+
+    def snapshot(self) -> dict:
+        return {
+            'requests': self.requests,
+            'responses': {str(status): count for status, count in self.responses.items()},
+            'coalesced': self.coalesced,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'mean_batch_size': self.batched_jobs / self.batches if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight': self.in_flight,
+            'latency': {path: histogram.snapshot() for path, histogram in self.latency.items()},
+        }
+
+
+# --- Usługa -----------------------------------------------------------------------
+
+class SimulationService:
+    """
+    Scalanie identycznych zadań, mikro-paczki i pula procesów.
+
+    Wszystkie metody działają w wątku pętli zdarzeń; liczenie odbywa się
+    w procesach roboczych (workers=0 - w wątku pomocniczym tego procesu).
+    Procesy robocze są uruchamiane metodą 'spawn', więc nie dziedziczą
+    gniazd ani innych zasobów procesu usługi.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_batch: int = DEFAULT_MAX_BATCH,
+                 batch_delay: float = DEFAULT_BATCH_DELAY, max_queue: int = DEFAULT_MAX_QUEUE):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.max_queue = max_queue
+        self.metrics = ServiceMetrics()
+        self._executor = (ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+                          if workers > 0 else None)
+        self._pending: Dict[tuple, asyncio.Future] = {}  # zadanie -> wynik (w kolejce albo w toku)
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batches = set()  # paczki w toku (pętla zdarzeń trzyma zadania tylko przez słabe referencje)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(max(1, self.workers) * BATCHES_PER_WORKER)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        """Zatrzymuje przyjmowanie paczek, czeka na paczki w toku i zamyka pulę procesów."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        if self._executor is not None:
+            # paczki jeszcze nie wysłane do procesów są anulowane; czekamy w osobnym wątku
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(RequestError("usługa jest zamykana", status=503))
+        self._pending.clear()
+
+    async def submit(self, job: tuple) -> dict:
+        """Wynik zadania - wspólny dla identycznych zadań, które są w kolejce albo w toku."""
+        future = self._pending.get(job)
+        if future is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(future)
+        if self.metrics.queue_depth >= self.max_queue:
+            self.metrics.rejected += 1
+            raise RequestError("kolejka zapytań jest pełna", status=503)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[job] = future
+        self.metrics.queue_depth += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+        self._queue.put_nowait(job)
+        return await asyncio.shield(future)
+
+    async def _dispatch(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_delay > 0 and self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.batch_delay)  # czekamy na kolejne zapytania do paczki
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._slots.acquire()
+            self.metrics.queue_depth -= len(batch)
+            self.metrics.in_flight += len(batch)
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[tuple]):
+        try:
+            payloads = await asyncio.get_running_loop().run_in_executor(self._executor, evaluate_batch, batch)
+        except (Exception, asyncio.CancelledError) as error:  # np. pula zamknięta - dostaje go każde zapytanie
+            for job in batch:
+                future = self._pending.pop(job, None)
+                if future is not None and not future.done():
+                    future.set_exception(RequestError("usługa jest zamykana", status=503)
+                                         if isinstance(error, asyncio.CancelledError) else error)
+        else:
+            for job, payload in zip(batch, payloads):
+                future = self._pending.pop(job)
+                if isinstance(payload, BaseException):  # błąd tylko tego zadania
+                    future.set_exception(payload)
+                else:
+                    future.set_result(payload)
+        finally:
+            self._slots.release()
+            self.metrics.in_flight -= len(batch)
+            self.metrics.batches += 1
+            self.metrics.batched_jobs += len(batch)
+            self.metrics.max_batch_size = max(self.metrics.max_batch_size, len(batch))
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        """Odpowiedź (kod HTTP, JSON) na jedno zapytanie."""
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, self.metrics.snapshot()
+        kind = ENDPOINTS.get(path)
+        if kind is None:
+            raise RequestError(f"nieznana ścieżka {path}", status=404)
+        if method != 'POST':
+            raise RequestError("dozwolona metoda: POST", status=405)
+        try:
+            document = json.loads(body or b'{}')
+        except ValueError:
+            raise RequestError("treść zapytania nie jest poprawnym JSON") from None
+        return 200, await self.submit(parse_job(kind, document))
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Połączenie HTTP/1.1 (keep-alive): kolejne zapytania obsługiwane po kolei."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                started = time.perf_counter()
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = request_line.split(' ', 2)
+                except ValueError:
+                    return
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                path = target.split('?', 1)[0]
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # bez poprawnej długości nie wiadomo, gdzie kończy się treść - zamykamy połączenie
+                    status, payload = 400, {'error': "nieprawidłowy nagłówek Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {'error': "zbyt duża treść zapytania"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, payload = await self.handle(method, path, body)
+                    except RequestError as error:
+                        status, payload = error.status, {'error': str(error)}
+                    except Exception as error:
+                        status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if path in ENDPOINTS:
+                    self.metrics.observe(path, status, (time.perf_counter() - started) * 1000.0)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready: Optional[asyncio.Event] = None,
+                **service_options):
+    """Uruchamia usługę i obsługuje połączenia do SIGTERM albo SIGINT (Ctrl+C), potem zamyka ją porządnie."""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except (NotImplementedError, RuntimeError):  # Windows albo pętla poza głównym wątkiem
+            pass
+    service = SimulationService(**service_options)
+    await service.start()
+    try:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Usługa symulacji: http://{address[0]}:{address[1]} (procesy robocze: {service.workers})", flush=True)
+        if ready is not None:
+            ready.set()
+        try:
+            await stop.wait()
+        finally:
+            server.close()  # nie przyjmujemy nowych połączeń; otwarte zamknie asyncio.run
+    finally:
+        await service.close()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.remove_signal_handler(signal_number)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Lokalna usługa HTTP/JSON z symulacjami")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port (0 = dowolny wolny)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="liczba procesów roboczych (domyślnie liczba procesorów, 0 = wątek w tym procesie)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="najwięcej zapytań w paczce")
+    parser.add_argument('--batch-delay-ms', type=float, default=DEFAULT_BATCH_DELAY * 1000,
+                        help="ile milisekund zbierać zapytania do paczki")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help="najwięcej zapytań w kolejce (potem 503)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_batch=args.max_batch,
+                          batch_delay=args.batch_delay_ms / 1000, max_queue=args.max_queue))
+    except KeyboardInterrupt:
+        pass
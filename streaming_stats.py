@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Strumieniowe statystyki wyników symulacji - bez przechowywania wszystkich ścieżek.
+
+Przy wielu ścieżkach (Monte Carlo) albo punktach siatki parametrów
+potrzebujemy tylko podsumowań dla każdego roku zakupu / horyzontu: średniej,
+wariancji, percentyli majątku i różnicy kupujący - najemca. Zamiast zbierać
+listę wyników, każdą wartość dopisujemy do:
+
+- RunningMoments - liczność, średnia, suma kwadratów odchyleń (Welford),
+  minimum i maksimum; łączenie dwóch zbiorów wzorem Chana,
+- QuantileSketch - szkic kwantyli w stylu DDSketch: wartości trafiają do
+  koszyków o logarytmicznych granicach, więc każdy kwantyl jest obarczony
+  błędem względnym najwyżej relative_accuracy; koszyki to liczniki, więc
+  łączenie szkiców jest dokładne (suma liczników).
+
+Pamięć zależy tylko od liczby koszyków (ograniczonej przez max_buckets), nie
+od liczby wartości - tak samo dla 10^3 jak dla 10^9 ścieżek. Obiekty są
+serializowalne (pickle), więc procesy robocze mogą zwracać częściowe
+agregaty, które łączy się funkcją merge().
+
+Metody update() przyjmują dowolny iterowalny zbiór liczb; tablice numpy
+są przetwarzane wektorowo.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+DEFAULT_RELATIVE_ACCURACY = 0.01  # błąd względny kwantyli (1%)
+DEFAULT_MAX_BUCKETS = 2048  # limit koszyków w jednej części szkicu (dodatniej / ujemnej)
+MIN_INDEXABLE = 1e-9  # wartości o module mniejszym liczymy jako zero
+
+
+def _is_array(values) -> bool:
+    return hasattr(values, 'dtype') and hasattr(values, 'ravel')
+
+
+@dataclass
+class RunningMoments:
+    """Liczność, średnia i wariancja liczone na bieżąco (Welford / Chan)"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # suma kwadratów odchyleń od średniej
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, value: float):
+        """Dopisuje jedną wartość (Welford)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update(self, values: Iterable[float]):
+        """Dopisuje wiele wartości (tablica numpy liczona wektorowo i łączona jak agregat)."""
+        if _is_array(values):
+            values = values.ravel()
+            if values.size:
+                mean = float(values.mean())
+                self.merge(RunningMoments(int(values.size), mean, float(((values - mean) ** 2).sum()),
+                                          float(values.min()), float(values.max())))
+            return
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'RunningMoments'):
+        """Dołącza drugi agregat (wzór Chana - wynik jak dla połączonych danych)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Wariancja populacji (jak numpy.var)"""
+        return self.m2 / self.count if self.count else math.nan
+
+    @property
+    def sample_variance(self) -> float:
+        """Wariancja z próby (dzielnik n - 1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Odchylenie standardowe populacji (jak numpy.std)"""
+        return math.sqrt(self.variance) if self.count else math.nan
+
+
+class QuantileSketch:
+    """
+    Szkic kwantyli z gwarancją błędu względnego (w stylu DDSketch).
+
+    Wartość x > 0 trafia do koszyka k = ceil(log_gamma(x)), gdzie
+    gamma = (1 + a) / (1 - a), a kwantyl jest szacowany środkiem koszyka -
+    błąd względny najwyżej a. Wartości ujemne mają osobny zestaw koszyków
+    (dla modułu), bliskie zeru są liczone osobno. Po przekroczeniu max_buckets
+    najmniejsze (co do modułu) koszyki są łączone, więc dokładność tracą
+    najpierw wartości najbliższe zeru.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy musi być w przedziale (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}  # indeks koszyka -> liczba wartości
+        self.negative: Dict[int, int] = {}  # jak positive, dla modułu wartości ujemnych
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        # środek koszyka (gamma^(k-1), gamma^k] w sensie błędu względnego
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        """Dopisuje wartość (count razy)."""
+        if value > MIN_INDEXABLE:
+            store = self.positive
+            index = self._index(value)
+        elif value < -MIN_INDEXABLE:
+            store = self.negative
+            index = self._index(-value)
+        else:
+            self.zero_count += count
+            self.count += count
+            return
+        store[index] = store.get(index, 0) + count
+        self.count += count
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+
+    def update(self, values: Iterable[float]):
+        """Dopisuje wiele wartości (tablica numpy liczona wektorowo: indeksy + zliczenie)."""
+        if not _is_array(values):
+            for value in values:
+                self.add(value)
+            return
+        import numpy as np
+        values = values.ravel()
+        for sign, store in ((1.0, self.positive), (-1.0, self.negative)):
+            magnitudes = values[values * sign > MIN_INDEXABLE] * sign
+            if magnitudes.size:
+                indices, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64),
+                                            return_counts=True)
+                for index, count in zip(indices.tolist(), counts.tolist()):
+                    store[index] = store.get(index, 0) + count
+                if len(store) > self.max_buckets:
+                    self._collapse(store)
+        zeros = int(np.count_nonzero(np.abs(values) <= MIN_INDEXABLE))
+        self.zero_count += zeros
+        self.count += int(values.size)
+
+    def _collapse(self, store: Dict[int, int]):
+        """Łączy najmniejsze koszyki w jeden, aż zostanie max_buckets koszyków."""
+        indices = sorted(store)
+        excess = len(indices) - self.max_buckets
+        merged = sum(store.pop(index) for index in indices[:excess])
+        target = indices[excess]
+        store[target] += merged
+
+    def merge(self, other: 'QuantileSketch'):
+        """Dołącza drugi szkic (dokładnie - sumuje liczniki koszyków)."""
+        if other.gamma != self.gamma:
+            raise ValueError("Można łączyć tylko szkice o tej samej dokładności")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in other_store.items():
+                store[index] = store.get(index, 0) + count
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """
+        Szacuje kwantyl.
+
+        Args:
+            q: rząd kwantyla w przedziale [0, 1] (0.5 = mediana)
+
+        Returns:
+            wartość z błędem względnym najwyżej relative_accuracy (nan dla pustego szkicu)
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q musi być w przedziale [0, 1]")
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):  # od najbardziej ujemnych
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def percentiles(self, percentiles: Sequence[float]) -> Dict[float, float]:
+        """Percentyl (0-100) -> wartość"""
+        return {p: self.quantile(p / 100) for p in percentiles}
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class MetricSummary:
+    """Momenty + szkic kwantyli + liczba wartości dodatnich dla jednej wielkości"""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.positive_count = 0  # np. ile razy zakup wygrał z wynajmem (różnica > 0)
+
+    def add(self, value: float):
+        self.moments.add(value)
+        self.sketch.add(value)
+        if value > 0:
+            self.positive_count += 1
+
+    def update(self, values: Iterable[float]):
+        if not _is_array(values):
+            values = list(values)
+            self.positive_count += sum(1 for value in values if value > 0)
+        else:
+            self.positive_count += int((values > 0).sum())
+        self.moments.update(values)
+        self.sketch.update(values)
+
+    def merge(self, other: 'MetricSummary'):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.positive_count += other.positive_count
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    @property
+    def fraction_positive(self) -> float:
+        """Odsetek wartości > 0"""
+        return self.positive_count / self.count if self.count else math.nan
+
+
+@dataclass
+class ResultAggregator:
+    """
+    Statystyki wielu wielkości dla wielu kluczy (rok zakupu, horyzont, ...).
+
+    metrics[klucz][nazwa wielkości] -> MetricSummary. Nowe klucze i wielkości
+    powstają przy pierwszym dopisaniu.
+    """
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    metrics: Dict[Hashable, Dict[str, MetricSummary]] = field(default_factory=dict)
+
+    def metric(self, key: Hashable, name: str) -> MetricSummary:
+        """Agregat wielkości `name` dla klucza `key` (tworzony, jeśli go nie ma)."""
+        by_name = self.metrics.setdefault(key, {})
+        summary = by_name.get(name)
+        if summary is None:
+            summary = by_name[name] = MetricSummary(self.relative_accuracy)
+        return summary
+
+    def add(self, key: Hashable, name: str, value: float):
+        self.metric(key, name).add(value)
+
+    def update(self, key: Hashable, name: str, values: Iterable[float]):
+        self.metric(key, name).update(values)
+
+    def add_purchase_scenarios(self, results: Sequence):
+        """
+        Dopisuje wyniki głównego symulatora dla jednej ścieżki / punktu parametrów.
+
+        Args:
+            results: SimulationResult dla wszystkich lat zakupu (ostatni = tylko wynajem),
+                     np. lista z simulate_purchase_year albo ResultTable z run_all_scenarios
+
+        Klucz = rok zakupu; wielkości 'net_worth' i 'vs_rent' (majątek - majątek przy tylko wynajmie).
+        """
+        rent_only = results[len(results) - 1].net_worth
+        for result in results:
+            self.add(result.purchase_year, 'net_worth', result.net_worth)
+            self.add(result.purchase_year, 'vs_rent', result.net_worth - rent_only)
+
+    def add_archive_result(self, result):
+        """
+        Dopisuje wynik modelu archive (archive.simulate albo migawkę z simulate_horizons).
+
+        Klucz = liczba lat; wielkości 'buyer_net_worth', 'renter_net_worth' i
+        'difference' (kupujący - najemca).
+        """
+        self.add(result.years, 'buyer_net_worth', result.buyer_net_worth)
+        self.add(result.years, 'renter_net_worth', result.renter_net_worth)
+        self.add(result.years, 'difference', result.buyer_net_worth - result.renter_net_worth)
+
+    def merge(self, other: 'ResultAggregator'):
+        """Dołącza agregat (np. z innego procesu)."""
+        for key, by_name in other.metrics.items():
+            for name, summary in by_name.items():
+                self.metric(key, name).merge(summary)
+
+    def keys(self) -> List[Hashable]:
+        return sorted(self.metrics)
+
+    def summary(self, key: Hashable, name: str,
+                percentiles: Sequence[float] = (5.0, 50.0, 95.0)) -> Optional[Dict[str, object]]:
+        """Podsumowanie jednej wielkości: count, mean, variance, std, min, max, percentiles, fraction_positive."""
+        summary = self.metrics.get(key, {}).get(name)
+        if summary is None:
+            return None
+        moments = summary.moments
+        return {
+            'count': moments.count,
+            'mean': moments.mean,
+            'variance': moments.variance,
+            'std': moments.std,
+            'min': moments.min,
+            'max': moments.max,
+            'percentiles': summary.sketch.percentiles(percentiles),
+            'fraction_positive': summary.fraction_positive,
+        }
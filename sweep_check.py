@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Sprawdzenie shardowanych przeglądów parameter_sweep.py (wznawianie i scalanie).
+
+Na małej siatce w katalogu tymczasowym:
+
+1. liczy siatkę lokalnym "klastrem" (run_local_cluster, --nodes węzłów jako
+   osobne procesy) i osobno zwykłym `run --engine loop` w puli procesów,
+2. scala oba katalogi (merge_shards) - najlepsze lata zakupu muszą być
+   identyczne, a majątki zgodne z dokładnością TOLERANCE (silnik wektorowy
+   liczy potęgi inaczej niż pętla),
+3. usuwa jeden shard i podrzuca dwa pliki tymczasowe: porzucony (proces
+   piszący już nie żyje) i "trwający" (pid tego procesu). pending_shards
+   (jak `status`) nie może niczego usunąć; ponowne `run` musi usunąć tylko
+   porzucony plik i policzyć tylko brakujący shard, nie ruszając pozostałych
+   plików, a ponowne scalenie musi dać plik identyczny bajt w bajt.
+
+Przy różnicach program kończy się kodem 1.
+
+Użycie:
+    python sweep_check.py
+    python sweep_check.py --nodes 4 --workers 2 --engine batch
+"""
+
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+import parameter_sweep as sweep
+
+TOLERANCE = 1e-9  # dopuszczalna różnica względna majątku między silnikami
+
+# Mała siatka: 4 × 3 × 3 × 2 = 72 punkty w 9 shardach po 8 punktów
+CHECK_SPEC = {
+    'base': {'mortgage_term_years': 20},
+    'axes': {
+        'initial_capital': {'start': 50000, 'stop': 350000, 'num': 4},
+        'savings': [40000, 60000, 80000],
+        'lending_rate': {'start': 0.04, 'stop': 0.08, 'step': 0.02},
+        'n_years': [5, 10],
+    },
+    'shard_size': 8,
+}
+
+
+def _close(a: float, b: float) -> bool:
+    return math.isclose(a, b, rel_tol=TOLERANCE, abs_tol=TOLERANCE)
+
+
+def compare_results(path_a: str, path_b: str) -> List[str]:
+    """Różnice między dwoma plikami połączonych wyników (puste = zgodne)."""
+    header_a, (year_a, best_a, rent_a) = sweep.read_columns(path_a, sweep.RESULTS_MAGIC)
+    header_b, (year_b, best_b, rent_b) = sweep.read_columns(path_b, sweep.RESULTS_MAGIC)
+    if header_a[1:4] != header_b[1:4]:
+        return [f"różne nagłówki: {header_a[1:4]} != {header_b[1:4]}"]
+    failures = []
+    for point in range(header_a[3]):
+        if year_a[point] != year_b[point]:
+            failures.append(f"punkt {point}: najlepszy rok {year_a[point]} != {year_b[point]}")
+        elif not (_close(best_a[point], best_b[point]) and _close(rent_a[point], rent_b[point])):
+            failures.append(f"punkt {point}: majątek ({best_a[point]}, {rent_a[point]}) "
+                            f"!= ({best_b[point]}, {rent_b[point]})")
+    return failures
+
+
+def run_check(directory: str, nodes: int, workers: int, engine: str) -> int:
+    """
+    Wykonuje sprawdzenie w podanym (pustym) katalogu.
+
+    Returns:
+        kod wyjścia: 0 = wszystko zgodne, 1 = różnice albo błędy
+    """
+    spec_path = os.path.join(directory, 'sweep.json')
+    with open(spec_path, 'w', encoding='utf-8') as f:
+        json.dump(CHECK_SPEC, f)
+    spec = sweep.SweepSpec.load(spec_path)
+    cluster_dir, loop_dir = os.path.join(directory, 'cluster'), os.path.join(directory, 'loop')
+    cluster_results, loop_results = os.path.join(directory, 'cluster.bin'), os.path.join(directory, 'loop.bin')
+    failures: List[str] = []
+
+    # 1-2. lokalny klaster vs zwykłe run silnikiem pętli
+    codes = sweep.run_local_cluster(spec_path, cluster_dir, nodes, engine)
+    if any(codes):
+        print(f"  ! węzły zakończone błędem: {codes}")
+        return 1
+    sweep.merge_shards(spec, cluster_dir, cluster_results, engine)
+    sweep.run_sweep(spec, loop_dir, workers, 'loop', progress=False)
+    sweep.merge_shards(spec, loop_dir, loop_results, 'loop')
+    differences = compare_results(cluster_results, loop_results)
+    failures += differences
+
+    # 3. wznowienie: usunięty shard liczony od nowa, reszta nietknięta; usuwany tylko porzucony plik tymczasowy
+    removed = spec.shard_count // 2
+    os.remove(sweep.shard_path(cluster_dir, removed))
+    finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+    finished.wait()  # pid procesu, który już nie istnieje
+    prefix = f'{sweep.shard_path(cluster_dir, removed)}.tmp-{socket.gethostname()}'
+    abandoned, in_progress = f'{prefix}-{finished.pid}', f'{prefix}-{os.getpid()}'
+    for temporary in (abandoned, in_progress):
+        with open(temporary, 'wb') as f:
+            f.write(b'przerwany zapis')
+    others = {shard: os.stat(sweep.shard_path(cluster_dir, shard)).st_mtime_ns
+              for shard in range(spec.shard_count) if shard != removed}
+    pending = sweep.pending_shards(spec, cluster_dir, engine)
+    if pending != [removed]:
+        failures.append(f"niepoliczone shardy {pending}, oczekiwano [{removed}]")
+    if not (os.path.exists(abandoned) and os.path.exists(in_progress)):
+        failures.append("pending_shards (status) usunęło plik tymczasowy")
+    with open(cluster_results, 'rb') as f:
+        merged_before = f.read()
+    computed = sweep.run_sweep(spec, cluster_dir, workers, engine, progress=False)
+    if computed != 1:
+        failures.append(f"wznowienie policzyło {computed} shardów zamiast 1")
+    touched = [shard for shard, mtime in others.items()
+               if os.stat(sweep.shard_path(cluster_dir, shard)).st_mtime_ns != mtime]
+    if touched:
+        failures.append(f"wznowienie nadpisało policzone shardy {touched}")
+    if os.path.exists(abandoned):
+        failures.append("porzucony plik tymczasowy nie został usunięty")
+    if not os.path.exists(in_progress):
+        failures.append("usunięto plik tymczasowy żyjącego procesu")
+    else:
+        os.remove(in_progress)
+    sweep.merge_shards(spec, cluster_dir, cluster_results, engine)
+    with open(cluster_results, 'rb') as f:
+        if f.read() != merged_before:
+            failures.append("wyniki po wznowieniu różnią się od pierwszego scalenia")
+
+    print("=" * 80)
+    print("SPRAWDZENIE PRZEGLĄDU SIATKI PARAMETRÓW")
+    print("=" * 80)
+    print(f"Punkty: {spec.total_points}, shardy: {spec.shard_count} (po {spec.shard_size})")
+    print(f"Klaster lokalny (węzły: {nodes}, silnik {engine}) vs run --engine loop --workers {workers}: "
+          f"różnice: {len(differences)}")
+    print(f"Wznowienie po usunięciu shardu {removed}: policzone shardy: {computed}, "
+          f"pozostałe nietknięte: {'tak' if not touched else 'nie'}")
+    print("Pliki tymczasowe: status nic nie usuwa, run usuwa tylko porzucone (nieżyjący proces)")
+    print(f"Błędy: {len(failures)}")
+    for failure in failures[:10]:
+        print(f"  ! {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sprawdzenie wznawiania i scalania parameter_sweep.py")
+    parser.add_argument('--nodes', type=int, default=3, help="liczba lokalnych węzłów")
+    parser.add_argument('--workers', type=int, default=2, help="procesy dla run --engine loop i wznowienia")
+    parser.add_argument('--engine', choices=sweep.ENGINES, default=None,
+                        help="silnik klastra lokalnego (domyślnie batch, jeśli jest numpy)")
+    parser.add_argument('--keep', metavar='KATALOG', default=None,
+                        help="licz w podanym katalogu i zostaw pliki (domyślnie katalog tymczasowy)")
+    args = parser.parse_args()
+
+    engine = args.engine or sweep.default_engine()
+    if args.keep:
+        os.makedirs(args.keep, exist_ok=False)
+        sys.exit(run_check(args.keep, args.nodes, args.workers, engine))
+    with tempfile.TemporaryDirectory() as directory:
+        sys.exit(run_check(directory, args.nodes, args.workers, engine))